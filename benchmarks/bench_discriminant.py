@@ -0,0 +1,57 @@
+"""Benchmark the puma discriminant kernel against `ftag.utils.get_discriminant`.
+
+Run with `python benchmarks/bench_discriminant.py [--n_jets N] [--n_fxs N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+import numpy as np
+from ftag import Flavours
+from ftag.utils import get_discriminant
+from numpy.lib.recfunctions import unstructured_to_structured as u2s
+
+from puma.utils.discriminant import calculate_discriminant
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n_jets", type=int, default=2_000_000)
+    parser.add_argument("--n_fxs", type=int, default=50)
+    parser.add_argument("--dtype", default="f4", choices=["f4", "f8"])
+    args = parser.parse_args()
+
+    flavours = [Flavours["ujets"], Flavours["cjets"], Flavours["bjets"]]
+    rng = np.random.default_rng(42)
+    probs = rng.dirichlet(np.ones(3), size=args.n_jets).astype(args.dtype)
+    jets = u2s(probs, dtype=[(f"dummy_{f.px}", args.dtype) for f in flavours])
+    columns = [np.ascontiguousarray(probs[:, i]) for i in range(3)]
+    fcs = np.linspace(0.01, 0.99, args.n_fxs)
+
+    def ftag_path():
+        for fc in fcs:
+            get_discriminant(
+                jets=jets,
+                tagger="dummy",
+                signal=Flavours["bjets"],
+                flavours=flavours,
+                fraction_values={"fu": 1 - fc, "fc": fc},
+            )
+
+    out = np.empty(args.n_jets, dtype=args.dtype)
+    buffer = np.empty_like(out)
+
+    def puma_path():
+        for fc in fcs:
+            calculate_discriminant(columns[2], columns[:2], [1 - fc, fc], out=out, buffer=buffer)
+
+    for name, func in (("ftag.utils.get_discriminant", ftag_path), ("puma", puma_path)):
+        best = min(timeit.repeat(func, number=1, repeat=3))
+        print(f"{name:<30} {best / args.n_fxs * 1e3:8.2f} ms per fraction vector")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark creating plots with and without the figure templates.
+
+Run with `python benchmarks/bench_figure_templates.py [--n_plots N] [--repeat N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from puma import HistogramPlot, RocPlot, VarVsEffPlot
+from puma.plot_base import clear_figure_templates, use_render_mode
+
+PLOTS = (
+    ("HistogramPlot", HistogramPlot, {"n_ratio_panels": 1}),
+    ("RocPlot", RocPlot, {"n_ratio_panels": 2}),
+    ("VarVsEffPlot", VarVsEffPlot, {"n_ratio_panels": 1, "mode": "sig_eff"}),
+)
+
+
+def time_plots(plot_cls: type, kwargs: dict, n_plots: int, templates: bool) -> float:
+    """Time the creation of plots with the same layout.
+
+    Parameters
+    ----------
+    plot_cls : type
+        Plot class
+    kwargs : dict
+        Keyword arguments of the plot class
+    n_plots : int
+        Number of plots created
+    templates : bool
+        Whether the plots reuse the figure template of the first one
+
+    Returns
+    -------
+    float
+        Time per plot in seconds
+    """
+    clear_figure_templates()
+    plot_cls(**kwargs)
+    start = time.perf_counter()
+    for _ in range(n_plots):
+        if not templates:
+            clear_figure_templates()
+        plot_cls(**kwargs)
+    return (time.perf_counter() - start) / n_plots
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n_plots", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with use_render_mode("batch"):
+        for name, plot_cls, kwargs in PLOTS:
+            times = {
+                templates: min(
+                    time_plots(plot_cls, kwargs, args.n_plots, templates)
+                    for _ in range(args.repeat)
+                )
+                for templates in (False, True)
+            }
+            print(
+                f"{name:<14} without templates {times[False] * 1e3:6.1f} ms/plot, "
+                f"with templates {times[True] * 1e3:6.1f} ms/plot, "
+                f"speed-up {times[False] / times[True]:4.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
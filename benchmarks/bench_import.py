@@ -0,0 +1,68 @@
+"""Benchmark the import time of the puma modules.
+
+Each module is imported in a fresh interpreter and the cumulative import time
+reported by `python -X importtime` is shown, together with the heavy optional
+dependencies which were pulled in by the import.
+
+Run with `python benchmarks/bench_import.py [--repeat N] [modules ...]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+HEAVY_MODULES = ["matplotlib.pyplot", "pandas", "ftag.hdf5", "IPython", "tkinter"]
+
+
+def import_time(module: str) -> tuple[float, list[str]]:
+    """Import a module in a fresh interpreter.
+
+    Parameters
+    ----------
+    module : str
+        Name of the module
+
+    Returns
+    -------
+    tuple[float, list[str]]
+        Cumulative import time in ms and the heavy modules which were imported
+    """
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    top_level = [
+        line for line in result.stderr.splitlines() if line.split("|")[-1].strip() == module
+    ]
+    cumulative = int(top_level[-1].split("|")[1])
+    return cumulative / 1e3, [m for m in result.stdout.strip().split(",") if m]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        default=["puma", "puma.utils", "puma.hlplots", "puma.hlplots.yuma", "puma.plot_base"],
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        results = [import_time(module) for _ in range(args.repeat)]
+        best = min(time for time, _ in results)
+        heavy = ", ".join(results[0][1]) or "-"
+        print(f"{module:<20} {best:8.1f} ms   heavy imports: {heavy}")
+
+
+if __name__ == "__main__":
+    main()
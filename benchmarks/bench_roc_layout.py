@@ -0,0 +1,81 @@
+"""Benchmark drawing and saving ROC plots with ratio panels.
+
+Run with `python benchmarks/bench_roc_layout.py [--n_points N] [--repeat N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from puma import Roc, RocPlot
+from puma.plot_base import use_render_mode
+
+REJ_CLASSES = ("ujets", "cjets", "taujets")
+
+
+def make_plot(n_ratio_panels: int, sig_eff: np.ndarray) -> RocPlot:
+    """Fill a ROC plot with two taggers for each rejection class.
+
+    Parameters
+    ----------
+    n_ratio_panels : int
+        Number of ratio panels, one per rejection class
+    sig_eff : np.ndarray
+        Signal efficiencies of the ROC curves
+
+    Returns
+    -------
+    RocPlot
+        The filled, not yet drawn plot
+    """
+    plot = RocPlot(n_ratio_panels=n_ratio_panels, ylabel="Background rejection")
+    for panel, rej_class in enumerate(REJ_CLASSES[:n_ratio_panels], start=1):
+        for scale, label in ((1, "reference"), (2, "tagger")):
+            plot.add_roc(
+                Roc(
+                    sig_eff,
+                    scale * panel / (1.01 - sig_eff),
+                    n_test=10_000,
+                    rej_class=rej_class,
+                    label=label,
+                ),
+                reference=scale == 1,
+            )
+        plot.set_ratio_class(panel, rej_class)
+    return plot
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n_points", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sig_eff = np.linspace(0.5, 1, args.n_points)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for render_mode in ("interactive", "batch"):
+            for n_ratio_panels in (1, 2, 3):
+                draw, save = [], []
+                for _ in range(args.repeat):
+                    with use_render_mode(render_mode):
+                        plot = make_plot(n_ratio_panels, sig_eff)
+                    start = time.perf_counter()
+                    plot.draw()
+                    draw.append(time.perf_counter() - start)
+                    start = time.perf_counter()
+                    plot.savefig(Path(tmp_dir) / "roc.png", dpi=100)
+                    save.append(time.perf_counter() - start)
+                print(
+                    f"{render_mode:<12} {n_ratio_panels} ratio panels: "
+                    f"draw {min(draw) * 1e3:7.1f} ms, savefig {min(save) * 1e3:7.1f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
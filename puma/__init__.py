@@ -4,15 +4,45 @@ from __future__ import annotations
 
 __version__ = "0.4.12"
 
-from puma.histogram import Histogram, HistogramPlot
-from puma.integrated_eff import IntegratedEfficiency, IntegratedEfficiencyPlot
-from puma.line_plot_2d import Line2D, Line2DPlot
-from puma.pie import PiePlot
-from puma.plot_base import PlotBase, PlotLineObject, PlotObject
-from puma.roc import Roc, RocPlot
-from puma.var_vs_eff import VarVsEff, VarVsEffPlot
-from puma.var_vs_var import VarVsVar, VarVsVarPlot
-from puma.var_vs_vtx import VarVsVtx, VarVsVtxPlot
+from typing import TYPE_CHECKING
+
+from puma.utils.lazy import lazy_module
+
+if TYPE_CHECKING:  # pragma: no cover
+    from puma.bundle import PlotBundle
+    from puma.histogram import Histogram, HistogramPlot
+    from puma.integrated_eff import IntegratedEfficiency, IntegratedEfficiencyPlot
+    from puma.line_plot_2d import Line2D, Line2DPlot
+    from puma.pie import PiePlot
+    from puma.plot_base import PlotBase, PlotLineObject, PlotObject
+    from puma.roc import Roc, RocPlot
+    from puma.var_vs_eff import VarVsEff, VarVsEffPlot
+    from puma.var_vs_var import VarVsVar, VarVsVarPlot
+    from puma.var_vs_vtx import VarVsVtx, VarVsVtxPlot
+
+# The plot classes are only imported on first access, so that importing
+# e.g. `puma.utils` does not pay for matplotlib, atlasify and ftag
+_LAZY_IMPORTS = {
+    "Histogram": "puma.histogram",
+    "HistogramPlot": "puma.histogram",
+    "IntegratedEfficiency": "puma.integrated_eff",
+    "IntegratedEfficiencyPlot": "puma.integrated_eff",
+    "Line2D": "puma.line_plot_2d",
+    "Line2DPlot": "puma.line_plot_2d",
+    "PiePlot": "puma.pie",
+    "PlotBase": "puma.plot_base",
+    "PlotBundle": "puma.bundle",
+    "PlotLineObject": "puma.plot_base",
+    "PlotObject": "puma.plot_base",
+    "Roc": "puma.roc",
+    "RocPlot": "puma.roc",
+    "VarVsEff": "puma.var_vs_eff",
+    "VarVsEffPlot": "puma.var_vs_eff",
+    "VarVsVar": "puma.var_vs_var",
+    "VarVsVarPlot": "puma.var_vs_var",
+    "VarVsVtx": "puma.var_vs_vtx",
+    "VarVsVtxPlot": "puma.var_vs_vtx",
+}
 
 __all__ = [
     "Histogram",
@@ -23,6 +53,7 @@ __all__ = [
     "Line2DPlot",
     "PiePlot",
     "PlotBase",
+    "PlotBundle",
     "PlotLineObject",
     "PlotObject",
     "Roc",
@@ -34,3 +65,6 @@ __all__ = [
     "VarVsVtx",
     "VarVsVtxPlot",
 ]
+
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
@@ -0,0 +1,189 @@
+"""Serialisable plot bundles, which are re-rendered without access to the data."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from puma.plot_base import PlotBase, PlotLineObject, import_class
+
+BUNDLE_VERSION = 1
+
+
+@dataclass
+class PlotBundle:
+    """Fully computed plot, which can be restyled and re-rendered without the data.
+
+    A bundle stores the class and the constructor arguments of a plot together
+    with the recorded calls made on it, e.g. `add()`, `set_ratio_class()` and
+    `draw()`. The line objects passed to these calls are stored via their
+    `args_to_store`. All entries are encoded with `PlotLineObject.encode`, so the
+    bundle can be written to json and yaml files. Bundles are created with
+    `PlotBase.bundle()`.
+
+    Parameters
+    ----------
+    plot_class : str
+        Path of the plot class, e.g. "puma.roc:RocPlot"
+    args : list, optional
+        Encoded positional arguments of the plot constructor, by default []
+    kwargs : dict, optional
+        Encoded keyword arguments of the plot constructor, by default {}
+    calls : list, optional
+        Encoded calls made on the plot, each as [method name, args, kwargs],
+        by default []
+    plot_name : str | list[str], optional
+        File name, or list of file names, the plot is saved to when rendered,
+        by default None
+
+    Example
+    -------
+    >>> plot.draw()
+    >>> plot.bundle().save("roc.bundle.json")
+    >>> render("roc.bundle.json", "roc.pdf", atlas_second_tag="New tag")
+    """
+
+    plot_class: str
+    args: list = field(default_factory=list)
+    kwargs: dict = field(default_factory=dict)
+    calls: list = field(default_factory=list)
+    plot_name: str | list[str] | None = None
+
+    def save(self, path: str | Path) -> None:
+        """Write the bundle to a file (json or yaml).
+
+        Parameters
+        ----------
+        path : str | Path
+            Path to which the bundle is written.
+
+        Raises
+        ------
+        ValueError
+            If an unknown file extension was given
+        TypeError
+            If the bundle contains values which cannot be stored in json or yaml.
+            No file is written in this case.
+        """
+        path = Path(path)
+        data = {"version": BUNDLE_VERSION, **asdict(self)}
+
+        # Serialise the whole bundle first, so that no partial file is written
+        try:
+            if path.suffix == ".json":
+                text = json.dumps(data)
+            elif path.suffix in {".yaml", ".yml"}:
+                text = yaml.safe_dump(data)
+            else:
+                raise ValueError("Unknown file extension. Use '.json', '.yaml' or '.yml'!")
+        except (TypeError, yaml.representer.RepresenterError) as error:
+            raise TypeError(
+                f"Cannot store the plot bundle of {self.plot_class} in {path}, it contains "
+                f"values which are not supported by `PlotLineObject.encode`: {error}"
+            ) from error
+        path.write_text(text)
+
+    @classmethod
+    def load(cls, path: str | Path) -> PlotBundle:
+        """Read a bundle from a file (json or yaml).
+
+        Parameters
+        ----------
+        path : str | Path
+            Path in which the bundle is stored.
+
+        Returns
+        -------
+        PlotBundle
+            The loaded bundle
+
+        Raises
+        ------
+        ValueError
+            If the given file is neither json nor a yaml file.
+            If the bundle was written with an unsupported version.
+        """
+        path = Path(path)
+
+        if path.suffix == ".json":
+            with path.open() as f:
+                data = json.load(f)
+        elif path.suffix in {".yaml", ".yml"}:
+            with path.open() as f:
+                data = yaml.safe_load(f)
+        else:
+            raise ValueError("Unknown file extension. Use '.json', '.yaml' or '.yml'.")
+
+        version = data.pop("version", None)
+        if version != BUNDLE_VERSION:
+            raise ValueError(
+                f"Plot bundle {path} has version {version}, only {BUNDLE_VERSION} is supported."
+            )
+        return cls(**data)
+
+    def render(
+        self,
+        plot_name: str | Path | list[str | Path] | None = None,
+        **plot_kwargs: Any,
+    ) -> PlotBase:
+        """Re-create the plot and replay the recorded calls.
+
+        Parameters
+        ----------
+        plot_name : str | Path | list[str | Path], optional
+            File name, or list of file names, the plot is saved to, by default the
+            one stored in the bundle. If neither is set, the plot is not saved.
+        **plot_kwargs : kwargs
+            Keyword arguments of the plot class, e.g. `puma.PlotObject` arguments
+            like `atlas_second_tag` or `figsize`, which override the stored ones
+
+        Returns
+        -------
+        PlotBase
+            The rendered plot
+        """
+        plot_cls = import_class(self.plot_class, PlotBase)
+        kwargs = {**PlotLineObject.decode(self.kwargs), **plot_kwargs}
+        plot = plot_cls(*PlotLineObject.decode(self.args), **kwargs)
+
+        for name, args, call_kwargs in self.calls:
+            # Attributes set after the construction must not undo the overrides
+            if name == "__setattr__" and args[0] in plot_kwargs:
+                continue
+            getattr(plot, name)(*PlotLineObject.decode(args), **PlotLineObject.decode(call_kwargs))
+
+        plot_name = plot_name if plot_name is not None else self.plot_name
+        if plot_name is not None:
+            plot.savefig(plot_name)
+        return plot
+
+
+def render(
+    bundle: PlotBundle | str | Path,
+    plot_name: str | Path | list[str | Path] | None = None,
+    **plot_kwargs: Any,
+) -> PlotBase:
+    """Render a plot bundle, e.g. to restyle plots without recomputing them.
+
+    Parameters
+    ----------
+    bundle : PlotBundle | str | Path
+        Plot bundle or path to a bundle file
+    plot_name : str | Path | list[str | Path], optional
+        File name, or list of file names, the plot is saved to, by default the one
+        stored in the bundle. If neither is set, the plot is not saved.
+    **plot_kwargs : kwargs
+        Keyword arguments of the plot class, which override the stored ones
+
+    Returns
+    -------
+    PlotBase
+        The rendered plot
+    """
+    if not isinstance(bundle, PlotBundle):
+        bundle = PlotBundle.load(bundle)
+    return bundle.render(plot_name, **plot_kwargs)
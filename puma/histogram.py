@@ -9,7 +9,7 @@ import numpy as np
 import pandas as pd
 from ftag import Flavours, Label
 
-from puma.plot_base import PlotBase, PlotLineObject
+from puma.plot_base import PlotBase, PlotLineObject, record_call
 from puma.utils import get_good_colours, logger
 from puma.utils.histogram import hist_ratio, hist_w_unc
 
@@ -459,6 +459,7 @@ class HistogramPlot(PlotBase):
             raise ValueError("Not more than one ratio panel supported.")
         self.initialise_figure()
 
+    @record_call
     def add(
         self,
         histogram: Histogram,
@@ -523,6 +524,7 @@ class HistogramPlot(PlotBase):
         if reference is True:
             self.set_reference(key)
 
+    @record_call
     def set_reference(self, key: str):
         """Setting the reference histogram curves used in the ratios.
 
@@ -902,6 +904,7 @@ class HistogramPlot(PlotBase):
             self.ylabel = f"{self.ylabel} / {bin_width:.2f}"
         self.set_ylabel(self.axis_top)
 
+    @record_call
     def draw(self, labelpad: int | None = None):
         """Draw figure.
 
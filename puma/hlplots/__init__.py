@@ -2,12 +2,29 @@
 
 from __future__ import annotations
 
-from puma.hlplots.aux_results import AuxResults
-from puma.hlplots.n_track_origin import n_tracks_per_origin
-from puma.hlplots.results import Results, separate_kwargs
-from puma.hlplots.tagger import Tagger
-from puma.hlplots.yuma import YumaConfig
-from puma.hlplots.yutils import combine_suffixes, get_included_taggers
+from typing import TYPE_CHECKING
+
+from puma.utils.lazy import lazy_module
+
+if TYPE_CHECKING:  # pragma: no cover
+    from puma.hlplots.aux_results import AuxResults
+    from puma.hlplots.n_track_origin import n_tracks_per_origin
+    from puma.hlplots.results import Results, separate_kwargs
+    from puma.hlplots.tagger import Tagger
+    from puma.hlplots.yuma import YumaConfig
+    from puma.hlplots.yutils import combine_suffixes, get_included_taggers
+
+# Imported on first access, as the results pull in `ftag.hdf5` and pandas
+_LAZY_IMPORTS = {
+    "AuxResults": "puma.hlplots.aux_results",
+    "Results": "puma.hlplots.results",
+    "Tagger": "puma.hlplots.tagger",
+    "YumaConfig": "puma.hlplots.yuma",
+    "combine_suffixes": "puma.hlplots.yutils",
+    "get_included_taggers": "puma.hlplots.yutils",
+    "n_tracks_per_origin": "puma.hlplots.n_track_origin",
+    "separate_kwargs": "puma.hlplots.results",
+}
 
 __all__ = [
     "AuxResults",
@@ -19,3 +36,6 @@ __all__ = [
     "n_tracks_per_origin",
     "separate_kwargs",
 ]
+
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
@@ -10,14 +10,14 @@ import numpy as np
 from ftag import Cuts, Flavours, Label
 from ftag.hdf5 import H5Reader
 
-from puma import Histogram, HistogramPlot
+from puma import Histogram, HistogramPlot, Line2D, Line2DPlot
 from puma.hlplots.tagger import Tagger
 from puma.matshow import MatshowPlot
-from puma.utils import get_good_linestyles, logger
+from puma.utils import get_good_colours, get_good_linestyles, logger
 from puma.utils.aux import get_aux_labels, get_trackOrigin_classNames
-from puma.utils.confusion_matrix import confusion_matrix
-from puma.utils.mass import calculate_vertex_mass
-from puma.utils.precision_recall_scores import precision_recall_scores_per_class
+from puma.utils.confusion_matrix import ConfusionMatrixAccumulator
+from puma.utils.mass import calculate_vertex_mass, unique_vertex_masses
+from puma.utils.score_curves import ScoreCurveAccumulator
 from puma.utils.vertexing import calculate_vertex_metrics
 from puma.var_vs_vtx import VarVsVtx, VarVsVtxPlot
 
@@ -38,6 +38,8 @@ class AuxResults:
     global_cuts: Cuts | list | None = None
     num_jets: int | None = None
     remove_nan: bool = False
+    n_workers: int = 1
+    chunk_size: int = 10_000
 
     def __post_init__(self):
         """Run post init checks of the inputs."""
@@ -108,17 +110,17 @@ class AuxResults:
 
         def check_nan(data: np.ndarray) -> np.ndarray:
             """
-            Filter out NaN values from loaded data.
+            Find jets without NaN values in the loaded data.
 
             Parameters
             ----------
             data : ndarray
-                Data to filter
+                Data to check
 
             Returns
             -------
             np.ndarray
-                The data without NaNs
+                Boolean mask of the jets without NaNs
 
             Raises
             ------
@@ -127,15 +129,15 @@ class AuxResults:
             """
             mask = np.ones(len(data), dtype=bool)
             for name in data.dtype.names:
-                mask = np.logical_and(mask, ~np.isnan(data[name]))
+                mask &= ~np.isnan(data[name])
             if np.sum(~mask) > 0:
                 if self.remove_nan:
                     logger.warning(
                         f"{np.sum(~mask)} NaN values found in loaded data. Removing" " them."
                     )
-                    return data[mask]
+                    return mask
                 raise ValueError(f"{np.sum(~mask)} NaN values found in loaded data.")
-            return data
+            return mask
 
         # set tagger output nodes
         for tagger in taggers:
@@ -158,35 +160,59 @@ class AuxResults:
             aux_var_list += self.aux_perf_vars
         aux_var_list = list(set(aux_var_list))
 
-        # load data
-        reader = H5Reader(file_path, precision="full", shuffle=False)
-        data = reader.load({key: var_list}, num_jets)[key]
-        aux_reader = H5Reader(file_path, precision="full", jets_name=aux_key, shuffle=False)
-        aux_data = aux_reader.load({aux_key: aux_var_list}, num_jets)[aux_key]
-
-        # check for nan values
-        data = check_nan(data)
-        # apply common cuts
-        if cuts:
-            idx, data = cuts(data)
+        # load the per-class track origin probabilities, if they are in the file
+        reader = H5Reader(file_path, precision="full", jets_name=key, shuffle=False)
+        available = set(reader.dtypes()[aux_key].names)
+        prob_vars = {}
+        for tagger in taggers:
+            variables = tagger.aux_probability_variables.get("track_origin", [])
+            if variables and available.issuperset(variables):
+                prob_vars[tagger.name] = variables
+                aux_var_list += [var for var in variables if var not in aux_var_list]
+
+        # load jets and tracks in one read with a consistent row selection
+        loaded = reader.load({key: var_list, aux_key: aux_var_list}, num_jets)
+        data, aux_data = loaded[key], loaded[aux_key]
+
+        # remove jets with nan values and apply common cuts, once for both groups
+        is_valid = check_nan(data)
+        idx = cuts(data).idx if cuts else np.arange(len(data))
+        idx = idx[is_valid[idx]]
+        if len(idx) < len(data):
+            data = data[idx]
             aux_data = aux_data[idx]
             if isinstance(perf_vars, dict):
-                for name, array in perf_vars.items():
-                    perf_vars[name] = array[idx]
+                perf_vars = {name: array[idx] for name, array in perf_vars.items()}
+
+        # keep the aux task arrays in compact integer types
+        aux_dtypes = {"vertexing": np.int16, "track_origin": np.int8}
+        aux_arrays = {}
+        for task, var in aux_labels.items():
+            aux_arrays[var] = aux_data[var].astype(aux_dtypes[task])
+        for tagger in taggers:
+            for task, var in tagger.aux_variables.items():
+                aux_arrays[var] = aux_data[var].astype(aux_dtypes[task])
+        for var in self.aux_perf_vars or []:
+            if var not in aux_arrays:
+                aux_arrays[var] = np.ascontiguousarray(aux_data[var])
+        for name, variables in prob_vars.items():
+            aux_arrays[f"{name}_track_origin_probs"] = np.stack(
+                [aux_data[var] for var in variables], axis=-1, dtype=np.float32
+            )
+        del aux_data
 
         # for each tagger
         for tagger in taggers:
             sel_data = data
-            sel_aux_data = aux_data
+            sel_aux_data = aux_arrays
             sel_perf_vars = perf_vars
 
             # apply tagger specific cuts
             if tagger.cuts:
                 idx, sel_data = tagger.cuts(data)
-                sel_aux_data = aux_data[idx]
-                if isinstance(sel_perf_vars, dict):
-                    for name, array in sel_perf_vars.items():
-                        sel_perf_vars[name] = array[idx]
+                sel_aux_data = {name: array[idx] for name, array in aux_arrays.items()}
+                if isinstance(perf_vars, dict):
+                    sel_perf_vars = {name: array[idx] for name, array in perf_vars.items()}
 
             # attach data to tagger objects
             assert isinstance(tagger.aux_scores, dict)
@@ -194,6 +220,10 @@ class AuxResults:
             tagger.labels = np.array(sel_data[label_var], dtype=[(label_var, "i4")])
             for task in tagger.aux_tasks:
                 tagger.aux_scores[task] = sel_aux_data[tagger.aux_variables[task]]
+            if tagger.name in prob_vars:
+                tagger.aux_scores["track_origin_probs"] = sel_aux_data[
+                    f"{tagger.name}_track_origin_probs"
+                ]
             for task in aux_labels:
                 tagger.aux_labels[task] = sel_aux_data[aux_labels[task]]
             if perf_vars is None:
@@ -329,9 +359,24 @@ class AuxResults:
             truth_indices, reco_indices = tagger.vertex_indices(incl_vertexing=incl_vertexing)
             max_vertices = 20 if not incl_vertexing else 1
             vtx_metrics[tagger.label] = calculate_vertex_metrics(
-                reco_indices, truth_indices, max_vertices=max_vertices, **vertex_match_requirement
+                reco_indices,
+                truth_indices,
+                max_vertices=max_vertices,
+                chunk_size=self.chunk_size,
+                n_workers=self.n_workers,
+                **vertex_match_requirement,
             )
 
+            # number of matched, true and reco tracks per jet, for all flavours at once
+            metrics = vtx_metrics[tagger.label]
+            include_sum = metrics["track_overlap"] >= 0
+            for n_trk, key in (
+                ("n_trk_match", "track_overlap"),
+                ("n_trk_true", "ref_vertex_size"),
+                ("n_trk_reco", "test_vertex_size"),
+            ):
+                metrics[n_trk] = np.sum(metrics[key], axis=1, where=include_sum)
+
         if not vtx_metrics:
             raise ValueError("No taggers with vertexing aux task added.")
 
@@ -385,13 +430,13 @@ class AuxResults:
                 if tagger.label not in vtx_metrics:
                     continue
                 is_flavour = tagger.is_flav(flav)
-                include_sum = vtx_metrics[tagger.label]["track_overlap"][is_flavour] >= 0
+                metrics = vtx_metrics[tagger.label]
 
                 vtx_perf = VarVsVtx(
                     x_var=tagger.perf_vars[perf_var][is_flavour],
-                    n_match=vtx_metrics[tagger.label]["n_match"][is_flavour],
-                    n_true=vtx_metrics[tagger.label]["n_ref"][is_flavour],
-                    n_reco=vtx_metrics[tagger.label]["n_test"][is_flavour],
+                    n_match=metrics["n_match"][is_flavour],
+                    n_true=metrics["n_ref"][is_flavour],
+                    n_reco=metrics["n_test"][is_flavour],
                     label=tagger.label,
                     colour=tagger.colour,
                     linestyle=line_styles[counter],
@@ -399,21 +444,9 @@ class AuxResults:
                 )
                 vtx_trk_perf = VarVsVtx(
                     x_var=tagger.perf_vars[perf_var][is_flavour],
-                    n_match=np.sum(
-                        vtx_metrics[tagger.label]["track_overlap"][is_flavour],
-                        axis=1,
-                        where=include_sum,
-                    ),
-                    n_true=np.sum(
-                        vtx_metrics[tagger.label]["ref_vertex_size"][is_flavour],
-                        axis=1,
-                        where=include_sum,
-                    ),
-                    n_reco=np.sum(
-                        vtx_metrics[tagger.label]["test_vertex_size"][is_flavour],
-                        axis=1,
-                        where=include_sum,
-                    ),
+                    n_match=metrics["n_trk_match"][is_flavour],
+                    n_true=metrics["n_trk_true"][is_flavour],
+                    n_reco=metrics["n_trk_reco"][is_flavour],
                     label=tagger.label,
                     colour=tagger.colour,
                     linestyle=line_styles[counter],
@@ -585,6 +618,8 @@ class AuxResults:
                         tagger.aux_perf_vars["dphi"][is_flavour],
                         truth_indices[is_flavour],
                         particle_mass=0.13957,  # pion mass in GeV
+                        chunk_size=self.chunk_size,
+                        n_workers=self.n_workers,
                     )
 
                     if incl_vertexing:
@@ -608,6 +643,8 @@ class AuxResults:
                     tagger.aux_perf_vars["dphi"][is_flavour],
                     reco_indices[is_flavour],
                     particle_mass=0.13957,  # pion mass in GeV
+                    chunk_size=self.chunk_size,
+                    n_workers=self.n_workers,
                 )
 
                 if incl_vertexing:
@@ -628,7 +665,7 @@ class AuxResults:
                         )
                     )
                 else:
-                    sv_masses = np.concatenate([np.unique(imass) for imass in masses])
+                    sv_masses = unique_vertex_masses(masses)
 
                 sv_masses = sv_masses[sv_masses > 0.14]  # remove single and zero track vertices
                 mass_plot.add(
@@ -670,21 +707,24 @@ class AuxResults:
             Keyword arguments for `puma.MatshowPlot` and `puma.PlotObject`
         """
         for tagger in self.taggers.values():
-            # Reading tagger's target and predicted labels
-            # and flattening them so that they have shape (Ntracks,)
-            target = tagger.aux_labels["track_origin"].reshape(-1)
-            predictions = tagger.aux_scores["track_origin"].reshape(-1)
-
-            padding_removal = target >= 0
-
-            target = target[padding_removal]
-            predictions = predictions[padding_removal]
+            # Filling the confusion matrix from the tagger's target and predicted labels,
+            # in chunks of jets to avoid copies of the full flattened track arrays
+            class_names = get_trackOrigin_classNames()
+            target = tagger.aux_labels["track_origin"]
+            predictions = tagger.aux_scores["track_origin"]
+            accumulator = ConfusionMatrixAccumulator(n_classes=len(class_names))
+            for start in range(0, len(target), self.chunk_size):
+                target_chunk = target[start : start + self.chunk_size]
+                padding_removal = target_chunk >= 0
+                accumulator.fill(
+                    target_chunk[padding_removal],
+                    predictions[start : start + self.chunk_size][padding_removal],
+                )
 
             # Computing the confusion matrix
-            cm = confusion_matrix(target, predictions, normalize=normalize)
-            precision, recall = precision_recall_scores_per_class(target, predictions)
+            cm = accumulator.confusion_matrix(normalize=normalize)
+            precision, recall = accumulator.precision_recall()
 
-            class_names = get_trackOrigin_classNames()
             class_names_with_perf = []
 
             if minimal_plot:
@@ -727,3 +767,84 @@ class AuxResults:
             base = tagger.name + "_trackOrigin_cm"
             plot_cm.savefig(self.get_filename(base))
             print("saved file with name", self.get_filename(base))
+
+    def plot_track_origin_curves(
+        self,
+        n_bins: int = 1000,
+        suffix: str | None = None,
+        **kwargs,
+    ):
+        """Plot per-class precision-recall and one-vs-rest ROC curves of the
+        track origin classification, scanning thresholds on the class probabilities.
+
+        The probabilities are read from `tagger.aux_scores["track_origin_probs"]`,
+        an array of shape (n_jets, n_tracks, n_classes), which
+        `load_taggers_from_file` fills from the `Tagger.aux_probability_variables`
+        if they are in the file. Taggers without them are skipped. The curves are
+        filled in chunks of jets from the masked tracks.
+
+        Parameters
+        ----------
+        n_bins : int, optional
+            Number of probability thresholds, by default 1000
+        suffix : str, optional
+            Suffix to add to the output file names, by default None
+        **kwargs : kwargs
+            Keyword arguments for `puma.Line2DPlot` and `puma.PlotObject`
+
+        Raises
+        ------
+        ValueError
+            If no tagger has track origin probabilities
+        """
+        class_names = get_trackOrigin_classNames()
+        colours = get_good_colours()
+        n_plotted = 0
+
+        for tagger in self.taggers.values():
+            probs = (tagger.aux_scores or {}).get("track_origin_probs")
+            if probs is None:
+                logger.warning(f"{tagger.label} has no track origin probabilities. Skipping.")
+                continue
+
+            target = tagger.aux_labels["track_origin"]
+            accumulator = ScoreCurveAccumulator(n_classes=len(class_names), n_bins=n_bins)
+            for start in range(0, len(target), self.chunk_size):
+                target_chunk = target[start : start + self.chunk_size]
+                padding_removal = target_chunk >= 0
+                accumulator.fill(
+                    target_chunk[padding_removal],
+                    probs[start : start + self.chunk_size][padding_removal],
+                )
+            precision, recall = accumulator.precision_recall()
+            fpr, tpr = accumulator.roc()
+
+            for name, xlabel, ylabel, x_values, y_values in [
+                ("pr", "Recall", "Precision", recall, precision),
+                ("roc", "False positive rate", "True positive rate", fpr, tpr),
+            ]:
+                plot = Line2DPlot(
+                    xlabel=xlabel,
+                    ylabel=ylabel,
+                    atlas_first_tag=self.atlas_first_tag,
+                    atlas_second_tag=self.atlas_second_tag,
+                    **kwargs,
+                )
+                for i, class_name in enumerate(class_names):
+                    valid = np.isfinite(x_values[i]) & np.isfinite(y_values[i])
+                    if not np.any(valid):
+                        continue
+                    plot.add(
+                        Line2D(
+                            x_values=x_values[i][valid],
+                            y_values=y_values[i][valid],
+                            label=class_name,
+                            colour=colours[i % len(colours)],
+                        )
+                    )
+                plot.draw()
+                plot.savefig(self.get_filename(f"{tagger.name}_trackOrigin_{name}", suffix))
+            n_plotted += 1
+
+        if n_plotted == 0:
+            raise ValueError("No taggers with track origin probabilities added.")
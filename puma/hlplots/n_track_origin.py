@@ -15,6 +15,127 @@ from puma.utils import get_good_colours, get_good_linestyles
 from puma.var_vs_var import VarVsVar, VarVsVarPlot
 
 
+def _track_origin_moments(
+    reader: H5Reader,
+    flavour_list: list[Label],
+    track_origin_dict: dict,
+    pt_bins: np.ndarray,
+    jet_pt_variable: str,
+    flavour_label_variable: str,
+    tracks_name: str,
+    track_truth_variable: str,
+    num_jets: int | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sum the number of tracks per origin of each flavour in pT bins.
+
+    The file is streamed once in batches. For each batch, the number of tracks of
+    each origin per jet is counted with a single `np.bincount` and the sums of the
+    number of tracks and of its square are accumulated per (flavour, origin group,
+    pT bin) with another `np.bincount`.
+
+    Parameters
+    ----------
+    reader : H5Reader
+        Reader of the file
+    flavour_list : list[Label]
+        Flavours to consider
+    track_origin_dict : dict
+        Track origin groups with their origin value(s)
+    pt_bins : np.ndarray
+        pT bin edges, jets outside are not used
+    jet_pt_variable : str
+        Name of the jet pT variable
+    flavour_label_variable : str
+        Name of the flavour label variable
+    tracks_name : str
+        Name of the track collection
+    track_truth_variable : str
+        Name of the track truth origin variable
+    num_jets : int | None, optional
+        Maximum number of selected jets per flavour, by default all jets
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        Number of jets of shape (n_flavours, n_bins) and sums of the number of
+        tracks and of its square of shape (n_flavours, n_origin_groups, n_bins)
+    """
+    jets_name = reader.jets_name
+    variables = {
+        jets_name: list(
+            dict.fromkeys([
+                jet_pt_variable,
+                flavour_label_variable,
+                *(var for flavour in flavour_list for var in flavour.cuts.variables),
+            ])
+        ),
+        tracks_name: [track_truth_variable],
+    }
+    kinematic_cuts = Cuts.from_list([
+        f"{jet_pt_variable} > {pt_bins[0]}",
+        f"{jet_pt_variable} < {pt_bins[-1]}",
+    ])
+    n_flavours, n_groups, n_bins = len(flavour_list), len(track_origin_dict), len(pt_bins) - 1
+
+    # Membership of each origin value in the origin groups
+    n_origins = max(int(np.max(origins)) for origins in track_origin_dict.values()) + 1
+    group_matrix = np.zeros((n_origins, n_groups), dtype=np.int64)
+    for group_counter, origins in enumerate(track_origin_dict.values()):
+        group_matrix[np.asarray(origins, dtype=np.intp), group_counter] = 1
+
+    n_jets_binned = np.zeros(n_flavours * n_bins)
+    n_trks_sum = np.zeros(n_flavours * n_groups * n_bins)
+    n_trks_sum_sq = np.zeros(n_flavours * n_groups * n_bins)
+    n_selected = np.zeros(n_flavours, dtype=np.int64)
+
+    for batch in reader.stream(variables=variables, cuts=kinematic_cuts):
+        jets = batch[jets_name]
+
+        # Select the jets of each flavour, up to the requested number of jets
+        jet_idx, flavour_idx = [], []
+        for flavour_counter, flavour in enumerate(flavour_list):
+            idx = flavour.cuts(jets).idx
+            if num_jets is not None:
+                idx = idx[: max(num_jets - n_selected[flavour_counter], 0)]
+            n_selected[flavour_counter] += len(idx)
+            jet_idx.append(idx)
+            flavour_idx.append(np.full(len(idx), flavour_counter))
+        jet_idx = np.concatenate(jet_idx)
+        flavour_idx = np.concatenate(flavour_idx)
+
+        # Number of tracks of each origin group per jet
+        truth = batch[tracks_name][track_truth_variable]
+        track_jet, track_idx = np.nonzero((truth >= 0) & (truth < n_origins))
+        origin_counts = np.bincount(
+            track_jet * n_origins + truth[track_jet, track_idx],
+            minlength=len(jets) * n_origins,
+        ).reshape(len(jets), n_origins)
+        n_trks = (origin_counts @ group_matrix)[jet_idx]
+
+        # Accumulate the moments in (flavour, origin group, pT bin)
+        bin_idx = np.digitize(jets[jet_pt_variable][jet_idx], pt_bins) - 1
+        in_range = (bin_idx >= 0) & (bin_idx < n_bins)
+        flavour_bin = flavour_idx[in_range] * n_bins + bin_idx[in_range]
+        n_trks = n_trks[in_range]
+        n_jets_binned += np.bincount(flavour_bin, minlength=n_jets_binned.size)
+
+        flavour_idx, bin_idx = np.divmod(flavour_bin, n_bins)
+        key = (flavour_idx[:, None] * n_groups + np.arange(n_groups)) * n_bins + bin_idx[:, None]
+        n_trks_sum += np.bincount(key.ravel(), weights=n_trks.ravel(), minlength=n_trks_sum.size)
+        n_trks_sum_sq += np.bincount(
+            key.ravel(), weights=(n_trks**2).ravel(), minlength=n_trks_sum_sq.size
+        )
+
+        if num_jets is not None and np.all(n_selected >= num_jets):
+            break
+
+    return (
+        n_jets_binned.reshape(n_flavours, n_bins),
+        n_trks_sum.reshape(n_flavours, n_groups, n_bins),
+        n_trks_sum_sq.reshape(n_flavours, n_groups, n_bins),
+    )
+
+
 def n_tracks_per_origin(
     flavour_list: list[Label],
     files: dict[str, dict[str, Any]],
@@ -40,7 +161,7 @@ def n_tracks_per_origin(
         pt_bins : np.ndarray
             Numpy array with the pT bins to use.
         n_jets : int, optional
-            Number of jets to load. By default load all jets.
+            Number of jets to load per flavour. By default load all jets.
         jets_name : str, optional
             Name of the jet collection in the h5 files. By default "jets".
         tracks_name : str, optional
@@ -172,75 +293,39 @@ def n_tracks_per_origin(
         # Get the pT bins for the given file
         pt_bins = file_value["pt_bins"]
 
-        # Init the reader for the file
-        reader = H5Reader(
-            fname=file_value["filepath"],
-            shuffle=False,
-        )
-
-        # Get the pT cuts that are to be applied
-        kinematic_cuts = Cuts.from_list([
-            f"{jet_pt_variable} > {pt_bins[0]}",
-            f"{jet_pt_variable} < {pt_bins[-1]}",
-        ])
-
         # Check if this file should be the reference
         reference_bool = file_value.get("reference", False)
 
-        # Iterate over the flavour and load them from the file
+        # Read the file once and get the track multiplicity moments of all flavours
+        n_jets_binned, n_trks_sum, n_trks_sum_sq = _track_origin_moments(
+            reader=H5Reader(fname=file_value["filepath"], jets_name=jets_name, shuffle=False),
+            flavour_list=flavour_list,
+            track_origin_dict=track_origin_dict,
+            pt_bins=pt_bins,
+            jet_pt_variable=jet_pt_variable,
+            flavour_label_variable=flavour_label_variable,
+            tracks_name=tracks_name,
+            track_truth_variable=track_truth_variable,
+            num_jets=file_value.get("n_jets", None),
+        )
+
+        # Mean number of tracks per jet and its standard error in each pT bin
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n_trks_means_all = n_trks_sum / n_jets_binned[:, None]
+            n_trks_var_all = np.maximum(
+                n_trks_sum_sq / n_jets_binned[:, None] - n_trks_means_all**2, 0
+            )
+            n_trks_std_all = np.sqrt(n_trks_var_all / n_jets_binned[:, None])
+
+        # Iterate over the flavours
         for flavour_counter, flavour in enumerate(flavour_list):
             # Get the iterator to correctly choose the plot to add to
             plot_iterator = file_key if all_flav_plot else flavour.name
 
-            # Load the data
-            data = reader.load(
-                variables={
-                    jets_name: [jet_pt_variable, flavour_label_variable],
-                    tracks_name: [track_truth_variable],
-                },
-                num_jets=file_value.get("n_jets", None),
-                cuts=kinematic_cuts + flavour.cuts,
-            )
-
             # Loop over the different track origins
-            for trk_origin_counter, (trk_origin_key, track_origin_value) in enumerate(
-                track_origin_dict.items()
-            ):
-                # Get the number of tracks from this specific origin
-                n_trks_tmp = np.sum(
-                    np.isin(
-                        data[tracks_name][track_truth_variable],
-                        track_origin_value,
-                    ),
-                    axis=1,
-                )
-
-                # Bin it in pT
-                bin_indices = (
-                    np.digitize(
-                        data[jets_name][jet_pt_variable],
-                        pt_bins,
-                    )
-                    - 1
-                )
-
-                # Calculate mean n_trks for the given origin in pT bins
-                n_trks_means = np.array([
-                    np.mean(n_trks_tmp[bin_indices == i]) for i in range(len(pt_bins) - 1)
-                ])
-
-                # Calculate the std error
-                n_trks_std = [
-                    np.sqrt(
-                        np.sum(
-                            (n_trks_tmp[bin_indices == i] - np.mean(n_trks_tmp[bin_indices == i]))
-                            ** 2
-                        )
-                        / len(n_trks_tmp[bin_indices == i] - 1)
-                    )
-                    / np.sqrt(len(n_trks_tmp[bin_indices == i]))
-                    for i in range(len(pt_bins) - 1)
-                ]
+            for trk_origin_counter, trk_origin_key in enumerate(track_origin_dict):
+                n_trks_means = n_trks_means_all[flavour_counter, trk_origin_counter]
+                n_trks_std = n_trks_std_all[flavour_counter, trk_origin_counter]
 
                 # Plot the curve
                 var_plot_dict[plot_iterator].add(
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Any, Callable, cast
 
 import numpy as np
+import pandas as pd
 from ftag import Cuts, Flavours, Label
 from ftag.hdf5 import H5Reader
 from ftag.utils import calculate_efficiency, calculate_rejection
@@ -26,6 +27,7 @@ from puma import (
 )
 from puma.hlplots.tagger import Tagger
 from puma.hlplots.yutils import combine_suffixes
+from puma.plot_base import flush_save_queue
 from puma.utils import get_good_colours, get_good_linestyles, logger
 
 
@@ -139,11 +141,14 @@ class Results:
     taggers: dict[str, Tagger] = field(default_factory=dict)
     perf_vars: str | tuple | list = "pt"
     output_dir: str | Path = "."
-    extension: str = "pdf"
+    extension: str | list[str] = "pdf"
     global_cuts: Cuts | list | None = None
     num_jets: int | None = None
     remove_nan: bool = False
     label_var: str = "HadronConeExclTruthLabelID"
+    save_bundles: bool = False
+    dpi: int | list[int] | None = None
+    save_in_background: bool = False
 
     def __post_init__(self):
         """Run post init checks of the inputs."""
@@ -366,6 +371,37 @@ class Results:
         """
         return self.taggers[tagger_name]
 
+    def working_point_table(
+        self,
+        effs: float | list[float],
+        path: Path | str | None = None,
+    ) -> pd.DataFrame:
+        """Table with the discriminant cuts and background rejections of all taggers.
+
+        Parameters
+        ----------
+        effs : float | list[float]
+            Signal efficiencies of the working points
+        path : Path | str | None, optional
+            If given, the table is also written to this path as csv, by default None
+
+        Returns
+        -------
+        pd.DataFrame
+            Table with one row per tagger and working point
+        """
+        table = pd.concat(
+            [
+                tagger.working_points(self.signal, effs).assign(tagger=tagger.name)
+                for tagger in self.taggers.values()
+            ],
+            ignore_index=True,
+        )
+        table = table[["tagger", *(col for col in table.columns if col != "tagger")]]
+        if path is not None:
+            table.to_csv(path, index=False)
+        return table
+
     def output_directory(self, plot_type: str) -> Path:
         """Create and return the output directory for the plot.
 
@@ -391,7 +427,14 @@ class Results:
         base: str | None = None,
         suffix: str | None = None,
     ):
-        """Get the output file path.
+        """Get the output file path and save the plot.
+
+        The plot is written once for each of the `extension`s, with the given `dpi`
+        or one DPI per extension. If `save_bundles` is set, the plot is also stored
+        as a plot bundle "<name>.bundle.json" next to it, see `puma.bundle.PlotBundle`.
+        Bundles which cannot be stored are skipped with a warning.
+        If `save_in_background` is set, the files are written by the save queue while
+        the next plot is made, call `flush()` to wait until all plots are written.
 
         Parameters
         ----------
@@ -412,9 +455,30 @@ class Results:
         fname += f"_{base}"
         if suffix:
             fname += f"_{suffix}"
-        fpath = out_dir / f"{fname}.{self.extension}"
-        plot.savefig(fpath)
-        self.saved_plots.append(fpath)
+        extensions = [self.extension] if isinstance(self.extension, str) else self.extension
+        fpaths = [out_dir / f"{fname}.{extension}" for extension in extensions]
+        plot.savefig(
+            fpaths,
+            dpi=self.dpi,
+            background=self.save_in_background,
+            close=self.save_in_background,
+        )
+        self.saved_plots.extend(fpaths)
+        if self.save_bundles:
+            # Allows to restyle the plot later with `puma.bundle.render`
+            bundle_path = out_dir / f"{fname}.bundle.json"
+            try:
+                plot.bundle(plot_name=fpaths).save(bundle_path)
+            except TypeError as error:
+                logger.warning("Could not save the plot bundle %s: %s", bundle_path, error)
+
+    def flush(self):
+        """Wait until all plots saved in the background are written.
+
+        The first error raised while writing a plot is raised again, so failures
+        of the background writing are not lost.
+        """
+        flush_save_queue()
 
     def plot_probs(
         self,
@@ -643,15 +707,11 @@ class Results:
             # Get the discriminant values from the tagger for the given signal
             discs = tagger.discriminant(self.signal)
 
-            # Get lists for the working put cuts and labels
-            wp_cuts, wp_labels = [], []
-
-            # get working point cuts and labels and append them
-            for wp in wp_vlines:
-                cut = np.percentile(discs[tagger.is_flav(self.signal)], 100 - wp)
-                label = None if counter > 0 else f"{wp}%"
-                wp_cuts.append(cut)
-                wp_labels.append(label)
+            # Get the working point cuts and labels
+            wp_cuts = list(
+                tagger.working_points(self.signal, [wp / 100 for wp in wp_vlines])["cut"]
+            )
+            wp_labels = [None if counter > 0 else f"{wp}%" for wp in wp_vlines]
 
             # Draw the vertical lines for the working points
             hist.draw_vlines(wp_cuts, labels=wp_labels, linestyle=line_styles[counter])
@@ -843,6 +903,34 @@ class Results:
         roc.draw()
         self.save(roc, "roc", suffix=suffix)
 
+    @staticmethod
+    def _var_perf_curve(
+        var_perf_kwargs: dict[str, Any],
+        working_point: float | list | None,
+        cached_cut: bool,
+    ) -> VarVsEff:
+        """Create a var vs. efficiency curve.
+
+        Parameters
+        ----------
+        var_perf_kwargs : dict[str, Any]
+            Keyword arguments of `VarVsEff`
+        working_point : float | list | None
+            Working point requested by the user
+        cached_cut : bool
+            Whether `disc_cut` is the cached inclusive cut of `working_point`
+
+        Returns
+        -------
+        VarVsEff
+            The curve. If the cached cut was used, it still stores the working
+            point it was derived from.
+        """
+        curve = VarVsEff(**var_perf_kwargs)
+        if cached_cut:
+            curve.working_point = working_point
+        return curve
+
     def plot_var_perf(  # pylint: disable=too-many-locals
         self,
         suffix: str | None = None,
@@ -966,18 +1054,27 @@ class Results:
             # Assure that the variable is in the data for the given tagger
             assert perf_var in tagger.perf_vars, f"{perf_var} not in tagger {tagger.name} data!"
 
+            # Use the cached working point cut of the tagger for inclusive cuts
+            tagger_wp, tagger_disc_cut = working_point, disc_cut
+            cached_cut = isinstance(working_point, float) and not kwargs.get("flat_per_bin", False)
+            if cached_cut:
+                tagger_wp = None
+                tagger_disc_cut = float(
+                    tagger.working_points(self.signal, working_point)["cut"].iloc[0]
+                )
+
             # Add the args to the kwargs, otherwise we would provide them twice
             # (kwargs already has the args with defaults)
             var_perf_kwargs["x_var_sig"] = tagger.perf_vars[perf_var][is_signal]
             var_perf_kwargs["disc_sig"] = discs[is_signal]
             var_perf_kwargs["label"] = tagger.label
             var_perf_kwargs["colour"] = tagger.colour
-            var_perf_kwargs["working_point"] = working_point
-            var_perf_kwargs["disc_cut"] = disc_cut
+            var_perf_kwargs["working_point"] = tagger_wp
+            var_perf_kwargs["disc_cut"] = tagger_disc_cut
 
             # Add the variable to the plot
             plot_sig_eff.add(
-                curve=VarVsEff(**var_perf_kwargs),
+                curve=self._var_perf_curve(var_perf_kwargs, working_point, cached_cut),
                 reference=tagger.reference,
             )
 
@@ -994,12 +1091,12 @@ class Results:
                 var_perf_kwargs["disc_bkg"] = discs[is_bkg]
                 var_perf_kwargs["label"] = tagger.label
                 var_perf_kwargs["colour"] = tagger.colour
-                var_perf_kwargs["working_point"] = working_point
-                var_perf_kwargs["disc_cut"] = disc_cut
+                var_perf_kwargs["working_point"] = tagger_wp
+                var_perf_kwargs["disc_cut"] = tagger_disc_cut
 
                 # Add plot
                 plot_bkg[counter].add(
-                    curve=VarVsEff(**var_perf_kwargs),
+                    curve=self._var_perf_curve(var_perf_kwargs, working_point, cached_cut),
                     reference=tagger.reference,
                 )
 
@@ -1256,18 +1353,20 @@ class Results:
             bkg_1_idx = tagger.is_flav(backgrounds[0])
             bkg_2_idx = tagger.is_flav(backgrounds[1])
 
-            # Loop over the fraction values
-            for j, fx in enumerate(fxs):
-                # Calculate disc values for the tagger for the given fraction values
-                disc = tagger.discriminant(
-                    self.signal,
-                    fxs={
+            # Loop over the fraction values, the disc values for the tagger are written
+            # into the same preallocated array for each set of fraction values
+            disc_scan = tagger.discriminant_scan(
+                self.signal,
+                fxs_list=(
+                    {
                         f"{backgrounds[0].frac_str}": fx,
                         f"{backgrounds[1].frac_str}": 1 - fx,
                         **fixed_fraction_values,
-                    },
-                )
-
+                    }
+                    for fx in fxs
+                ),
+            )
+            for j, disc in enumerate(disc_scan):
                 # Calculate the effciency/rejection and add it to the value arrays
                 xs[j] = eff_or_rej(disc[sig_idx], disc[bkg_1_idx], efficiency)
                 ys[j] = eff_or_rej(disc[sig_idx], disc[bkg_2_idx], efficiency)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -10,11 +11,11 @@ import h5py
 import numpy as np
 import pandas as pd
 from ftag import Cuts, Flavours, Label
-from ftag.utils import get_discriminant
 
 from puma.utils import logger
-from puma.utils.aux import get_aux_labels
-from puma.utils.vertexing import clean_reco_vertices, clean_truth_vertices
+from puma.utils.aux import get_aux_labels, get_trackOrigin_classNames
+from puma.utils.discriminant import calculate_discriminant
+from puma.utils.vertexing import clean_reco_vertices_batched, clean_truth_vertices_batched
 
 
 @dataclass
@@ -54,6 +55,23 @@ class Tagger:
     # Used only by YUMA
     yaml_name: str | None = None
 
+    # Per-flavour jet indices, built lazily and reset whenever labels are set
+    _flav_idx: dict[str, np.ndarray] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # Contiguous copies of the score columns, reset whenever scores are set
+    _score_cols: dict[str, np.ndarray] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # Cleaned vertex indices per incl_vertexing flag together with their inputs
+    _vertex_idx: dict[bool, tuple] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # Sorted discriminants per (signal, fxs), reset whenever scores or labels are set
+    _sorted_discs: dict[tuple, dict[str, np.ndarray]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self) -> None:
         """Run post init checks of the inputs.
 
@@ -107,6 +125,24 @@ class Tagger:
                 )
                 self.fxs[iter_ref_flav.frac_str] = 0
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute and invalidate the cached indices and columns it affects.
+
+        Parameters
+        ----------
+        name : str
+            Name of the attribute
+        value : Any
+            Value of the attribute
+        """
+        super().__setattr__(name, value)
+        if name == "labels":
+            super().__setattr__("_flav_idx", {})
+            super().__setattr__("_sorted_discs", {})
+        elif name == "scores":
+            super().__setattr__("_score_cols", {})
+            super().__setattr__("_sorted_discs", {})
+
     def __repr__(self) -> str:
         """Return the name and label of the tagger.
 
@@ -120,6 +156,9 @@ class Tagger:
     def is_flav(self, flavour: Label | str) -> np.ndarray:
         """Return indices of jets of given flavour.
 
+        The indices are computed once per flavour and cached until `labels` is
+        reassigned. Modifying `labels` in place does not reset the cache.
+
         Parameters
         ----------
         flavour : Label | str
@@ -128,11 +167,39 @@ class Tagger:
         Returns
         -------
         np.ndarray
-            Array of indices of the given flavour
+            Read-only array of indices of the given flavour
         """
         flavour = Flavours[flavour]
         assert self.labels is not None, "labels must be set before calling is_flav()"
-        return flavour.cuts(self.labels).idx
+        if flavour.name not in self._flav_idx:
+            idx = flavour.cuts(self.labels).idx
+            idx.flags.writeable = False
+            self._flav_idx[flavour.name] = idx
+        return self._flav_idx[flavour.name]
+
+    def score_column(self, name: str) -> np.ndarray:
+        """Return a contiguous copy of a single score column.
+
+        The score arrays are often views into the full structured array loaded
+        from file, so selecting jets on them copies every field. The column is
+        copied once and cached until `scores` is reassigned.
+
+        Parameters
+        ----------
+        name : str
+            Name of the score variable, e.g. `{tagger}_pb`
+
+        Returns
+        -------
+        np.ndarray
+            Read-only contiguous array with the values of the column
+        """
+        assert self.scores is not None, "scores must be set before calling score_column()"
+        if name not in self._score_cols:
+            col = np.ascontiguousarray(self.scores[name])
+            col.flags.writeable = False
+            self._score_cols[name] = col
+        return self._score_cols[name]
 
     @property
     def probabilities(self) -> list[str]:
@@ -185,6 +252,23 @@ class Tagger:
                 raise ValueError(f"{aux_type} is not a recognized aux task.")
         return aux_outputs
 
+    @property
+    def aux_probability_variables(self) -> dict[str, list[str]]:
+        """Return a dict of the per-class auxiliary probabilities for each task.
+
+        Only the track origin classification provides per-class probabilities,
+        which are named after the track origin output, e.g. `GN2_aux_TrackOrigin_pFromB`.
+
+        Returns
+        -------
+        dict[str, list[str]]
+            Dictionary with the probability variables of the tagger, one per class
+        """
+        if "track_origin" not in self.aux_tasks:
+            return {}
+        aux_var = self.aux_variables["track_origin"]
+        return {"track_origin": [f"{aux_var}_p{name}" for name in get_trackOrigin_classNames()]}
+
     def extract_tagger_scores(
         self,
         source: pd.DataFrame | np.ndarray | str | Path,
@@ -248,9 +332,8 @@ class Tagger:
         int
             Number of jets of given flavour
         """
-        flavour = Flavours[flavour]
         assert self.labels is not None, "labels must be set before calling n_jets()"
-        return len(flavour.cuts(self.labels).values)
+        return len(self.is_flav(flavour))
 
     def probs(
         self, prob_flavour: Label | str, label_flavour: Label | str | None = None
@@ -271,12 +354,18 @@ class Tagger:
         """
         prob_flavour = Flavours[prob_flavour]
         assert self.scores is not None, "scores must be set before calling probs()"
-        scores = self.scores
-        if label_flavour is not None:
-            scores = scores[self.is_flav(label_flavour)]
-        return scores[f"{self.name}_{prob_flavour.px}"]
+        if label_flavour is None:
+            return self.scores[f"{self.name}_{prob_flavour.px}"]
+        return self.score_column(f"{self.name}_{prob_flavour.px}")[self.is_flav(label_flavour)]
 
-    def discriminant(self, signal: Label | str, fxs: dict[str, float] | None = None) -> np.ndarray:
+    def discriminant(
+        self,
+        signal: Label | str,
+        fxs: dict[str, float] | None = None,
+        label_flavour: Label | str | None = None,
+        out: np.ndarray | None = None,
+        buffer: np.ndarray | None = None,
+    ) -> np.ndarray:
         """Retrieve the discriminant for a given signal class.
 
         Parameters
@@ -285,6 +374,12 @@ class Tagger:
             Signal class for which the discriminant should be retrieved
         fxs : dict, optional
             dict of fractions to use instead of the default ones, by default None
+        label_flavour : Label | str | None, optional
+            Only return jets of the given truth flavour, by default None
+        out : np.ndarray | None, optional
+            Preallocated array the discriminant is written to, by default None
+        buffer : np.ndarray | None, optional
+            Preallocated work array of the same shape and dtype as `out`, by default None
 
         Returns
         -------
@@ -295,6 +390,7 @@ class Tagger:
         ------
         ValueError
             If the given signal flavour is not available in the given output flavours
+            If a required probability is not available in the scores
         """
         signal = Flavours[signal]
         assert self.scores is not None, "scores must be set before calling discriminant()"
@@ -305,6 +401,159 @@ class Tagger:
                 f"Given signal flavour {signal.name} is not available in given output flavours!"
             )
 
+        use_fxs = self._fraction_values(signal, fxs)
+        idx = None if label_flavour is None else self.is_flav(label_flavour)
+
+        def column(flavour: Label) -> np.ndarray:
+            col = self.score_column(f"{self.name}_{flavour.px}")
+            return col if idx is None else col[idx]
+
+        # Collect the probabilities of the backgrounds which enter the discriminant
+        bkg_probs, bkg_fxs = [], []
+        for iter_flav in self.output_flavours:
+            if iter_flav == signal or use_fxs[iter_flav.frac_str] == 0:
+                continue
+            if f"{self.name}_{iter_flav.px}" not in self.scores.dtype.names:
+                raise ValueError(
+                    f"Nonzero fraction value for {iter_flav.name}, but "
+                    f"'{self.name}_{iter_flav.px}' not found in scores."
+                )
+            bkg_probs.append(column(iter_flav))
+            bkg_fxs.append(use_fxs[iter_flav.frac_str])
+
+        if f"{self.name}_{signal.px}" not in self.scores.dtype.names:
+            raise ValueError(
+                f"No signal probability value(s) found for tagger {self.name}. "
+                f"Missing variable: {self.name}_{signal.px}"
+            )
+
+        # Calculate discs
+        return calculate_discriminant(
+            signal_probs=column(signal),
+            background_probs=bkg_probs,
+            fraction_values=bkg_fxs,
+            out=out,
+            buffer=buffer,
+        )
+
+    def discriminant_scan(
+        self,
+        signal: Label | str,
+        fxs_list: Iterable[dict[str, float]],
+    ) -> Iterator[np.ndarray]:
+        """Evaluate the discriminant for several sets of fraction values.
+
+        The output and work arrays are allocated once and reused for every set of
+        fraction values, so the yielded array is overwritten in the next iteration.
+        Copy it if it needs to be kept.
+
+        Parameters
+        ----------
+        signal : Label | str
+            Signal class for which the discriminant should be retrieved
+        fxs_list : Iterable[dict[str, float]]
+            Fraction values to evaluate the discriminant for
+
+        Yields
+        ------
+        np.ndarray
+            Discriminant for the given signal class and fraction values
+        """
+        out = buffer = None
+        for fxs in fxs_list:
+            out = self.discriminant(signal, fxs=fxs, out=out, buffer=buffer)
+            if buffer is None:
+                buffer = np.empty_like(out)
+            yield out
+
+    def working_points(
+        self,
+        signal: Label | str,
+        effs: float | list[float] | np.ndarray,
+        fxs: dict[str, float] | None = None,
+    ) -> pd.DataFrame:
+        """Calculate the discriminant cuts and background rejections for working points.
+
+        The discriminant of each flavour is sorted once per signal class and set of
+        fraction values and cached on the tagger, so subsequent calls for other
+        efficiencies only need binary searches. The cut values follow the linear
+        interpolation of `np.percentile`, jets with a discriminant equal or above the
+        cut value pass the working point.
+
+        Parameters
+        ----------
+        signal : Label | str
+            Signal class for which the working points are calculated
+        effs : float | list[float] | np.ndarray
+            Signal efficiencies of the working points
+        fxs : dict, optional
+            dict of fractions to use instead of the default ones, by default None
+
+        Returns
+        -------
+        pd.DataFrame
+            Table with one row per working point and the columns `eff`, `cut` and
+            `{flavour}_rej` for each background output flavour
+        """
+        signal = Flavours[signal]
+        assert self.output_flavours is not None, "output_flavours not initialized"
+        effs = np.atleast_1d(np.asarray(effs, dtype=float))
+
+        key = (signal.name, tuple(sorted(self._fraction_values(signal, fxs).items())))
+        if key not in self._sorted_discs:
+            discs = self.discriminant(signal, fxs=fxs)
+            self._sorted_discs[key] = {
+                flav.name: np.sort(discs[self.is_flav(flav)]) for flav in self.output_flavours
+            }
+        sorted_discs = self._sorted_discs[key]
+
+        # Linear interpolation between the closest ranks, as in np.percentile
+        sig_discs = sorted_discs[signal.name]
+        if len(sig_discs) == 0:
+            cuts = np.full(len(effs), np.nan)
+        else:
+            position = (1 - effs) * (len(sig_discs) - 1)
+            lower = np.clip(np.floor(position).astype(int), 0, len(sig_discs) - 1)
+            upper = np.minimum(lower + 1, len(sig_discs) - 1)
+            cuts = sig_discs[lower] + (sig_discs[upper] - sig_discs[lower]) * (position - lower)
+
+        table = {"eff": effs, "cut": cuts}
+        for flav in self.output_flavours:
+            if flav == signal:
+                continue
+            bkg_discs = sorted_discs[flav.name]
+            n_pass = len(bkg_discs) - np.searchsorted(bkg_discs, cuts, side="left")
+            table[f"{flav.name}_rej"] = np.divide(
+                len(bkg_discs),
+                n_pass,
+                out=np.full(len(cuts), np.inf),
+                where=n_pass > 0,
+            )
+        return pd.DataFrame(table)
+
+    def _fraction_values(
+        self, signal: Label, fxs: dict[str, float] | None = None
+    ) -> dict[str, float]:
+        """Complete the background fraction values for a given signal class.
+
+        Parameters
+        ----------
+        signal : Label
+            Signal class for which the discriminant is calculated
+        fxs : dict, optional
+            dict of fractions to use instead of the default ones, by default None
+
+        Returns
+        -------
+        dict[str, float]
+            Fraction values for all background output flavours
+
+        Raises
+        ------
+        ValueError
+            If more than one fraction value is missing
+        """
+        assert self.output_flavours is not None, "output_flavours not initialized"
         use_fxs = dict(self.fxs if fxs is None else fxs)
         # Remove signal fraction value if present
         use_fxs.pop(signal.frac_str, None)
@@ -331,19 +580,14 @@ class Tagger:
                 "More than one fraction value is missing from the fraction dict! Please check "
                 f"{missing}"
             )
-
-        # Calculate discs
-        return get_discriminant(
-            jets=self.scores,
-            tagger=self.name,
-            signal=signal,
-            flavours=self.output_flavours,
-            fraction_values=use_fxs,
-        )
+        return use_fxs
 
     def vertex_indices(self, incl_vertexing: bool = False) -> tuple[np.ndarray, np.ndarray]:
         """Retrieve cleaned vertex indices for the tagger.
 
+        The cleaned indices are cached per `incl_vertexing` flag and reused as long
+        as the vertexing and track origin arrays are the same objects.
+
         Parameters
         ----------
         incl_vertexing : bool, optional
@@ -352,9 +596,9 @@ class Tagger:
         Returns
         -------
         truth_indices : np.ndarray
-            Cleaned truth vertex indices for the tagger.
+            Cleaned truth vertex indices for the tagger (read-only).
         reco_indices : np.ndarray
-            Cleaned reco vertex indices for the tagger.
+            Cleaned reco vertex indices for the tagger (read-only).
 
         Raises
         ------
@@ -372,24 +616,32 @@ class Tagger:
         if "track_origin" not in self.aux_labels:
             raise ValueError("Track origin labels not found.")
 
-        truth_indices = np.copy(self.aux_labels["vertexing"])
-        reco_indices = np.copy(self.aux_scores["vertexing"])
-
-        # clean truth and reco indices for each jet
-        for i in range(truth_indices.shape[0]):
-            truth_indices[i] = clean_truth_vertices(
-                truth_indices[i], self.aux_labels["track_origin"][i], incl_vertexing=incl_vertexing
-            )
-            reco_track_origin = (
-                None
-                if "track_origin" not in self.aux_scores
-                else self.aux_scores["track_origin"][i]
-            )
-            reco_indices[i] = clean_reco_vertices(
-                reco_indices[i],
-                reco_track_origin,
-                incl_vertexing=incl_vertexing,
-                require_hf_track=self.vertexing_require_hf_track,
-            )
+        # reuse the cleaned indices if the inputs and settings did not change
+        sources = (
+            self.aux_labels["vertexing"],
+            self.aux_labels["track_origin"],
+            self.aux_scores["vertexing"],
+            self.aux_scores.get("track_origin"),
+            self.vertexing_require_hf_track,
+        )
+        cached = self._vertex_idx.get(incl_vertexing)
+        if cached is not None and all(a is b for a, b in zip(cached[0], sources)):
+            return cached[1]
+
+        # clean truth and reco indices for all jets at once
+        truth_indices = clean_truth_vertices_batched(
+            self.aux_labels["vertexing"],
+            self.aux_labels["track_origin"],
+            incl_vertexing=incl_vertexing,
+        )
+        reco_indices = clean_reco_vertices_batched(
+            self.aux_scores["vertexing"],
+            self.aux_scores.get("track_origin"),
+            incl_vertexing=incl_vertexing,
+            require_hf_track=self.vertexing_require_hf_track,
+        )
+        truth_indices.flags.writeable = False
+        reco_indices.flags.writeable = False
 
+        self._vertex_idx[incl_vertexing] = (sources, (truth_indices, reco_indices))
         return truth_indices, reco_indices
@@ -3,18 +3,22 @@
 from __future__ import annotations
 
 import argparse
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import yaml
 from yamlinclude import YamlIncludeConstructor
 
-from puma.hlplots.results import Results
-from puma.hlplots.tagger import Tagger
-from puma.hlplots.yutils import combine_suffixes, get_included_taggers, get_tagger_name
 from puma.utils import logger
 
+if TYPE_CHECKING:  # pragma: no cover
+    from puma.hlplots.results import Results
+    from puma.hlplots.tagger import Tagger
+
 ALL_PLOTS = ["roc", "scan", "disc", "probs", "peff"]
 
 
@@ -49,6 +53,13 @@ def get_args(args):
         help="Signals to plot",
     )
     parser.add_argument("-d", "--dir", type=Path, help="Base sample directory")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes rendering the plots",
+    )
 
     return parser.parse_args(args)
 
@@ -150,6 +161,11 @@ class YumaConfig:
         ValueError
             If no sample path are given for a tagger
         """
+        # The results are imported here to keep the command line interface fast
+        from puma.hlplots.results import Results
+        from puma.hlplots.tagger import Tagger
+        from puma.hlplots.yutils import get_tagger_name
+
         kwargs = self.results_config
         kwargs["signal"] = self.signal
         kwargs["perf_vars"] = self.peff_vars
@@ -192,14 +208,32 @@ class YumaConfig:
         """Iterates plots and returns a list of all performance variables."""
         return list({p["plot_kwargs"].get("perf_var", "pt") for p in self.plots.get("peff", [])})
 
-    def make_plots(self, plot_types):
+    def make_plots(self, plot_types, jobs: int = 1):
         """Makes all desired plots.
 
         Parameters
         ----------
         plot_types : list[str]
             List of plot types to make.
+        jobs : int, optional
+            Number of worker processes rendering the plots, by default 1. The workers
+            are forked, so they share the loaded results with this process instead of
+            copying them. The paths of the saved plots are added to
+            `results.saved_plots` in the order of the config, independent of `jobs`.
+
+        Raises
+        ------
+        ValueError
+            If the number of jobs is smaller than 1
         """
+        from puma.hlplots.yutils import combine_suffixes, get_included_taggers
+        from puma.plot_base import flush_save_queue
+
+        if jobs < 1:
+            raise ValueError(f"Number of jobs must be positive, got {jobs}.")
+
+        # Resolve the taggers and kwargs of all plots up front, in the order of the config
+        entries = []
         for plot_type, plots in self.plots.items():
             if plot_type not in plot_types:
                 continue
@@ -211,9 +245,82 @@ class YumaConfig:
                 )
                 plot_kwargs = plot.get("plot_kwargs", {})
                 plot_kwargs["suffix"] = combine_suffixes([plot_kwargs.get("suffix", ""), inc_str])
-                self.results.make_plot(plot_type, plot_kwargs)
+                entries.append((plot_type, self.results.taggers, plot_kwargs))
                 self.results.taggers = all_taggers
 
+        if jobs > 1 and len(entries) > 1 and "fork" not in mp.get_all_start_methods():
+            logger.warning("Rendering plots in parallel needs fork, making them serially.")
+            jobs = 1
+
+        if jobs == 1 or len(entries) <= 1:
+            for entry in entries:
+                _render_plot(self.results, entry)
+            self.results.flush()
+            return
+
+        # The writing threads of the save queue do not survive the fork
+        flush_save_queue(shutdown=True)
+        # The workers inherit the results and the plot entries when they are forked
+        _WORKER_STATE.update(results=self.results, entries=entries)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(jobs, len(entries)), mp_context=mp.get_context("fork")
+            ) as pool:
+                for saved_plots in pool.map(_render_worker_plot, range(len(entries))):
+                    self.results.saved_plots.extend(saved_plots)
+        finally:
+            _WORKER_STATE.clear()
+
+
+# Shared with the forked workers of `YumaConfig.make_plots`
+_WORKER_STATE: dict = {}
+
+
+def _render_plot(results: Results, entry: tuple) -> list[Path]:
+    """Make one plot of the config.
+
+    Parameters
+    ----------
+    results : Results
+        Results with the loaded taggers
+    entry : tuple
+        Plot type, included taggers and keyword arguments of the plot
+
+    Returns
+    -------
+    list[Path]
+        Paths of the saved plots
+    """
+    plot_type, taggers, plot_kwargs = entry
+    all_taggers = results.taggers
+    n_saved = len(results.saved_plots)
+    results.taggers = taggers
+    try:
+        results.make_plot(plot_type, plot_kwargs)
+    finally:
+        results.taggers = all_taggers
+    return results.saved_plots[n_saved:]
+
+
+def _render_worker_plot(index: int) -> list[Path]:
+    """Make one plot of the config in a forked worker process.
+
+    Parameters
+    ----------
+    index : int
+        Index of the plot entry
+
+    Returns
+    -------
+    list[Path]
+        Paths of the saved plots
+    """
+    results = _WORKER_STATE["results"]
+    saved_plots = _render_plot(results, _WORKER_STATE["entries"][index])
+    # Plots saved in the background must be written before the paths are returned
+    results.flush()
+    return saved_plots
+
 
 def main(args=None):
     """Run Yuma and make plots.
@@ -230,6 +337,8 @@ def main(args=None):
     ValueError
         If unknown signals were given.
     """
+    from puma.plot_base import use_render_mode
+
     args = get_args(args)
 
     config_path = Path(args.config)
@@ -250,14 +359,16 @@ def main(args=None):
 
     logger.info(f"Plotting in {yuma.plot_dir_final}")
 
-    logger.info("Instantiating Results")
-    yuma.signal = signals[0]
-    yuma.get_results()  # only run once
-    for signal in signals:
-        logger.info(f"Plotting signal {signal}")
-        yuma.signal = signal
-        yuma.results.set_signal(signal)
-        yuma.make_plots(plots)
+    # yuma only saves plots, so render them without any GUI or notebook support
+    with use_render_mode("batch"):
+        logger.info("Instantiating Results")
+        yuma.signal = signals[0]
+        yuma.get_results()  # only run once
+        for signal in signals:
+            logger.info(f"Plotting signal {signal}")
+            yuma.signal = signal
+            yuma.results.set_signal(signal)
+            yuma.make_plots(plots, jobs=args.jobs)
 
 
 if __name__ == "__main__":
@@ -9,7 +9,7 @@ from typing import TYPE_CHECKING, Any, cast
 from ftag import Label
 from ftag.hdf5 import H5Reader
 
-from puma.hlplots.results import Tagger
+from puma.hlplots.tagger import Tagger
 from puma.utils import logger
 
 if TYPE_CHECKING:  # pragma: no cover
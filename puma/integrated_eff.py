@@ -2,14 +2,14 @@
 
 from __future__ import annotations
 
-from typing import cast
+from typing import Any, cast
 
 import matplotlib as mpl
 import numpy as np
 from ftag import Flavours, Label
 from ftag.utils import calculate_efficiency
 
-from puma.plot_base import PlotBase, PlotLineObject
+from puma.plot_base import PlotBase, PlotLineObject, record_call
 from puma.utils import get_good_colours, get_good_linestyles, logger
 
 
@@ -56,6 +56,25 @@ class IntegratedEfficiency(PlotLineObject):
             self.label = self.flavour.label
         self._calc_profile()
 
+    @property
+    def args_to_store(self) -> dict[str, Any]:
+        """Returns the arguments that need to be stored/loaded.
+
+        Returns
+        -------
+        dict[str, Any]
+            Dict with the arguments
+        """
+        return {
+            **super().args_to_store,
+            "eff": self.eff,
+            "x": self.x,
+            "n_vals": self.n_vals,
+            "tagger": self.tagger,
+            "key": self.key,
+            "flavour": self.flavour,
+        }
+
     def _calc_profile(self):
         """Calculate the profile of the integrated efficiency curve."""
         self.eff, self.x = calculate_efficiency(
@@ -93,6 +112,7 @@ class IntegratedEfficiencyPlot(PlotBase):
         self.ymin = 0
         self.ymax = 1.2
 
+    @record_call
     def add(self, int_eff: IntegratedEfficiency, key: str | None = None):
         """Adding puma.Roc object to figure.
 
@@ -209,6 +229,7 @@ class IntegratedEfficiencyPlot(PlotBase):
             ncol=self.leg_ncol,
         )
 
+    @record_call
     def draw(
         self,
         x_label: str = "Discriminant",
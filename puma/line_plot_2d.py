@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 import matplotlib as mpl
 import numpy as np
 import pandas as pd
 
-from puma.plot_base import PlotBase, PlotLineObject
+from puma.plot_base import PlotBase, PlotLineObject, record_call
 from puma.utils import get_good_colours, get_good_markers, logger
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -93,6 +93,22 @@ class Line2D(PlotLineObject):
         # Set key to None. Will be defined when plotting starts
         self.key: str | None = None
 
+    @property
+    def args_to_store(self) -> dict[str, Any]:
+        """Returns the arguments that need to be stored/loaded.
+
+        Returns
+        -------
+        dict[str, Any]
+            Dict with the arguments
+        """
+        return {
+            **super().args_to_store,
+            "x_values": self.x_values,
+            "y_values": self.y_values,
+            "key": self.key,
+        }
+
 
 class Line2DPlot(PlotBase):
     """Line2DPlot plot class for basic x-y line plots."""
@@ -125,6 +141,7 @@ class Line2DPlot(PlotBase):
 
         self.initialise_figure()
 
+    @record_call
     def add(
         self,
         curve: Line2D,
@@ -216,9 +233,14 @@ class Line2DPlot(PlotBase):
         for key in self.add_order:
             elem = self.plot_objects[key]
 
+            # Markers show the individual points, only lines are decimated
+            keep = slice(None)
+            if not elem.is_marker and elem.marker in {None, "None", "none", ""}:
+                keep = self.decimation_mask(elem.x_values, elem.y_values)
+
             self.axis_top.plot(
-                elem.x_values,
-                elem.y_values,
+                elem.x_values[keep],
+                elem.y_values[keep],
                 color=elem.colour,
                 label=elem.label,
                 alpha=elem.alpha,
@@ -244,6 +266,7 @@ class Line2DPlot(PlotBase):
         self.plotting_done = True
         return plt_handles
 
+    @record_call
     def draw(self):
         """Draw figure."""
         plt_handles = self.plot()
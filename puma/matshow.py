@@ -7,9 +7,10 @@ import math as m
 import numpy as np
 from matplotlib import patches
 from matplotlib import pyplot as plt
+from matplotlib.collections import PolyCollection
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 
-from puma.plot_base import PlotBase
+from puma.plot_base import PlotBase, record_call
 from puma.utils import logger
 
 
@@ -27,6 +28,7 @@ class MatshowPlot(PlotBase):
         colormap: plt.cm = plt.cm.Oranges,
         show_cbar: bool = True,
         cbar_label: str | None = None,
+        max_entries: int | None = 1024,
         **kwargs,
     ) -> None:
         """Plot a matrix with matplotlib matshow.
@@ -54,6 +56,10 @@ class MatshowPlot(PlotBase):
             Whether to plot the colorbar or not, by default True
         cbar_label : str | None, optional
             Label of the colorbar, by default None
+        max_entries : int | None, optional
+            Maximal number of matrix cells for which the entries are shown, larger
+            matrices are drawn without entries as the numbers would not be readable.
+            If None, the entries are always shown. by default 1024
         **kwargs : kwargs
             Keyword arguments for `puma.PlotObject`
 
@@ -74,6 +80,7 @@ class MatshowPlot(PlotBase):
         self.colormap = colormap
         self.show_cbar = show_cbar
         self.cbar_label = cbar_label
+        self.max_entries = max_entries
 
         # Specifying figsize if not specified by user
         if self.figsize is None:
@@ -86,23 +93,108 @@ class MatshowPlot(PlotBase):
 
         Parameters
         ----------
-        rgbColor : tuple
-            (r,g,b,a) color (returned from `plt.cm` colormap)
+        rgbColor : np.ndarray
+            (r,g,b,a) color (returned from `plt.cm` colormap), or array of colors
+            with the channels in the last dimension
 
         Returns
         -------
-        float
-            Relative luminance of the color.
+        float | np.ndarray
+            Relative luminance of the color(s).
         """
         # Converting to np.ndarray, ignoring alpha channel
-        rgbaColor = np.array(rgbaColor[:-1])
+        rgbaColor = np.asarray(rgbaColor)[..., :-1]
         rgbaColor = np.where(
             rgbaColor <= 0.03928,
             rgbaColor / 12.92,
             ((rgbaColor + 0.055) / 1.055) ** 2.4,
         )
         weights = np.array([0.2126, 0.7152, 0.0722])
-        return np.dot(rgbaColor, weights)
+        return rgbaColor @ weights
+
+    def _entries_shown(self, n_cells: int) -> bool:
+        """Check if the matrix entries are written in the cells.
+
+        Parameters
+        ----------
+        n_cells : int
+            Number of matrix cells
+
+        Returns
+        -------
+        bool
+            True if `show_entries` is set and the matrix is not too large
+        """
+        if not self.show_entries:
+            return False
+        if self.max_entries is not None and n_cells > self.max_entries:
+            logger.info(
+                "MatshowPlot: not showing the entries of %i cells, more than max_entries=%i.",
+                n_cells,
+                self.max_entries,
+            )
+            return False
+        return True
+
+    def _format_entry(self, value: float) -> str:
+        """Format a matrix entry for the text in its cell.
+
+        Parameters
+        ----------
+        value : float
+            Matrix entry
+
+        Returns
+        -------
+        str
+            The entry without decimals if it is an integer, as percentage if
+            `show_percentage` is set, else with three decimals
+        """
+        # If matrix entry is an int, do not show decimals
+        if not self.show_percentage and m.modf(value)[0] == 0:
+            return f"{value:.0f}"
+        # Else, round it or show it as percentage
+        return f"{value:.3f}" if not self.show_percentage else f"{value * 100:.0f}%"
+
+    def _annotate(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        values: np.ndarray,
+        colors: np.ndarray,
+    ) -> None:
+        """Write matrix entries on their cells.
+
+        The text colors and strings are computed for all entries at once, the text
+        is black on light cells and white on dark cells.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            x positions of the texts
+        y : np.ndarray
+            y positions of the texts
+        values : np.ndarray
+            Matrix entries
+        colors : np.ndarray
+            RGBA background colors of the cells, with the channels in the last
+            dimension
+        """
+        # Choosing the text color: black if color is light, white if color is dark
+        luminance = self.__get_luminance(colors).ravel()
+        text_colors = np.where(luminance <= self.text_color_threshold, "white", "black")
+        for x_pos, y_pos, value, text_color in zip(
+            np.ravel(x), np.ravel(y), np.ravel(values), text_colors
+        ):
+            self.axis_top.text(
+                x_pos,
+                y_pos,
+                self._format_entry(value),
+                va="center",
+                ha="center",
+                color=text_color,
+                fontsize=self.fontsize,
+            )
 
     def __plot(self, matrix):
         """Plot the Matrix."""
@@ -116,7 +208,7 @@ class MatshowPlot(PlotBase):
             im = self.axis_top.matshow(matrix, cmap=self.colormap)
 
         # If mat entries have to be plotted
-        if self.show_entries:
+        if self._entries_shown(matrix.size):
             # Mapping mat values in [0,1], as it's done by matplotlib
             # to associate them to the colors of the colormap
             normMat = matrix - np.min(matrix)
@@ -124,37 +216,9 @@ class MatshowPlot(PlotBase):
             normMat = normMat.astype(np.float64)
             normMat /= np.max(matrix) - np.min(matrix)
 
-            # Adding text values in the matrix pixels
-            for i in range(n_rows):
-                for j in range(n_cols):
-                    # Choosing the text color: black if color is light, white if color is dark
-                    # Getting the bkg color from the cmap
-                    color = self.colormap(normMat[i, j])
-                    # Calculating the bkg relative luminance
-                    luminance = self.__get_luminance(color)
-                    # Choosing the appropriate color
-                    color = "white" if luminance <= self.text_color_threshold else "black"
-
-                    # If matrix entry is an int, do not show decimals
-                    if not self.show_percentage and m.modf(matrix[i, j])[0] == 0:
-                        text = f"{matrix[i, j]:.0f}"
-                    # Else, round it or show it as percentage
-                    else:
-                        text = (
-                            f"{matrix[i, j]:.3f}"
-                            if not self.show_percentage
-                            else f"{matrix[i, j] * 100:.0f}%"
-                        )
-                    # Plotting text
-                    self.axis_top.text(
-                        x=j,
-                        y=i,
-                        s=text,
-                        va="center",
-                        ha="center",
-                        c=color,
-                        fontsize=self.fontsize,
-                    )
+            # Adding text values in the matrix pixels, colored by the bkg color
+            rows, cols = np.indices((n_rows, n_cols))
+            self._annotate(cols, rows, matrix, self.colormap(normMat))
 
         # inverting y axis to have the diagonal in the common orientation
         self.axis_top.invert_yaxis()
@@ -214,6 +278,7 @@ class MatshowPlot(PlotBase):
         self.set_ylabel(self.axis_top)
         self.set_title()
 
+    @record_call
     def draw(self, matrix):
         """Draw a matrix with the class customized appearance.
 
@@ -274,71 +339,26 @@ class MatrixComparison(MatshowPlot):
             legend_ax = divider.append_axes("right", size="20%", pad=padding)
             legend_ax.set_box_aspect(1)
 
-        # Matrix plotting: Plotting triangles for m1 and m2
+        # Matrix plotting: one collection with the upper (m1) and lower (m2) triangle
+        # of each cell, in the order the triangles are drawn
         ax = self.axis_top
-        for y in range(n_rows):
-            for x in range(n_cols):
-                top_left = (x, y + 1)
-                top_right = (x + 1, y + 1)
-                bottom_left = (x, y)
-                bottom_right = (x + 1, y)
-
-                # Upper triangle (for m1)
-                tri1 = [top_right, top_left, bottom_right]
-                color1 = cmap(norm(m1[y, x]))
-                patch1 = patches.Polygon(tri1, facecolor=color1, edgecolor="gray")
-                ax.add_patch(patch1)
-
-                # Lower triangle (for m2)
-                tri2 = [bottom_left, bottom_right, top_left]
-                color2 = cmap(norm(m2[y, x]))
-                patch2 = patches.Polygon(tri2, facecolor=color2, edgecolor="gray")
-                ax.add_patch(patch2)
-
-                if self.show_entries:
-                    # Text for m1 (upper triangle)
-                    luminance1 = self._MatshowPlot__get_luminance(color1)
-                    text_color1 = "white" if luminance1 <= self.text_color_threshold else "black"
-                    text1 = (
-                        f"{m1[y, x]:.0f}"
-                        if not self.show_percentage and m.modf(m1[y, x])[0] == 0
-                        else (
-                            f"{m1[y, x]:.3f}"
-                            if not self.show_percentage
-                            else f"{m1[y, x] * 100:.0f}%"
-                        )
-                    )
-                    ax.text(
-                        x + 0.75,
-                        y + 0.75,
-                        text1,
-                        ha="center",
-                        va="center",
-                        fontsize=self.fontsize,
-                        color=text_color1,
-                    )
-
-                    # Text for m2 (lower triangle)
-                    luminance2 = self._MatshowPlot__get_luminance(color2)
-                    text_color2 = "white" if luminance2 <= self.text_color_threshold else "black"
-                    text2 = (
-                        f"{m2[y, x]:.0f}"
-                        if not self.show_percentage and m.modf(m2[y, x])[0] == 0
-                        else (
-                            f"{m2[y, x]:.3f}"
-                            if not self.show_percentage
-                            else f"{m2[y, x] * 100:.0f}%"
-                        )
-                    )
-                    ax.text(
-                        x + 0.25,
-                        y + 0.25,
-                        text2,
-                        ha="center",
-                        va="center",
-                        fontsize=self.fontsize,
-                        color=text_color2,
-                    )
+        y, x = np.indices((n_rows, n_cols))
+        x, y = x.ravel(), y.ravel()
+        # Vertices of shape (n_cells, 2 triangles, 3 corners, 2 coordinates)
+        triangles = np.stack([
+            np.stack([(x + 1, y + 1), (x, y + 1), (x + 1, y)]),
+            np.stack([(x, y), (x + 1, y), (x, y + 1)]),
+        ]).transpose(3, 0, 1, 2)
+        colors = cmap(norm(np.stack([m1.ravel(), m2.ravel()], axis=1))).reshape(-1, 4)
+        ax.add_collection(
+            PolyCollection(triangles.reshape(-1, 3, 2), facecolors=colors, edgecolors="gray")
+        )
+
+        if self._entries_shown(m1.size):
+            # Texts for m1 (upper triangle) and m2 (lower triangle)
+            colors = colors.reshape(-1, 2, 4)
+            self._annotate(x + 0.75, y + 0.75, m1, colors[:, 0])
+            self._annotate(x + 0.25, y + 0.25, m2, colors[:, 1])
 
         # Configure axis settings (no ticks)
         ax.set_xlim(0, n_cols)
@@ -349,7 +369,7 @@ class MatrixComparison(MatshowPlot):
         if self.show_cbar:
             sm = plt.cm.ScalarMappable(cmap=cmap, norm=norm)
             sm.set_array([])
-            cbar = plt.colorbar(sm, cax=cax)
+            cbar = self.fig.colorbar(sm, cax=cax)
             # If using percentages, convert cbar labels to percentages
             if self.show_entries and self.show_percentage:
                 ticks = np.linspace(0, 1, 5)
@@ -428,6 +448,7 @@ class MatrixComparison(MatshowPlot):
         self.axis_top.tick_params(axis="both", which="both", length=0)
         self.axis_top.grid(False)
 
+    @record_call
     def draw(self, matrix1, matrix2):
         """Draw a comparison between two matrices with the class customized appearance.
 
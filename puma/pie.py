@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import matplotlib as mpl
 
-from puma.plot_base import PlotBase
+from puma.plot_base import PlotBase, record_call
 from puma.utils import get_good_pie_colours, logger
 
 
@@ -75,6 +75,7 @@ class PiePlot(PlotBase):
         self.initialise_figure()
         self.plot()
 
+    @record_call
     def plot(
         self,
     ):
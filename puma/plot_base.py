@@ -2,31 +2,388 @@
 
 from __future__ import annotations
 
+import functools
+import importlib
 import json
-import tkinter as tk
+import os
+import pickle  # noqa: S403
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Sequence
 
 import atlasify
+import matplotlib as mpl
 import numpy as np
 import yaml
 from ftag import Flavours, Label
-from IPython import get_ipython
-from IPython.display import display
 from matplotlib import gridspec, lines
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import Colormap, ListedColormap
 from matplotlib.figure import Figure
 from matplotlib.ticker import MaxNLocator
 from typing_extensions import Self
 
 from puma.utils import logger, set_xaxis_ticklabels_invisible
+from puma.utils.decimation import decimate_curve
 
 atlasify.LINE_SPACING = 1.3  # overwrite the default, which is 1.2
 
+RENDER_MODES = ("interactive", "batch")
+_RENDER_MODE = {"default": "interactive"}
+
+
+def set_render_mode(render_mode: str) -> None:
+    """Set the default render mode of all plots.
+
+    In "batch" mode, the figures are drawn with the non-interactive Agg canvas,
+    `show()` does not open a window and neither IPython nor tkinter are imported.
+    The matplotlib backend is not changed, so plots made directly with pyplot
+    and open pyplot figures are not affected. The default can also be set with
+    the `PUMA_RENDER_MODE` environment variable.
+
+    Parameters
+    ----------
+    render_mode : str
+        Either "interactive" or "batch"
+
+    Raises
+    ------
+    ValueError
+        If the render mode is not supported
+    """
+    if render_mode not in RENDER_MODES:
+        raise ValueError(f"Render mode {render_mode} not supported, use one of {RENDER_MODES}.")
+    _RENDER_MODE["default"] = render_mode
+
+
+def get_render_mode() -> str:
+    """Get the default render mode of all plots.
+
+    Returns
+    -------
+    str
+        Either "interactive" or "batch"
+    """
+    return _RENDER_MODE["default"]
+
+
+@contextmanager
+def use_render_mode(render_mode: str):
+    """Temporarily set the default render mode of all plots.
+
+    The previous render mode is restored on exit.
+
+    Parameters
+    ----------
+    render_mode : str
+        Either "interactive" or "batch"
+    """
+    previous = get_render_mode()
+    set_render_mode(render_mode)
+    try:
+        yield
+    finally:
+        _RENDER_MODE["default"] = previous
+
+
+class SaveQueue:
+    """Bounded pool of background threads which write finished plots.
+
+    At most `max_pending` plots are queued or being written at the same time,
+    further submissions wait until one of them is done. This bounds the memory
+    held by the figures waiting to be written. The errors raised while writing
+    are raised again by `flush()`.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Number of writing threads, by default 2
+    max_pending : int, optional
+        Maximal number of plots queued or being written, by default twice the
+        number of threads
+
+    Raises
+    ------
+    ValueError
+        If the number of threads or pending plots is smaller than 1
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int | None = None) -> None:
+        self.max_workers = max_workers
+        self.max_pending = 2 * max_workers if max_pending is None else max_pending
+        if self.max_workers < 1 or self.max_pending < 1:
+            raise ValueError(
+                "Number of threads and pending plots must be positive, got "
+                f"{self.max_workers} and {self.max_pending}."
+            )
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="puma-savefig")
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._futures: list[Future] = []
+
+    def submit(self, func: Callable, *args: Any, **kwargs: Any) -> Future:
+        """Run a function in the background, waiting for a free slot first.
+
+        Parameters
+        ----------
+        func : Callable
+            Function writing a plot
+        *args : args
+            Positional arguments passed to `func`
+        **kwargs : kwargs
+            Keyword arguments passed to `func`
+
+        Returns
+        -------
+        Future
+            Future of the call
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+        return future
+
+    def flush(self) -> None:
+        """Wait until all submitted plots are written.
+
+        The first error raised while writing is raised again, further errors
+        are logged.
+        """
+        futures, self._futures = self._futures, []
+        errors = [future.exception() for future in futures]
+        errors = [error for error in errors if error is not None]
+        for error in errors[1:]:
+            logger.error("Saving a plot failed: %s", error)
+        if errors:
+            raise errors[0]
+
+    def shutdown(self) -> None:
+        """Wait until all submitted plots are written and stop the threads."""
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown()
+
+
+_SAVE_QUEUE: dict[str, SaveQueue | None] = {"default": None}
+
+
+def get_save_queue() -> SaveQueue:
+    """Get the queue writing the plots saved with `background=True`.
+
+    Returns
+    -------
+    SaveQueue
+        The queue, which is created on first use
+    """
+    if _SAVE_QUEUE["default"] is None:
+        _SAVE_QUEUE["default"] = SaveQueue()
+    return _SAVE_QUEUE["default"]
+
+
+def set_save_queue(max_workers: int = 2, max_pending: int | None = None) -> None:
+    """Replace the queue writing the plots saved with `background=True`.
+
+    The plots submitted to the previous queue are written first.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Number of writing threads, by default 2
+    max_pending : int, optional
+        Maximal number of plots queued or being written, by default twice the
+        number of threads
+    """
+    queue = SaveQueue(max_workers, max_pending)
+    flush_save_queue(shutdown=True)
+    _SAVE_QUEUE["default"] = queue
+
+
+def flush_save_queue(shutdown: bool = False) -> None:
+    """Wait until all plots saved with `background=True` are written.
+
+    The first error raised while writing is raised again.
+
+    Parameters
+    ----------
+    shutdown : bool, optional
+        Also stop the writing threads, e.g. before forking, by default False.
+        A new queue is created when the next plot is saved in the background.
+    """
+    queue = _SAVE_QUEUE["default"]
+    if queue is None:
+        return
+    if shutdown:
+        _SAVE_QUEUE["default"] = None
+        queue.shutdown()
+    else:
+        queue.flush()
+
+
+_FIGURE_TEMPLATES: dict[tuple, tuple[dict, bytes]] = {}
+
+
+def clear_figure_templates() -> None:
+    """Drop the stored figure templates, they are rebuilt by the next plots."""
+    _FIGURE_TEMPLATES.clear()
+
+
+def _reset_save_queue() -> None:
+    """Drop the save queue in forked processes, which do not inherit its threads."""
+    _SAVE_QUEUE["default"] = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_save_queue)
+
+
+if "PUMA_RENDER_MODE" in os.environ:
+    try:
+        set_render_mode(os.environ["PUMA_RENDER_MODE"])
+    except ValueError:
+        logger.warning(
+            "Ignoring PUMA_RENDER_MODE=%s, use one of %s. Using the interactive render mode.",
+            os.environ["PUMA_RENDER_MODE"],
+            RENDER_MODES,
+        )
+
+
 if TYPE_CHECKING:  # pragma: no cover
+    import tkinter as tk
+
     from matplotlib.axes import Axes
 
+    from puma.bundle import PlotBundle
+
+
+def import_class(path: str, base: type) -> type:
+    """Import a class from its "module:ClassName" path.
+
+    Parameters
+    ----------
+    path : str
+        Path of the class, e.g. "puma.roc:Roc"
+    base : type
+        Base class the imported class must inherit from
+
+    Returns
+    -------
+    type
+        The imported class
+
+    Raises
+    ------
+    TypeError
+        If the class is not a subclass of `base`
+    """
+    module_name, _, class_name = path.partition(":")
+    cls = importlib.import_module(module_name)
+    for name in class_name.split("."):
+        cls = getattr(cls, name)
+    if not isinstance(cls, type) or not issubclass(cls, base):
+        raise TypeError(f"{path} is not a subclass of {base.__name__}.")
+    return cls
+
+
+def class_path(cls: type) -> str:
+    """Get the "module:ClassName" path of a class, the inverse of `import_class`.
+
+    Parameters
+    ----------
+    cls : type
+        The class
+
+    Returns
+    -------
+    str
+        Path of the class
+    """
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+@contextmanager
+def _nested_call(plot: PlotBase):
+    """Track the nesting of recorded calls on a plot.
+
+    Parameters
+    ----------
+    plot : PlotBase
+        Plot on which a method is called
+
+    Yields
+    ------
+    bool
+        True if no other recorded method of the plot is running
+    """
+    # Written to __dict__ directly, to bypass the recording in `PlotBase.__setattr__`
+    state = plot.__dict__
+    depth = state.get("_call_depth", 0)
+    state["_call_depth"] = depth + 1
+    try:
+        yield depth == 0
+    finally:
+        state["_call_depth"] = depth
+
+
+def record_call(method: Callable) -> Callable:
+    """Record the calls of a plot method, so that the plot can be bundled.
+
+    Only the outer calls are recorded, calls made from within the constructor or
+    another recorded method are repeated when the outer call is replayed.
+
+    Parameters
+    ----------
+    method : Callable
+        Method of a `PlotBase` subclass
+
+    Returns
+    -------
+    Callable
+        The wrapped method
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: PlotBase, *args: Any, **kwargs: Any) -> Any:
+        with _nested_call(self) as outer:
+            result = method(self, *args, **kwargs)
+        if outer and "_recorded_calls" in self.__dict__:
+            self.__dict__["_recorded_calls"].append((method.__name__, args, kwargs))
+        return result
+
+    return wrapper
+
+
+def _record_init(init: Callable) -> Callable:
+    """Record the constructor arguments of a plot, see `record_call`.
+
+    Parameters
+    ----------
+    init : Callable
+        `__init__` of a `PlotBase` subclass
+
+    Returns
+    -------
+    Callable
+        The wrapped constructor
+    """
+
+    @functools.wraps(init)
+    def wrapper(self: PlotBase, *args: Any, **kwargs: Any) -> None:
+        with _nested_call(self) as outer:
+            init(self, *args, **kwargs)
+        if outer:
+            self.__dict__["_init_args"] = (args, kwargs)
+            self.__dict__["_recorded_calls"] = []
+
+    return wrapper
+
 
 @dataclass
 class PlotLineObject:
@@ -109,10 +466,18 @@ class PlotLineObject:
             The encoded object
         """
         # Encode special cases which can't be easily stored in json and yaml
+        if isinstance(obj, PlotLineObject):
+            # The common style arguments are added, since not all subclasses store them
+            args = {**PlotLineObject.args_to_store.fget(obj), **obj.args_to_store}
+            obj = {"__plot_line__": class_path(type(obj)), "args": args}
+        if isinstance(obj, np.generic):
+            obj = obj.item()
         if isinstance(obj, np.ndarray):
             return {"__ndarray__": obj.tolist(), "dtype": str(obj.dtype)}
         if isinstance(obj, Label):
-            return {"__label__": obj.name}
+            obj = {"__label__": obj.name}
+        if isinstance(obj, Colormap):
+            obj = PlotLineObject._encode_colormap(obj)
         if isinstance(obj, tuple):
             return {"__tuple__": [PlotLineObject.encode(v) for v in obj]}
 
@@ -125,6 +490,51 @@ class PlotLineObject:
         # If no encoding is needed, return the object
         return obj
 
+    @staticmethod
+    def _encode_colormap(cmap: Colormap) -> dict[str, Any]:
+        """Encode a matplotlib colormap.
+
+        Registered colormaps are stored by name, all others by their colours.
+
+        Parameters
+        ----------
+        cmap : Colormap
+            Colormap that is to be encoded
+
+        Returns
+        -------
+        dict[str, Any]
+            The encoded colormap
+        """
+        if cmap.name in mpl.colormaps and mpl.colormaps[cmap.name] == cmap:
+            return {"__colormap__": cmap.name}
+        return {
+            "__colormap__": cmap.name,
+            "colors": cmap(np.arange(cmap.N)).tolist(),
+            "bad": list(cmap.get_bad()),
+            "under": list(cmap.get_under()),
+            "over": list(cmap.get_over()),
+        }
+
+    @staticmethod
+    def _decode_colormap(obj: dict[str, Any]) -> Colormap:
+        """Decode a colormap encoded with `_encode_colormap`.
+
+        Parameters
+        ----------
+        obj : dict[str, Any]
+            The encoded colormap
+
+        Returns
+        -------
+        Colormap
+            The colormap
+        """
+        if "colors" not in obj:
+            return mpl.colormaps[obj["__colormap__"]]
+        cmap = ListedColormap(obj["colors"], name=obj["__colormap__"])
+        return cmap.with_extremes(bad=obj["bad"], under=obj["under"], over=obj["over"])
+
     @staticmethod
     def decode(obj: Any) -> Any:
         """Inverse of encode, turning tags back into real objects.
@@ -149,7 +559,13 @@ class PlotLineObject:
                 return tuple(PlotLineObject.decode(v) for v in obj["__tuple__"])
 
             # If it's a regular dict, walk down the keys
-            return {k: PlotLineObject.decode(v) for k, v in obj.items()}
+            decoded = {k: PlotLineObject.decode(v) for k, v in obj.items()}
+            if "__plot_line__" in decoded:
+                line_class = import_class(decoded["__plot_line__"], PlotLineObject)
+                decoded = line_class.from_args(decoded["args"])
+            elif "__colormap__" in decoded:
+                decoded = PlotLineObject._decode_colormap(decoded)
+            return decoded
 
         # If a list was used, check that all sub-objects are correctly loaded
         if isinstance(obj, list):
@@ -235,11 +651,27 @@ class PlotLineObject:
         # allow caller to override
         data.update(extra_kwargs)
 
+        return cls.from_args(data)
+
+    @classmethod
+    def from_args(cls, args: dict[str, Any]) -> Self:
+        """Construct the object from its stored arguments without __init__.
+
+        Parameters
+        ----------
+        args : dict[str, Any]
+            Decoded arguments, as returned by `args_to_store`
+
+        Returns
+        -------
+        Class Instance
+            Instance of class with the given attributes.
+        """
         # Init the class without running __init__
         obj: Self = cls.__new__(cls)
 
         # Set attributes verbatim
-        for key, val in data.items():
+        for key, val in args.items():
             setattr(obj, key, val)
         return obj
 
@@ -333,6 +765,17 @@ class PlotObject:
     plotting_done : bool
         Bool that indicates if plotting is done. Only then `atlasify()` can be called,
         by default False
+    render_mode : str, optional
+        Either "interactive" or "batch". In "batch" mode, the figure is drawn with the
+        Agg canvas and `show()` does nothing. By default None, which uses the global
+        render mode, see `set_render_mode`
+    decimate_tolerance : float, optional
+        Draw dense curves, e.g. ROC curves, only with the points needed to reproduce
+        them within this tolerance, as fraction of the axis ranges, see
+        `puma.utils.decimation.decimate_curve`. By default None, which draws all points
+    rasterise_threshold : int, optional
+        Rasterise uncertainty bands drawn with more points than this, which keeps
+        vector outputs like pdf small, by default None
     """
 
     title: str = ""
@@ -382,6 +825,11 @@ class PlotObject:
     atlas_second_tag_distance: float = 0
 
     plotting_done: bool = False
+    render_mode: str | None = None
+
+    # rendering of dense curves
+    decimate_tolerance: float | None = None
+    rasterise_threshold: int | None = None
 
     def __post_init__(self) -> None:
         """Check for allowed values.
@@ -390,8 +838,17 @@ class PlotObject:
         ------
         ValueError
             If n_ratio_panels not in [0, 1, 2, 3]
+            If the render mode is not supported
+            If the decimation tolerance or rasterisation threshold is not positive
         """
         self.__check_figsize()
+        if self.render_mode is not None and self.render_mode not in RENDER_MODES:
+            raise ValueError(
+                f"Render mode {self.render_mode} not supported, use one of {RENDER_MODES}."
+            )
+        for name in ("decimate_tolerance", "rasterise_threshold"):
+            if getattr(self, name) is not None and getattr(self, name) <= 0:
+                raise ValueError(f"`{name}` must be positive, got {getattr(self, name)}.")
         allowed_n_ratio_panels = [0, 1, 2, 3]
         if self.n_ratio_panels not in allowed_n_ratio_panels:
             raise ValueError(
@@ -471,8 +928,26 @@ class PlotObject:
 
 
 class PlotBase(PlotObject):
-    """Base class for plotting."""
+    """Base class for plotting.
+
+    The constructor arguments and the calls of the methods decorated with
+    `record_call`, e.g. `add()` and `draw()`, are recorded, so that the plot can
+    be stored as a `puma.bundle.PlotBundle` and re-rendered without the data.
+    """
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Record the constructor arguments of all subclasses.
+
+        Parameters
+        ----------
+        **kwargs : kwargs
+            Keyword arguments passed to `object.__init_subclass__()`
+        """
+        super().__init_subclass__(**kwargs)
+        if "__init__" in cls.__dict__:
+            cls.__init__ = _record_init(cls.__init__)
 
+    @_record_init
     def __init__(self, **kwargs: Any) -> None:
         """Initialise class with PlotObject kwargs.
 
@@ -487,16 +962,124 @@ class PlotBase(PlotObject):
         self.axis_leg: Axes | None = None
         self.fig: Figure | None = None
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute, recording assignments made from outside the plot.
+
+        Parameters
+        ----------
+        name : str
+            Name of the attribute
+        value : Any
+            Value of the attribute
+        """
+        super().__setattr__(name, value)
+        state = self.__dict__
+        if not name.startswith("_") and not state.get("_call_depth") and "_recorded_calls" in state:
+            state["_recorded_calls"].append(("__setattr__", (name, value), {}))
+
+    def bundle(self, plot_name: str | Path | Sequence[str | Path] | None = None) -> PlotBundle:
+        """Store the plot as a bundle, which can be re-rendered without the data.
+
+        The line objects are stored via their `args_to_store`, so the bundle is a
+        snapshot of the plot at the time of the call.
+
+        Parameters
+        ----------
+        plot_name : str | Path | Sequence[str | Path], optional
+            File name, or list of file names, the plot is saved to when the bundle
+            is rendered, by default None
+
+        Returns
+        -------
+        PlotBundle
+            Bundle of the plot
+        """
+        from puma.bundle import PlotBundle
+
+        if isinstance(plot_name, Path):
+            plot_name = str(plot_name)
+        elif plot_name is not None and not isinstance(plot_name, str):
+            plot_name = [str(name) for name in plot_name]
+
+        args, kwargs = self._init_args
+        return PlotBundle(
+            plot_class=class_path(type(self)),
+            args=PlotLineObject.encode(list(args)),
+            kwargs=PlotLineObject.encode(kwargs),
+            calls=[
+                [name, PlotLineObject.encode(list(call_args)), PlotLineObject.encode(call_kwargs)]
+                for name, call_args, call_kwargs in self._recorded_calls
+            ],
+            plot_name=plot_name,
+        )
+
+    @property
+    def batch_mode(self) -> bool:
+        """Whether the plot is rendered in batch mode.
+
+        Returns
+        -------
+        bool
+            True if the render mode of the plot, or the global one if not set, is "batch"
+        """
+        return (self.render_mode or get_render_mode()) == "batch"
+
+    @property
+    def layout_key(self) -> tuple:
+        """Layout options which determine the empty figure and its axes.
+
+        Returns
+        -------
+        tuple
+            Options used by `initialise_figure`, plots with the same key share
+            their figure template
+        """
+        return (
+            self.vertical_split,
+            self.figsize,
+            0 if self.vertical_split else self.n_ratio_panels,
+            self.figure_layout,
+            self.grid,
+        )
+
     def initialise_figure(self) -> None:
-        """Create matplotlib Figure and subplots based on layout options."""
+        """Create matplotlib Figure and subplots based on layout options.
+
+        The empty figure is built once for each layout and stored as template, the
+        following plots with the same layout get an unpickled copy of it. The
+        templates are rebuilt if the matplotlib rcParams changed in between.
+        """
+        if self.vertical_split and self.n_ratio_panels >= 1:
+            logger.warning(
+                "You set the number of ratio panels to %i but also set the"
+                " vertical splitting to True. Therefore no ratiopanels are"
+                " created.",
+                self.n_ratio_panels,
+            )
+
+        key = self.layout_key
+        template = _FIGURE_TEMPLATES.get(key)
+        # Compare the stored values directly, the Mapping comparison of the
+        # rcParams copies them first
+        if template is not None and dict.__eq__(mpl.rcParams, template[0]):  # noqa: PLC2801
+            # The templates are only ever pickled by this module
+            self.fig = pickle.loads(template[1])  # noqa: S301
+            if self.vertical_split:
+                self.axis_top, self.axis_leg = self.fig.axes
+            else:
+                self.axis_top, *ratio_axes = self.fig.axes
+                self.ratio_axes.extend(ratio_axes)
+        else:
+            self._build_figure()
+            _FIGURE_TEMPLATES[key] = (dict(mpl.rcParams), pickle.dumps(self.fig))
+
+        # In batch mode, pin the non-interactive Agg canvas
+        if self.batch_mode:
+            FigureCanvasAgg(self.fig)
+
+    def _build_figure(self) -> None:
+        """Build the empty figure and its axes from the layout options."""
         if self.vertical_split:  # split figure vertically instead of horizonally
-            if self.n_ratio_panels >= 1:
-                logger.warning(
-                    "You set the number of ratio panels to %i but also set the"
-                    " vertical splitting to True. Therefore no ratiopanels are"
-                    " created.",
-                    self.n_ratio_panels,
-                )
             self.fig = Figure(figsize=(6, 4.5) if self.figsize is None else self.figsize)
             g_spec = gridspec.GridSpec(1, 11, figure=self.fig)
             self.axis_top = self.fig.add_subplot(g_spec[0, :9])
@@ -552,6 +1135,7 @@ class PlotBase(PlotObject):
             for ratio_axis in self.ratio_axes:
                 ratio_axis.grid(lw=0.3)
 
+    @record_call
     def draw_vlines(
         self,
         xs: Sequence[float],
@@ -610,6 +1194,7 @@ class PlotBase(PlotObject):
             for ratio_axis in self.ratio_axes:
                 ratio_axis.axvline(x=vline_x, color=colour, linestyle=linestyle, linewidth=1.0)
 
+    @record_call
     def set_title(self, title: str | None = None, **kwargs: Any) -> None:
         """Set title of top panel.
 
@@ -624,6 +1209,55 @@ class PlotBase(PlotObject):
         assert self.axis_top is not None
         self.axis_top.set_title(self.title if title is None else title, **kwargs)
 
+    def decimation_mask(
+        self,
+        x: np.ndarray,
+        *ys: np.ndarray,
+        logy: bool | None = None,
+    ) -> np.ndarray:
+        """Get the points of dense curves which are drawn, see `decimate_tolerance`.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            x values of the curves
+        *ys : np.ndarray
+            y values of the curves, e.g. a curve and the edges of its uncertainty band
+        logy : bool, optional
+            Whether the y-axis is logarithmic, by default `logy` of the plot
+
+        Returns
+        -------
+        np.ndarray
+            Boolean mask of the points to draw, all points if `decimate_tolerance`
+            is not set
+        """
+        if self.decimate_tolerance is None:
+            return np.ones(len(x), dtype=bool)
+        return decimate_curve(
+            x,
+            *ys,
+            tolerance=self.decimate_tolerance,
+            logx=self.logx,
+            logy=self.logy if logy is None else logy,
+        )
+
+    def rasterise(self, n_points: int) -> bool:
+        """Check if an uncertainty band is rasterised, see `rasterise_threshold`.
+
+        Parameters
+        ----------
+        n_points : int
+            Number of points the band is drawn with
+
+        Returns
+        -------
+        bool
+            True if the band has more points than `rasterise_threshold`
+        """
+        return self.rasterise_threshold is not None and n_points > self.rasterise_threshold
+
+    @record_call
     def set_log(self) -> None:
         """Set log scale of axes as configured."""
         assert self.axis_top is not None
@@ -637,6 +1271,7 @@ class PlotBase(PlotObject):
             ymin, ymax = self.axis_top.get_ylim()
             self.y_scale = ymin * ((ymax / ymin) ** self.y_scale) / ymax
 
+    @record_call
     def set_y_lim(self) -> None:
         """Set limits of y-axis (main and ratios)."""
         assert self.axis_top is not None
@@ -692,6 +1327,7 @@ class PlotBase(PlotObject):
         )
         self.fig.align_labels()
 
+    @record_call
     def set_xlabel(self, label: str | None = None, **kwargs: Any) -> None:
         """Set x-axis label on the bottom-most axis.
 
@@ -714,6 +1350,7 @@ class PlotBase(PlotObject):
         else:
             self.ratio_axes[-1].set_xlabel(**xlabel_args, **kwargs)
 
+    @record_call
     def set_tick_params(self, labelsize: int | None = None, **kwargs: Any) -> None:
         """Set tick params on all relevant axes.
 
@@ -735,6 +1372,7 @@ class PlotBase(PlotObject):
             if i == self.n_ratio_panels - 1:
                 ratio_axis.tick_params(axis="x", labelsize=labelsize_eff, **kwargs)
 
+    @record_call
     def set_xlim(self, xmin: float | None = None, xmax: float | None = None, **kwargs: Any) -> None:
         """Set limits of x-axis.
 
@@ -756,34 +1394,149 @@ class PlotBase(PlotObject):
 
     def savefig(
         self,
-        plot_name: str,
+        plot_name: str | Path | Sequence[str | Path],
         transparent: bool | None = None,
-        dpi: int | None = None,
+        dpi: int | Sequence[int] | None = None,
+        background: bool = False,
+        close: bool = False,
         **kwargs: Any,
-    ) -> None:
+    ) -> Future | None:
         """Save plot to disk.
 
+        Several file names, e.g. with different extensions, can be given to write
+        the plot in several formats. The figure is then laid out only once and all
+        files are written with the same layout and bounding box.
+
         Parameters
         ----------
-        plot_name : str
-            File name of the plot
+        plot_name : str | Path | Sequence[str | Path]
+            File name of the plot, or list of file names
         transparent : bool, optional
             Specify if plot background is transparent, by default False
-        dpi : int, optional
-            DPI for plotting, by default 400
+        dpi : int | Sequence[int], optional
+            DPI for plotting, or list with the DPI of each file, by default 400
+        background : bool, optional
+            Write the files in a thread of the save queue, see `get_save_queue`, by
+            default False. The next plot can then be computed while this one is
+            written. The plot must not be modified until the returned future is
+            done, call `flush_save_queue` to wait for all plots and raise the
+            errors raised while writing.
+        close : bool, optional
+            Clear the figure after writing it to free its memory, by default False
+        **kwargs : kwargs
+            Keyword arguments passed to `matplotlib.figure.Figure.savefig()`
+
+        Returns
+        -------
+        Future | None
+            Future of the background writing, None if the files were written directly
+
+        Raises
+        ------
+        ValueError
+            If the number of DPIs and file names differ
+        """
+        plot_names = [plot_name] if isinstance(plot_name, (str, Path)) else list(plot_name)
+        dpis = list(dpi) if isinstance(dpi, Sequence) else [dpi] * len(plot_names)
+        if len(dpis) != len(plot_names):
+            raise ValueError(f"Got {len(dpis)} DPIs for {len(plot_names)} file names.")
+        dpis = [self.dpi if file_dpi is None else file_dpi for file_dpi in dpis]
+        transparent = self.transparent if transparent is None else transparent
+
+        if background:
+            return get_save_queue().submit(
+                self._write_files, plot_names, dpis, transparent, close, **kwargs
+            )
+        self._write_files(plot_names, dpis, transparent, close, **kwargs)
+        return None
+
+    def _write_files(
+        self,
+        plot_names: list[str | Path],
+        dpis: list[int],
+        transparent: bool,
+        close: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Write the figure to one or several files, see `savefig`.
+
+        Parameters
+        ----------
+        plot_names : list[str | Path]
+            File names of the plot
+        dpis : list[int]
+            DPI of each file
+        transparent : bool
+            Specify if plot background is transparent
+        close : bool, optional
+            Clear the figure after writing it, by default False
+        **kwargs : kwargs
+            Keyword arguments passed to `matplotlib.figure.Figure.savefig()`
+        """
+        try:
+            self._write_figure(plot_names, dpis, transparent, **kwargs)
+        finally:
+            if close:
+                self.fig.clear()
+
+    def _write_figure(
+        self,
+        plot_names: list[str | Path],
+        dpis: list[int],
+        transparent: bool,
+        **kwargs: Any,
+    ) -> None:
+        """Write the figure to one or several files, laying it out only once.
+
+        Parameters
+        ----------
+        plot_names : list[str | Path]
+            File names of the plot
+        dpis : list[int]
+            DPI of each file
+        transparent : bool
+            Specify if plot background is transparent
         **kwargs : kwargs
             Keyword arguments passed to `matplotlib.figure.Figure.savefig()`
         """
         assert self.fig is not None
-        logger.debug("Saving plot to %s", plot_name)
-        self.fig.savefig(
-            plot_name,
-            transparent=self.transparent if transparent is None else transparent,
-            dpi=self.dpi if dpi is None else dpi,
-            bbox_inches="tight",
-            pad_inches=0.04,
-            **kwargs,
-        )
+        if len(plot_names) == 1:
+            logger.debug("Saving plot to %s", plot_names[0])
+            self.fig.savefig(
+                plot_names[0],
+                transparent=transparent,
+                dpi=dpis[0],
+                bbox_inches="tight",
+                pad_inches=0.04,
+                **kwargs,
+            )
+            return
+
+        # Lay out the figure once at the DPI of the first file, `savefig` would
+        # otherwise do it for each file
+        figure_dpi = self.fig.dpi
+        self.fig.dpi = dpis[0]
+        try:
+            self.fig.draw_without_rendering()
+            bbox_inches = self.fig.get_tightbbox().padded(0.04)
+        finally:
+            self.fig.dpi = figure_dpi
+        layout_engine = self.fig.get_layout_engine()
+        if layout_engine is not None:
+            self.fig.set_layout_engine("none")
+        try:
+            for file_name, file_dpi in zip(plot_names, dpis):
+                logger.debug("Saving plot to %s", file_name)
+                self.fig.savefig(
+                    file_name,
+                    transparent=transparent,
+                    dpi=file_dpi,
+                    bbox_inches=bbox_inches,
+                    **kwargs,
+                )
+        finally:
+            if layout_engine is not None:
+                self.fig.set_layout_engine(layout_engine)
 
     def is_running_in_jupyter(self) -> bool:
         """Detect if running inside a Jupyter notebook.
@@ -791,9 +1544,15 @@ class PlotBase(PlotObject):
         Returns
         -------
         bool
-            If the code is run inside a jupyter notebook
+            If the code is run inside a jupyter notebook, always False in batch mode
         """
+        if self.batch_mode:
+            return False
+
         try:
+            # IPython is only imported when needed, as it is slow to import
+            from IPython import get_ipython
+
             shell = get_ipython()
 
             # Running in standard Python interpreter
@@ -849,12 +1608,23 @@ class PlotBase(PlotObject):
         ValueError
             If the figure is not initalized yet
         """
+        if self.batch_mode:
+            logger.debug("Not showing the plot in batch render mode.")
+            return
+
         if self.is_running_in_jupyter():
+            from IPython.display import display
+
             logger.debug("Detected Jupyter Notebook, displaying inline.")
             assert self.fig is not None
             display(self.fig)
             return
 
+        # The GUI toolkit is only imported when a window is opened
+        import tkinter as tk
+
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         logger.debug("Showing plot using tkinter")
 
         # Ensure figure is initialized
@@ -884,6 +1654,7 @@ class PlotBase(PlotObject):
         # Start Tkinter event loop
         root.mainloop()
 
+    @record_call
     def atlasify(self, force: bool = False) -> None:
         """Apply ATLAS style to all axes using the atlasify package.
 
@@ -972,6 +1743,7 @@ class PlotBase(PlotObject):
             )
         )
 
+    @record_call
     def make_linestyle_legend(
         self,
         linestyles: Sequence[str],
@@ -1022,6 +1794,7 @@ class PlotBase(PlotObject):
         )
         axis_for_legend.add_artist(linestyle_legend)
 
+    @record_call
     def set_ratio_label(self, ratio_panel: int, label: str) -> None:
         """Associate the rejection class to a ratio panel.
 
@@ -9,55 +9,122 @@ import matplotlib.pyplot as plt
 import numpy as np
 from ftag import Flavours, Label
 from ftag.utils import calculate_rejection_error
+from matplotlib.backends.backend_agg import RendererAgg
 
-from puma.plot_base import PlotBase, PlotLineObject
+from puma.plot_base import PlotBase, PlotLineObject, record_call
 from puma.utils import get_good_colours, get_good_linestyles, logger
 
 if TYPE_CHECKING:  # pragma: no cover
     from matplotlib.axes import Axes
+    from matplotlib.backend_bases import RendererBase
+    from matplotlib.figure import Figure
+    from matplotlib.transforms import Bbox
 
 
-def can_hide(ax) -> bool:
+def layout_renderer(fig: Figure) -> RendererBase:
+    """Lay out the figure once and get a renderer to measure its artists.
+
+    The figure is drawn without rasterising it, which places the axes, ticks and
+    labels. The returned renderer is reused for all window extents, instead of
+    drawing the figure again for each query.
+
+    Parameters
+    ----------
+    fig : Figure
+        Figure to lay out
+
+    Returns
+    -------
+    RendererBase
+        Renderer with the DPI of the figure
+    """
+    fig.draw_without_rendering()
+    if hasattr(fig.canvas, "get_renderer"):
+        return fig.canvas.get_renderer()
+    return RendererAgg(fig.bbox.width, fig.bbox.height, fig.dpi)
+
+
+def _is_inside(label_bbox: Bbox, ax_bbox: Bbox) -> bool:
+    """Check if a tick label lies vertically within its axis.
+
+    Parameters
+    ----------
+    label_bbox : Bbox
+        Window extent of the label
+    ax_bbox : Bbox
+        Window extent of the axis
+
+    Returns
+    -------
+    bool
+        True if the label is within the axis
+    """
+    return label_bbox.y0 > ax_bbox.y0 and label_bbox.y1 < ax_bbox.y1
+
+
+def can_hide(ax, renderer: RendererBase | None = None) -> bool:
     """Check if the label is hideable.
 
     Parameters
     ----------
     ax : Axes
         Axes object which is to be tested.
+    renderer : RendererBase, optional
+        Renderer of the laid out figure, see `layout_renderer`, by default None
 
     Returns
     -------
     bool
         Returns a bool about the hideablility of the object.
     """
-    num_labels = 0
-    ax_bbox = ax.get_window_extent()
-    for label in ax.get_yticklabels():
-        label_bbox = label.get_window_extent()
-        if label.get_visible() and (label_bbox.y0 > ax_bbox.y0 and label_bbox.y1 < ax_bbox.y1):
-            num_labels += 1
+    ax_bbox = ax.get_window_extent(renderer)
+    num_labels = sum(
+        label.get_visible() and _is_inside(label.get_window_extent(renderer), ax_bbox)
+        for label in ax.get_yticklabels()
+    )
     return num_labels > 1
 
 
-def adjust_ylabels(fig, axes, min_distance=1) -> None:
-    """Adjust the y-axis labels to avoid overlap."""
-    fig.canvas.draw()
+def adjust_ylabels(fig, axes, min_distance=1, renderer: RendererBase | None = None) -> None:
+    """Adjust the y-axis labels to avoid overlap.
+
+    Tick labels closer than `min_distance` to the bottom or top of their axis are
+    hidden, as long as more than one label stays visible within the axis. The
+    window extents are measured once per axis.
+
+    Parameters
+    ----------
+    fig : Figure
+        Figure with the axes
+    axes : Iterable[Axes]
+        Axes whose tick labels are adjusted
+    min_distance : float, optional
+        Minimal distance of the labels to the axis edges in pixels, by default 1
+    renderer : RendererBase, optional
+        Renderer of the laid out figure, by default None, which lays out the
+        figure, see `layout_renderer`
+    """
+    if renderer is None:
+        renderer = layout_renderer(fig)
     for ax in axes:
-        labels = ax.get_yticklabels()
-        ax_bbox = ax.get_window_extent()
-        for label in labels:
-            label_bbox = label.get_window_extent()
+        ax_bbox = ax.get_window_extent(renderer)
+        labels = [(label, label.get_window_extent(renderer)) for label in ax.get_yticklabels()]
+        num_inside = sum(
+            label.get_visible() and _is_inside(label_bbox, ax_bbox) for label, label_bbox in labels
+        )
+        for label, label_bbox in labels:
             # skip label if it is not visible
             if label_bbox.y1 < ax_bbox.y0 or label_bbox.y0 > ax_bbox.y1:
                 continue
-            # hide label if it is too close to the bottom
-            if label_bbox.y0 - ax_bbox.y0 < min_distance and can_hide(ax):
-                label.set_visible(False)
-                continue
-            # hide label if it is too close to the top
-            if ax_bbox.y1 - label_bbox.y1 < min_distance and can_hide(ax):
+            # hide label if it is too close to the bottom or the top
+            too_close = (
+                label_bbox.y0 - ax_bbox.y0 < min_distance
+                or ax_bbox.y1 - label_bbox.y1 < min_distance
+            )
+            if too_close and num_inside > 1:
+                if label.get_visible() and _is_inside(label_bbox, ax_bbox):
+                    num_inside -= 1
                 label.set_visible(False)
-                continue
 
 
 class Roc(PlotLineObject):
@@ -277,6 +344,7 @@ class RocPlot(PlotBase):
         self.legend_flavs = None
         self.rej_leg_loc = "ratio" if kwargs["n_ratio_panels"] > 0 else "lower left"
 
+    @record_call
     def add_roc(
         self,
         roc_curve: Roc,
@@ -352,6 +420,7 @@ class RocPlot(PlotBase):
             )
             self.reference_label = roc_curve.label
 
+    @record_call
     def set_roc_reference(
         self,
         key: str,
@@ -390,6 +459,7 @@ class RocPlot(PlotBase):
                 )
             self.reference_roc[rej_class][ratio_group] = key
 
+    @record_call
     def set_ratio_class(self, ratio_panel: int, rej_class: str | Label):
         """Associate the rejection class to a ratio panel adn set the legend label.
 
@@ -459,22 +529,25 @@ class RocPlot(PlotBase):
             )
 
             self.roc_ratios[key] = (sig_eff, ratio, ratio_err)
+            band = [] if ratio_err is None else [ratio - ratio_err, ratio + ratio_err]
+            keep = self.decimation_mask(sig_eff, ratio, *band, logy=False)
             axis.plot(
-                sig_eff,
-                ratio,
+                sig_eff[keep],
+                ratio[keep],
                 color=elem.colour,
                 linestyle=elem.linestyle,
                 linewidth=2.0,
             )
             if ratio_err is not None:
                 axis.fill_between(
-                    sig_eff,
-                    ratio - ratio_err,
-                    ratio + ratio_err,
+                    sig_eff[keep],
+                    band[0][keep],
+                    band[1][keep],
                     color=elem.colour,
                     alpha=0.25,
                     edgecolor="none",
                     zorder=1,
+                    rasterized=self.rasterise(np.count_nonzero(keep)),
                 )
 
     def make_split_legend(self, handles):
@@ -551,6 +624,7 @@ class RocPlot(PlotBase):
             ncol=self.leg_ncol,
         )
 
+    @record_call
     def draw(
         self,
         labelpad: int | None = None,
@@ -598,13 +672,12 @@ class RocPlot(PlotBase):
             if self.legend_flavs is not None:
                 self.legend_flavs.set_frame_on(False)
 
-        # Ensure the figure layout is calculated before getting extents
-        self.fig.canvas.draw_idle()
+        # Lay out the figure once, the extents below are measured with this renderer
+        renderer = layout_renderer(self.fig)
 
         # Add the common ratio label as figure text if it exists
         if common_ratio_ylabel_text and self.axis_top.yaxis.get_label().get_text():
             main_ylabel_obj = self.axis_top.yaxis.get_label()
-            renderer = self.fig.canvas.get_renderer()
             main_ylabel_disp_bbox = main_ylabel_obj.get_window_extent(renderer=renderer)
             main_ylabel_fig_bbox = main_ylabel_disp_bbox.transformed(
                 self.fig.transFigure.inverted()
@@ -632,7 +705,7 @@ class RocPlot(PlotBase):
                 transform=self.fig.transFigure,
             )
 
-        adjust_ylabels(self.fig, self.rej_axes.values())
+        adjust_ylabels(self.fig, self.rej_axes.values(), renderer=renderer)
 
     def plot_roc(self, **kwargs) -> mpl.lines.Line2D:
         """Plotting roc curves.
@@ -649,9 +722,18 @@ class RocPlot(PlotBase):
         """
         plt_handles = []
         for key, elem in self.rocs.items():
+            sig_eff, bkg_rej = elem.non_zero
+            band = []
+            if elem.n_test is not None:
+                # if uncertainties are available for roc plotting their uncertainty as
+                # a band around the roc itself
+                rej_err = elem.binomial_error()
+                band = [bkg_rej - rej_err, bkg_rej + rej_err]
+            # The decimation keeps the points needed to draw the curve and its band
+            keep = self.decimation_mask(sig_eff, bkg_rej, *band)
             plt_handles += self.axis_top.plot(
-                elem.sig_eff[elem.non_zero_mask],
-                elem.bkg_rej[elem.non_zero_mask],
+                sig_eff[keep],
+                bkg_rej[keep],
                 linestyle=elem.linestyle,
                 linewidth=2,
                 color=elem.colour,
@@ -659,22 +741,15 @@ class RocPlot(PlotBase):
                 zorder=2,
                 **kwargs,
             )
-            if elem.n_test is not None:
-                # if uncertainties are available for roc plotting their uncertainty as
-                # a band around the roc itself
-                rej_band_down = (
-                    elem.bkg_rej[elem.non_zero_mask] - elem.binomial_error()[elem.non_zero_mask]
-                )
-                rej_band_up = (
-                    elem.bkg_rej[elem.non_zero_mask] + elem.binomial_error()[elem.non_zero_mask]
-                )
+            if band:
                 self.axis_top.fill_between(
-                    elem.sig_eff[elem.non_zero_mask],
-                    rej_band_down,
-                    rej_band_up,
+                    sig_eff[keep],
+                    band[0][keep],
+                    band[1][keep],
                     color=elem.colour,
                     alpha=0.25,
                     edgecolor="none",
                     zorder=2,
+                    rasterized=self.rasterise(np.count_nonzero(keep)),
                 )
         return plt_handles
@@ -81,6 +81,19 @@ class AuxResultsTestCase(unittest.TestCase):
         )
         self.assertEqual(list(results.taggers.values()), taggers)
 
+    def test_load_taggers_compact_dtypes(self):
+        fname = get_dummy_tagger_aux()[0]
+        results = AuxResults(sample="test")
+        taggers = [Tagger("GN2", cuts=[("pt", ">", 20_000)])]
+        results.load_taggers_from_file(taggers, fname, cuts=[("eta", ">", 0)])
+        tagger = taggers[0]
+        n_jets = len(tagger.labels)
+        for task, dtype in [("vertexing", np.int16), ("track_origin", np.int8)]:
+            self.assertEqual(tagger.aux_labels[task].dtype, dtype)
+            self.assertEqual(tagger.aux_scores[task].dtype, dtype)
+            self.assertEqual(len(tagger.aux_labels[task]), n_jets)
+            self.assertEqual(len(tagger.aux_scores[task]), n_jets)
+
     def test_load_taggers_with_cuts_override_perf_vars(self):
         rng = np.random.default_rng(seed=16)
         fname = get_dummy_tagger_aux()[0]
@@ -172,6 +185,43 @@ class AuxResultsTestCase(unittest.TestCase):
                     " Removing them.",
                 ],
             )
+            tagger = next(iter(results.taggers.values()))
+            self.assertEqual(len(tagger.labels), len(jet_array) - len(n_nans))
+            self.assertEqual(len(tagger.aux_labels["track_origin"]), len(jet_array) - len(n_nans))
+
+    def test_load_track_origin_probs(self):
+        f = get_dummy_tagger_aux(size=500)[1]
+        tracks = f["tracks"][:]
+        prob_vars = Tagger("GN2").aux_probability_variables["track_origin"]
+        probs = np.random.default_rng(42).dirichlet(np.ones(len(prob_vars)), size=tracks.shape)
+        track_array = np.zeros(
+            tracks.shape, dtype=tracks.dtype.descr + [(var, "f4") for var in prob_vars]
+        )
+        for name in tracks.dtype.names:
+            track_array[name] = tracks[name]
+        for i, var in enumerate(prob_vars):
+            track_array[var] = probs[..., i]
+        with tempfile.TemporaryDirectory() as tmp_file:
+            fname = Path(tmp_file) / "test.h5"
+            with h5py.File(fname, "w") as h5_file:
+                h5_file.create_dataset("jets", data=f["jets"][:])
+                h5_file.create_dataset("tracks", data=track_array)
+            results = AuxResults(sample="test", output_dir=tmp_file)
+            taggers = [Tagger("GN2", cuts=[("pt", ">", 20_000)])]
+            results.load_taggers_from_file(taggers, fname)
+            tagger = taggers[0]
+            self.assertEqual(
+                tagger.aux_scores["track_origin_probs"].shape,
+                (*tagger.aux_labels["track_origin"].shape, len(prob_vars)),
+            )
+            results.plot_track_origin_curves(n_bins=100)
+            self.assertTrue(Path(results.get_filename("GN2_trackOrigin_roc")).is_file())
+
+        # the probabilities are optional
+        fname = get_dummy_tagger_aux()[0]
+        results = AuxResults(sample="test")
+        results.load_taggers_from_file([Tagger("GN2")], fname)
+        self.assertNotIn("track_origin_probs", next(iter(results.taggers.values())).aux_scores)
 
 
 class AuxResultsPlotsTestCase(unittest.TestCase):
@@ -239,6 +289,26 @@ class AuxResultsPlotsTestCase(unittest.TestCase):
             auxresults.plot_track_origin_confmat(minimal_plot=False)
             self.assertIsFile(auxresults.get_filename(self.dummy_tagger.name + "_trackOrigin_cm"))
 
+    def test_plot_trackorigin_curves(self):
+        rng = np.random.default_rng(42)
+        target = self.dummy_tagger.aux_labels["track_origin"]
+        self.dummy_tagger.aux_scores["track_origin_probs"] = rng.dirichlet(
+            np.ones(8), size=target.shape
+        )
+        with tempfile.TemporaryDirectory() as tmp_file:
+            auxresults = AuxResults(sample="test", output_dir=tmp_file, chunk_size=1000)
+            auxresults.add(self.dummy_tagger)
+            auxresults.plot_track_origin_curves(n_bins=100)
+            self.assertIsFile(auxresults.get_filename(self.dummy_tagger.name + "_trackOrigin_pr"))
+            self.assertIsFile(auxresults.get_filename(self.dummy_tagger.name + "_trackOrigin_roc"))
+
+    def test_plot_trackorigin_curves_no_probs(self):
+        with tempfile.TemporaryDirectory() as tmp_file:
+            auxresults = AuxResults(sample="test", output_dir=tmp_file)
+            auxresults.add(self.dummy_tagger)
+            with self.assertRaises(ValueError):
+                auxresults.plot_track_origin_curves()
+
     def test_plot_var_vtx_perf_bjets(self):
         """Test that png files are being created for tagger with aux tasks."""
         self.dummy_tagger.reference = True
@@ -8,11 +8,14 @@ import tempfile
 import unittest
 from urllib.request import urlretrieve
 
+import h5py
 import numpy as np
 from ftag import Flavours
+from ftag.hdf5 import H5Reader
 from matplotlib.testing.compare import compare_images
 
 from puma.hlplots import n_tracks_per_origin
+from puma.hlplots.n_track_origin import _track_origin_moments
 from puma.utils import logger, set_log_level
 
 set_log_level(logger, "DEBUG")
@@ -303,3 +306,99 @@ class NTrackOriginTestCase(unittest.TestCase):
                 track_origin_dict=None,
                 plot_format="png",
             )
+
+
+class TrackOriginMomentsTestCase(unittest.TestCase):
+    """Test the accumulation of the track multiplicities from a local file."""
+
+    def setUp(self):
+        """Write a small dummy file."""
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.fname = os.path.join(self.tmp_dir.name, "dummy.h5")
+        rng = np.random.default_rng(42)
+        n_jets = 1000
+        jets = np.zeros(n_jets, dtype=[("pt", "f4"), ("HadronConeExclTruthLabelID", "i4")])
+        jets["pt"] = rng.uniform(10_000, 300_000, n_jets)
+        jets["HadronConeExclTruthLabelID"] = rng.choice([0, 4, 5], n_jets)
+        tracks = np.zeros((n_jets, 20), dtype=[("ftagTruthOriginLabel", "i4")])
+        tracks["ftagTruthOriginLabel"] = rng.integers(-1, 8, (n_jets, 20))
+        with h5py.File(self.fname, "w") as f:
+            f.create_dataset("jets", data=jets)
+            f.create_dataset("tracks", data=tracks)
+        self.jets = jets
+        self.tracks = tracks
+        self.flavours = [Flavours.bjets, Flavours.cjets, Flavours.ujets]
+        self.track_origin_dict = {"All": range(8), "HF decay": [3, 4, 5], "Others": [0, 7]}
+        self.pt_bins = np.linspace(20_000, 250_000, 6)
+
+    def tearDown(self):
+        """Remove the dummy file."""
+        self.tmp_dir.cleanup()
+
+    def _moments(self, num_jets=None):
+        """Get the moments with small batches.
+
+        Parameters
+        ----------
+        num_jets : int, optional
+            Maximum number of jets per flavour
+
+        Returns
+        -------
+        tuple
+            Number of jets and sums of the number of tracks and its square
+        """
+        return _track_origin_moments(
+            reader=H5Reader(self.fname, batch_size=128, shuffle=False),
+            flavour_list=self.flavours,
+            track_origin_dict=self.track_origin_dict,
+            pt_bins=self.pt_bins,
+            jet_pt_variable="pt",
+            flavour_label_variable="HadronConeExclTruthLabelID",
+            tracks_name="tracks",
+            track_truth_variable="ftagTruthOriginLabel",
+            num_jets=num_jets,
+        )
+
+    def _expected(self, num_jets=None):
+        """Calculate the moments with a loop over the bins.
+
+        Parameters
+        ----------
+        num_jets : int, optional
+            Maximum number of jets per flavour
+
+        Returns
+        -------
+        tuple
+            Number of jets and sums of the number of tracks and its square
+        """
+        pt = self.jets["pt"]
+        in_range = (pt > self.pt_bins[0]) & (pt < self.pt_bins[-1])
+        bin_idx = np.digitize(pt, self.pt_bins) - 1
+        shape = (len(self.flavours), len(self.track_origin_dict), len(self.pt_bins) - 1)
+        n_jets, n_sum, n_sum_sq = np.zeros(shape[::2]), np.zeros(shape), np.zeros(shape)
+        for i, flavour in enumerate(self.flavours):
+            is_flavour = np.zeros(len(pt), dtype=bool)
+            is_flavour[flavour.cuts(self.jets).idx] = True
+            selected = np.nonzero(in_range & is_flavour)[0][:num_jets]
+            for j, origins in enumerate(self.track_origin_dict.values()):
+                n_trks = np.isin(self.tracks["ftagTruthOriginLabel"][selected], origins).sum(axis=1)
+                for k in range(shape[2]):
+                    in_bin = bin_idx[selected] == k
+                    n_jets[i, k] = in_bin.sum()
+                    n_sum[i, j, k] = n_trks[in_bin].sum()
+                    n_sum_sq[i, j, k] = (n_trks[in_bin] ** 2).sum()
+        return n_jets, n_sum, n_sum_sq
+
+    def test_moments(self):
+        """Test the sums against a per-bin calculation."""
+        for actual, expected in zip(self._moments(), self._expected()):
+            np.testing.assert_array_equal(actual, expected)
+
+    def test_moments_num_jets(self):
+        """Test the maximum number of jets per flavour across batches."""
+        actual = self._moments(num_jets=150)
+        np.testing.assert_array_equal(actual[0].sum(axis=1), [150, 150, 150])
+        for actual_array, expected in zip(actual, self._expected(num_jets=150)):
+            np.testing.assert_array_equal(actual_array, expected)
@@ -8,12 +8,14 @@ import unittest
 from dataclasses import dataclass, field, fields, is_dataclass
 from pathlib import Path
 from typing import Any
+from unittest.mock import patch
 
 import h5py
 import numpy as np
 from ftag import Flavours, get_mock_file
 from ftag.hdf5 import structured_from_dict
 
+from puma.bundle import PlotBundle, render
 from puma.histogram import Histogram, HistogramPlot
 from puma.hlplots import Results, separate_kwargs
 from puma.hlplots.tagger import Tagger
@@ -277,6 +279,22 @@ class ResultsPlotsTestCase(unittest.TestCase):
                 assert fpath.is_file()
             results.saved_plots = []
 
+    def test_working_point_table(self):
+        """Test the working point table against percentiles and written csv file."""
+        self.dummy_tagger_1.fxs = {"fc": 0.05, "fu": 0.95}
+        with tempfile.TemporaryDirectory() as tmp_file:
+            results = Results(signal="bjets", sample="test", output_dir=tmp_file)
+            results.add(self.dummy_tagger_1)
+            table = results.working_point_table([0.6, 0.7], path=Path(tmp_file) / "wps.csv")
+            assert (Path(tmp_file) / "wps.csv").is_file()
+        discs = self.dummy_tagger_1.discriminant("bjets")
+        np.testing.assert_allclose(
+            table["cut"],
+            np.percentile(discs[self.dummy_tagger_1.is_flav("bjets")], [40, 30]),
+            rtol=1e-6,
+        )
+        self.assertEqual(list(table.columns), ["tagger", "eff", "cut", "ujets_rej", "cjets_rej"])
+
     def test_plot_roc_bjets(self):
         """Test that png file is being created."""
         self.dummy_tagger_1.reference = True
@@ -301,6 +319,107 @@ class ResultsPlotsTestCase(unittest.TestCase):
                 assert fpath.is_file()
             results.saved_plots = []
 
+    def test_save_multiple_extensions(self):
+        """Test that each plot is saved in all formats."""
+        self.dummy_tagger_1.reference = True
+        self.dummy_tagger_1.fxs = {"fc": 0.05, "fu": 0.95}
+        with tempfile.TemporaryDirectory() as tmp_file:
+            results = Results(
+                signal="bjets",
+                sample="test",
+                output_dir=tmp_file,
+                extension=["pdf", "png"],
+                dpi=[400, 100],
+            )
+            results.add(self.dummy_tagger_1)
+            results.plot_rocs()
+            self.assertEqual([fpath.suffix for fpath in results.saved_plots], [".pdf", ".png"])
+            for fpath in results.saved_plots:
+                assert fpath.is_file()
+
+    def test_save_in_background(self):
+        """Test that the plots saved in the background are written after the flush."""
+        self.dummy_tagger_1.reference = True
+        self.dummy_tagger_1.fxs = {"fc": 0.05, "fu": 0.95}
+        with tempfile.TemporaryDirectory() as tmp_file:
+            results = Results(
+                signal="bjets",
+                sample="test",
+                output_dir=tmp_file,
+                extension="png",
+                save_in_background=True,
+            )
+            results.add(self.dummy_tagger_1)
+            results.plot_rocs()
+            results.plot_discs(bins=40, bins_range=(-2, 15))
+            results.flush()
+            self.assertEqual(len(results.saved_plots), 2)
+            for fpath in results.saved_plots:
+                assert fpath.is_file()
+
+    def test_save_bundle_error(self):
+        """Test that the plots are saved even if their bundle cannot be stored."""
+        self.dummy_tagger_1.reference = True
+        with tempfile.TemporaryDirectory() as tmp_file:
+            results = Results(signal="bjets", sample="test", output_dir=tmp_file, save_bundles=True)
+            results.add(self.dummy_tagger_1)
+            with (
+                patch.object(PlotBundle, "save", side_effect=TypeError("not serialisable")),
+                self.assertLogs("puma", "WARNING") as logs,
+            ):
+                results.plot_probs(bins=40, bins_range=(0, 1))
+            self.assertTrue(results.saved_plots)
+            for fpath in results.saved_plots:
+                self.assertTrue(fpath.is_file())
+            self.assertTrue(any("not serialisable" in line for line in logs.output))
+
+    def test_save_bundles(self):
+        """Test that all plots are saved as bundles which can be rendered."""
+        self.dummy_tagger_1.reference = True
+        self.dummy_tagger_1.fxs = {"fc": 0.05, "fu": 0.95}
+        rng = np.random.default_rng(seed=16)
+        self.dummy_tagger_1.perf_vars = {
+            "pt": rng.exponential(100, size=len(self.dummy_tagger_1.scores))
+        }
+        with tempfile.TemporaryDirectory() as tmp_file:
+            results = Results(signal="bjets", sample="test", output_dir=tmp_file, save_bundles=True)
+            results.add(self.dummy_tagger_1)
+            results.plot_probs(bins=40, bins_range=(0, 1))
+            results.plot_discs(bins=40, bins_range=(-2, 15), wp_vlines=[60])
+            results.plot_rocs()
+            results.plot_var_perf(bins=[20, 30, 40, 60, 85, 110, 140, 175, 250], working_point=0.7)
+            results.plot_fraction_scans(backgrounds_to_plot=["cjets", "ujets"], rej=False)
+
+            bundles = sorted(Path(tmp_file).rglob("*.bundle.json"))
+            self.assertEqual(len(bundles), len(results.saved_plots))
+            for fpath in results.saved_plots:
+                fpath.unlink()
+            for bundle in bundles:
+                render(bundle, atlas_second_tag="Restyled")
+            for fpath in results.saved_plots:
+                self.assertTrue(fpath.is_file())
+
+    def test_plot_var_perf_stores_working_point(self):
+        """Test that the curves keep the working point of the cached inclusive cut."""
+        self.dummy_tagger_1.reference = True
+        rng = np.random.default_rng(seed=16)
+        self.dummy_tagger_1.perf_vars = {
+            "pt": rng.exponential(100, size=len(self.dummy_tagger_1.scores))
+        }
+        with tempfile.TemporaryDirectory() as tmp_file:
+            results = Results(signal="bjets", sample="test", output_dir=tmp_file)
+            results.add(self.dummy_tagger_1)
+            with patch.object(Results, "save", autospec=True) as mock_save:
+                results.plot_var_perf(
+                    bins=[20, 30, 40, 60, 85, 110, 140, 175, 250], working_point=0.7
+                )
+        cut = self.dummy_tagger_1.working_points(results.signal, 0.7)["cut"].iloc[0]
+        for call in mock_save.call_args_list:
+            for curve in call.args[1].plot_objects.values():
+                self.assertEqual(curve.working_point, 0.7)
+                self.assertEqual(curve.args_to_store["working_point"], 0.7)
+                np.testing.assert_allclose(curve.disc_cut, cut)
+
     def test_plot_var_perf_err(self):
         """Tests the performance plots throws errors with invalid inputs."""
         self.dummy_tagger_1.reference = True
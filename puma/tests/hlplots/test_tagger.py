@@ -5,6 +5,7 @@ from __future__ import annotations
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 import h5py
 import numpy as np
@@ -67,6 +68,20 @@ class TaggerBasisTestCase(unittest.TestCase):
             self.assertEqual(tagger.n_jets("bjets"), 15)
         assert np.sum(tagger.is_flav("ujets")) == 3160
 
+    def test_flavour_index_cache(self):
+        """Test that flavour indices are cached and reset when labels are set."""
+        tagger = Tagger("dummy", output_flavours=["ujets", "cjets", "bjets"])
+        labels = np.concatenate([np.zeros(80), np.ones(5) * 4, np.ones(15) * 5])
+        tagger.labels = np.array(labels, dtype=[("HadronConeExclTruthLabelID", "i4")])
+        idx = tagger.is_flav("bjets")
+        self.assertIs(tagger.is_flav("bjets"), idx)
+        self.assertFalse(idx.flags.writeable)
+        np.testing.assert_array_equal(idx, np.arange(85, 100))
+
+        tagger.labels = np.array(labels[::-1], dtype=[("HadronConeExclTruthLabelID", "i4")])
+        np.testing.assert_array_equal(tagger.is_flav("bjets"), np.arange(15))
+        self.assertEqual(tagger.n_jets("ujets"), 80)
+
 
 class TaggerScoreExtractionTestCase(unittest.TestCase):
     """Test extract_tagger_scores function in Tagger class."""
@@ -195,6 +210,71 @@ class TaggerTestCase(unittest.TestCase):
         discs = tagger.discriminant("hbb")
         np.testing.assert_array_almost_equal(discs, np.ones([10]) * 0.693147)
 
+    def test_disc_label_flavour(self):
+        """Test disc calculation for jets of a single truth flavour."""
+        tagger = Tagger("dummy", output_flavours=["ujets", "cjets", "bjets"])
+        rng = np.random.default_rng(42)
+        tagger.scores = u2s(
+            rng.dirichlet(np.ones(3), size=10).astype("f4"),
+            dtype=[("dummy_pu", "f4"), ("dummy_pc", "f4"), ("dummy_pb", "f4")],
+        )
+        tagger.labels = np.array(
+            np.repeat([0, 4, 5], [3, 3, 4]), dtype=[("HadronConeExclTruthLabelID", "i4")]
+        )
+        np.testing.assert_array_equal(
+            tagger.discriminant("bjets", label_flavour="cjets"),
+            tagger.discriminant("bjets")[tagger.is_flav("cjets")],
+        )
+
+    def test_disc_scan(self):
+        """Test that the disc scan reuses its output and matches single evaluations."""
+        tagger = Tagger("dummy", output_flavours=["ujets", "cjets", "bjets"])
+        rng = np.random.default_rng(42)
+        tagger.scores = u2s(
+            rng.dirichlet(np.ones(3), size=10).astype("f4"),
+            dtype=[("dummy_pu", "f4"), ("dummy_pc", "f4"), ("dummy_pb", "f4")],
+        )
+        fxs_list = [{"fc": fc, "fu": 1 - fc} for fc in (0.1, 0.5, 0.9)]
+        outputs = []
+        for fxs, discs in zip(fxs_list, tagger.discriminant_scan("bjets", fxs_list)):
+            np.testing.assert_array_equal(discs, tagger.discriminant("bjets", fxs=fxs))
+            outputs.append(discs)
+        self.assertIs(outputs[0], outputs[-1])
+
+    def test_working_points(self):
+        """Test working point cuts and rejections against percentile and ftag."""
+        from ftag.utils import calculate_rejection
+
+        tagger = Tagger("dummy", output_flavours=["ujets", "cjets", "bjets"])
+        rng = np.random.default_rng(42)
+        tagger.scores = u2s(
+            rng.dirichlet(np.ones(3), size=1000),
+            dtype=[("dummy_pu", "f8"), ("dummy_pc", "f8"), ("dummy_pb", "f8")],
+        )
+        tagger.labels = np.array(
+            rng.choice([0, 4, 5], size=1000), dtype=[("HadronConeExclTruthLabelID", "i4")]
+        )
+        effs = [0.6, 0.7, 0.77, 0.85]
+        table = tagger.working_points("bjets", effs)
+        discs = tagger.discriminant("bjets")
+        sig_discs = discs[tagger.is_flav("bjets")]
+        np.testing.assert_allclose(table["cut"], np.percentile(sig_discs, [40, 30, 23, 15]))
+        for flav in ("ujets", "cjets"):
+            np.testing.assert_allclose(
+                table[f"{flav}_rej"],
+                calculate_rejection(sig_discs, discs[tagger.is_flav(flav)], np.array(effs)),
+            )
+
+        # The sorted discriminants are cached per signal and fraction values
+        with mock.patch.object(tagger, "discriminant", wraps=tagger.discriminant) as disc:
+            tagger.working_points("bjets", 0.5)
+            self.assertEqual(disc.call_count, 0)
+            tagger.working_points("bjets", 0.5, fxs={"fc": 0.5, "fu": 0.5})
+            self.assertEqual(disc.call_count, 1)
+            tagger.labels = tagger.labels[::-1]
+            tagger.working_points("bjets", 0.5)
+            self.assertEqual(disc.call_count, 2)
+
 
 class TaggerAuxTaskTestCase(unittest.TestCase):
     """Test class for aux task functionality in Tagger class."""
@@ -215,6 +295,27 @@ class TaggerAuxTaskTestCase(unittest.TestCase):
         tagger = Tagger("dummy", aux_tasks=["track_origin"])
         self.assertEqual(tagger.aux_variables["track_origin"], "dummy_aux_TrackOrigin")
 
+    def test_vertex_indices_cache(self):
+        """Test that cleaned vertex indices are cached per incl_vertexing flag."""
+        tagger = Tagger("dummy", aux_tasks=["vertexing", "track_origin"])
+        tagger.aux_labels["vertexing"] = np.array([[0, 1, 1, 2, 2, -1]])
+        tagger.aux_labels["track_origin"] = np.array([[2, 3, 3, 4, 4, -1]])
+        tagger.aux_scores["vertexing"] = np.array([[0, 1, 1, 2, 2, -1]])
+        tagger.aux_scores["track_origin"] = np.array([[2, 3, 3, 4, 4, -1]])
+
+        truth_excl, reco_excl = tagger.vertex_indices()
+        np.testing.assert_array_equal(truth_excl, [[-99, 1, 1, 2, 2, -99]])
+        np.testing.assert_array_equal(reco_excl, [[-99, 1, 1, 2, 2, -99]])
+        self.assertIs(tagger.vertex_indices()[0], truth_excl)
+
+        truth_incl, _ = tagger.vertex_indices(incl_vertexing=True)
+        np.testing.assert_array_equal(truth_incl, [[-99, 3, 3, 3, 3, -99]])
+        self.assertIs(tagger.vertex_indices()[0], truth_excl)
+
+        # New input arrays are cleaned again
+        tagger.aux_labels["vertexing"] = np.array([[0, 1, 1, 1, 2, -1]])
+        self.assertIsNot(tagger.vertex_indices()[0], truth_excl)
+
     def test_aux_variables_undefined(self):
         """Test undefined aux task variable retrieval."""
         tagger = Tagger("dummy", aux_tasks=["dummy"])
@@ -258,3 +359,16 @@ class TaggerProbsTestCase(unittest.TestCase):
         np.testing.assert_array_equal(
             self.tagger.probs(prob_flavour, label_flavour), expected_probs
         )
+
+    def test_probs_contiguous_column(self):
+        """Test that per-flavour probabilities are gathered from a contiguous column."""
+        probs = self.tagger.probs("bjets", "ujets")
+        self.assertTrue(probs.flags.c_contiguous)
+        self.assertIs(self.tagger.score_column("dummy_pb"), self.tagger.score_column("dummy_pb"))
+
+        # Reassigning the scores resets the cached columns
+        self.tagger.scores = u2s(
+            np.zeros((10, 3)),
+            dtype=[("dummy_pu", "f4"), ("dummy_pc", "f4"), ("dummy_pb", "f4")],
+        )
+        np.testing.assert_array_equal(self.tagger.probs("bjets", "ujets"), np.zeros(10))
@@ -203,3 +203,65 @@ class TestYumaPlots(unittest.TestCase):
             btag_plots = [p.name for p in btagging.rglob("*.pdf")]
             print(btag_plots)
             assert len(btag_plots) == 3, f"Expected 3 b-tagging plot, found {len(btag_plots)}"
+
+    def testParallelPlots(self):
+        plt_cfg, taggers = load_no_include(EXAMPLES / "plt_cfg.yaml", EXAMPLES / "taggers.yaml")
+
+        with tempfile.TemporaryDirectory() as tmp_file:
+            fpath1, _file = get_mock_file(fname=(Path(tmp_file) / "file1.h5").as_posix())
+            for tagger in ("dummy1", "dummy2", "dummy3"):
+                taggers[tagger]["sample_path"] = fpath1
+            plt_cfg["taggers_config"] = taggers
+            plt_cfg["plots"] = {key: plt_cfg["plots"][key] for key in ("roc", "disc", "probs")}
+
+            saved_plots = {}
+            for jobs in (1, 3):
+                plt_cfg["plot_dir"] = f"{tmp_file}/plots_{jobs}"
+                updated_plt_cfg = Path(tmp_file) / "plt_cfg.yaml"
+                with open(updated_plt_cfg, "w") as f:
+                    yaml.dump(plt_cfg, f)
+
+                yuma = YumaConfig.load_config(updated_plt_cfg)
+                yuma.signal = "bjets"
+                yuma.get_results()
+                yuma.make_plots(["roc", "disc", "probs"], jobs=jobs)
+                plot_dir = Path(plt_cfg["plot_dir"])
+                saved_plots[jobs] = [p.relative_to(plot_dir) for p in yuma.results.saved_plots]
+                assert all(p.exists() for p in yuma.results.saved_plots)
+
+            assert len(saved_plots[1]) > 3
+            assert saved_plots[1] == saved_plots[3]
+
+    def testBackgroundSaving(self):
+        plt_cfg, taggers = load_no_include(EXAMPLES / "plt_cfg.yaml", EXAMPLES / "taggers.yaml")
+
+        with tempfile.TemporaryDirectory() as tmp_file:
+            fpath1, _file = get_mock_file(fname=(Path(tmp_file) / "file1.h5").as_posix())
+            for tagger in ("dummy1", "dummy2", "dummy3"):
+                taggers[tagger]["sample_path"] = fpath1
+            plt_cfg["taggers_config"] = taggers
+            plt_cfg["results_config"]["save_in_background"] = True
+            plt_cfg["plots"] = {key: plt_cfg["plots"][key] for key in ("roc", "disc")}
+
+            for jobs in (1, 2):
+                plt_cfg["plot_dir"] = f"{tmp_file}/plots_{jobs}"
+                updated_plt_cfg = Path(tmp_file) / "plt_cfg.yaml"
+                with open(updated_plt_cfg, "w") as f:
+                    yaml.dump(plt_cfg, f)
+
+                yuma = YumaConfig.load_config(updated_plt_cfg)
+                yuma.signal = "bjets"
+                yuma.get_results()
+                yuma.make_plots(["roc", "disc"], jobs=jobs)
+                assert len(yuma.results.saved_plots) > 1
+                assert all(p.exists() for p in yuma.results.saved_plots)
+
+    def testInvalidJobs(self):
+        yuma = YumaConfig(
+            config_path=Path("plt_cfg.yaml"),
+            plot_dir=Path("plots"),
+            results_config={},
+            taggers_config={},
+        )
+        with self.assertRaises(ValueError):
+            yuma.make_plots(["roc"], jobs=0)
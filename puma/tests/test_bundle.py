@@ -0,0 +1,147 @@
+"""Unit test script for the functions in bundle.py."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from matplotlib import pyplot as plt
+from matplotlib.colors import ListedColormap
+from matplotlib.testing.compare import compare_images
+
+from puma import Histogram, HistogramPlot, Line2D, Line2DPlot, Roc, RocPlot
+from puma.bundle import PlotBundle, render
+from puma.matshow import MatshowPlot
+from puma.plot_base import import_class
+from puma.utils import logger, set_log_level
+
+set_log_level(logger, "DEBUG")
+
+
+class PlotBundleTestCase(unittest.TestCase):
+    """Test class for the puma.bundle functions."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.tmp = Path(self.tmp_dir.name)
+        rng = np.random.default_rng(seed=42)
+        self.values = [rng.normal(size=1000), rng.normal(0.5, size=1000)]
+        self.bins = np.linspace(-3, 3, 21)
+        sig_eff = np.linspace(0.49, 1, 20)
+        self.rocs = [
+            Roc(sig_eff, scale / (1.01 - sig_eff), n_test=1000, rej_class="ujets", label=label)
+            for scale, label in ((1, "tagger 1"), (2, "tagger 2"))
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assert_same_render(self, plot, bundle_path: Path):
+        """Assert that the plot rendered from a bundle is identical to the plot.
+
+        Parameters
+        ----------
+        plot : PlotBase
+            Drawn plot
+        bundle_path : Path
+            Path the bundle is written to
+        """
+        plot.savefig(self.tmp / "plot.png", dpi=50)
+        plot.bundle().save(bundle_path)
+        render(bundle_path, self.tmp / "rendered.png", dpi=50)
+        self.assertIsNone(compare_images(self.tmp / "plot.png", self.tmp / "rendered.png", tol=0))
+
+    def test_roc_plot(self):
+        """Test that a roc plot with a ratio panel is rendered identically."""
+        plot = RocPlot(n_ratio_panels=1, ylabel="Background rejection")
+        plot.add_roc(self.rocs[0], reference=True)
+        plot.add_roc(self.rocs[1])
+        plot.set_ratio_class(1, "ujets")
+        plot.draw()
+        for suffix in (".json", ".yaml"):
+            with self.subTest(suffix=suffix):
+                self.assert_same_render(plot, self.tmp / f"roc{suffix}")
+
+    def test_histogram_plot(self):
+        """Test that calls after drawing are replayed."""
+        plot = HistogramPlot(n_ratio_panels=1, bin_width_in_ylabel=True, ylabel="Entries")
+        plot.add(Histogram(self.values[0], bins=self.bins, flavour="bjets"), reference=True)
+        plot.add(Histogram(self.values[1], bins=self.bins, flavour="ujets"))
+        plot.draw()
+        plot.draw_vlines([np.float64(0.5)], labels=["cut"])
+        self.assert_same_render(plot, self.tmp / "hist.json")
+
+    def test_recorded_calls(self):
+        """Test that only the outer calls are recorded, without the data."""
+        plot = Line2DPlot(xlabel="x")
+        plot.add(Line2D(np.arange(5.0), np.arange(5.0) ** 2))
+        plot.ylabel = "y"
+        plot.draw()
+        bundle = plot.bundle(plot_name="line.pdf")
+        self.assertEqual(bundle.plot_class, "puma.line_plot_2d:Line2DPlot")
+        self.assertEqual(bundle.kwargs, {"xlabel": "x"})
+        self.assertEqual([call[0] for call in bundle.calls], ["add", "__setattr__", "draw"])
+        self.assertEqual(bundle.plot_name, "line.pdf")
+
+    def test_overrides(self):
+        """Test that plot kwargs override the stored ones, also if set after init."""
+        plot = Line2DPlot(atlas_second_tag="Old tag")
+        plot.add(Line2D(np.arange(5.0), np.arange(5.0) ** 2))
+        plot.xlabel = "Old label"
+        plot.draw()
+        rendered = plot.bundle().render(
+            atlas_second_tag="New tag", xlabel="New label", figsize=(6, 5)
+        )
+        self.assertEqual(rendered.atlas_second_tag, "New tag")
+        self.assertEqual(rendered.xlabel, "New label")
+        np.testing.assert_array_equal(rendered.fig.get_size_inches(), [6, 5])
+
+    def test_line_object_round_trip(self):
+        """Test that the line objects are stored with the style arguments."""
+        plot = RocPlot(n_ratio_panels=0)
+        plot.add_roc(self.rocs[0])
+        plot.bundle().save(self.tmp / "roc.json")
+        rendered = PlotBundle.load(self.tmp / "roc.json").render()
+        roc = next(iter(rendered.rocs.values()))
+        self.assertEqual(roc.label, "tagger 1")
+        np.testing.assert_array_equal(roc.bkg_rej, self.rocs[0].bkg_rej)
+
+    def test_matshow_colormap(self):
+        """Test that plots with registered and custom colormaps are rendered identically."""
+        matrix = np.random.default_rng(seed=42).random((3, 4))
+        custom = ListedColormap(["white", "tab:blue", "tab:orange"], name="custom")
+        for name, colormap in (("registered", plt.cm.PiYG), ("custom", custom)):
+            plot = MatshowPlot(colormap=colormap)
+            plot.draw(matrix)
+            for suffix in (".json", ".yaml"):
+                with self.subTest(colormap=name, suffix=suffix):
+                    self.assert_same_render(plot, self.tmp / f"matshow{suffix}")
+
+    def test_save_unsupported_value(self):
+        """Test that unsupported values raise a TypeError without writing a file."""
+        bundle = PlotBundle(plot_class="puma.roc:RocPlot", kwargs={"title": object()})
+        for suffix in (".json", ".yaml"):
+            path = self.tmp / f"roc{suffix}"
+            with self.subTest(suffix=suffix), self.assertRaises(TypeError):
+                bundle.save(path)
+            self.assertFalse(path.exists())
+
+    def test_save_wrong_extension(self):
+        """Test that an unknown file extension raises a ValueError."""
+        with self.assertRaises(ValueError):
+            RocPlot(n_ratio_panels=0).bundle().save(self.tmp / "roc.txt")
+
+    def test_load_wrong_version(self):
+        """Test that bundles with another version are rejected."""
+        path = self.tmp / "roc.json"
+        path.write_text('{"version": 0, "plot_class": "puma.roc:RocPlot"}')
+        with self.assertRaises(ValueError):
+            PlotBundle.load(path)
+
+    def test_import_class_wrong_base(self):
+        """Test that only subclasses of the given base are imported."""
+        with self.assertRaises(TypeError):
+            PlotBundle(plot_class="puma.roc:Roc").render()
+        self.assertIs(import_class("puma.roc:RocPlot", RocPlot), RocPlot)
@@ -0,0 +1,63 @@
+"""Unit test script for the lazy imports of the puma package."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import unittest
+
+import puma
+import puma.hlplots
+import puma.utils
+
+
+class LazyImportTestCase(unittest.TestCase):
+    """Test class for the lazy imports."""
+
+    def _imported_modules(self, module: str, modules: list[str]) -> list[str]:
+        """Import a module in a fresh interpreter.
+
+        Parameters
+        ----------
+        module : str
+            Module to import
+        modules : list[str]
+            Modules to check for
+
+        Returns
+        -------
+        list[str]
+            Modules in `modules` which were imported
+        """
+        code = f"import sys, {module}; print(','.join(m for m in {modules!r} if m in sys.modules))"
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        return [name for name in result.stdout.strip().split(",") if name]
+
+    def test_no_heavy_imports(self):
+        """Test that the package and the utils do not import plotting or IO libraries."""
+        heavy = ["matplotlib.pyplot", "pandas", "ftag.hdf5", "IPython", "tkinter"]
+        for module in ("puma", "puma.utils", "puma.hlplots", "puma.hlplots.yuma"):
+            with self.subTest(module=module):
+                self.assertEqual(self._imported_modules(module, heavy), [])
+
+    def test_no_gui_imports(self):
+        """Test that the plot base does not import the GUI and notebook libraries."""
+        self.assertEqual(self._imported_modules("puma.plot_base", ["IPython", "tkinter"]), [])
+
+    def test_lazy_attributes(self):
+        """Test that the public objects are available from the packages."""
+        from puma.roc import RocPlot
+
+        self.assertIs(puma.RocPlot, RocPlot)
+        self.assertIn("RocPlot", dir(puma))
+        for name in puma.hlplots.__all__:
+            self.assertTrue(callable(getattr(puma.hlplots, name)))
+        self.assertTrue(callable(puma.utils.get_dummy_2_taggers))
+
+    def test_unknown_attribute(self):
+        """Test that unknown attributes raise an AttributeError."""
+        for module in (puma, puma.hlplots, puma.utils):
+            with self.subTest(module=module.__name__), self.assertRaises(AttributeError):
+                _ = module.does_not_exist
@@ -262,3 +262,13 @@ class Line2DPlotTestCase(unittest.TestCase):
                 is_marker=True,
                 key=1,
             )
+
+    def test_decimated_line(self):
+        """Test that only lines without markers are decimated."""
+        plot = Line2DPlot(decimate_tolerance=1e-3)
+        plot.add(Line2D(x_values=self.x_values, y_values=self.y_values))
+        plot.add(Line2D(x_values=self.x_values, y_values=self.y_values, marker="o"))
+        plot.draw()
+        lines = plot.axis_top.get_lines()
+        np.testing.assert_array_equal(lines[0].get_xdata(), self.x_values[[0, -1]])
+        self.assertEqual(len(lines[1].get_xdata()), len(self.x_values))
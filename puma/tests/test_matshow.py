@@ -242,3 +242,28 @@ class TestMatshowPlot(unittest.TestCase):
                 tol=1,
             )
         )
+
+    def test_max_entries(self):
+        """Test that the entries of large matrices are not written."""
+        mat = np.random.default_rng(42).random((10, 10))
+        for max_entries, n_texts in ((None, 100), (100, 100), (99, 0)):
+            plot_mat = MatshowPlot(max_entries=max_entries, apply_atlas_style=False)
+            plot_mat.draw(mat)
+            self.assertEqual(len(plot_mat.axis_top.texts), n_texts)
+
+    def test_matrix_comparison_collection(self):
+        """Test that the triangles are drawn as one collection in the drawing order."""
+        mat1 = np.arange(6.0).reshape(2, 3)
+        plot_matrix_comp = MatrixComparison(apply_atlas_style=False, max_entries=4)
+        plot_matrix_comp.draw(mat1, mat1 + 6)
+        ax = plot_matrix_comp.axis_top
+        self.assertEqual(len(ax.patches), 0)
+        self.assertEqual(len(ax.texts), 0)
+        (triangles,) = ax.collections
+        paths = triangles.get_paths()
+        self.assertEqual(len(paths), 12)
+        # Upper and lower triangle of the cell in the first row, second column
+        np.testing.assert_array_equal(paths[2].vertices[:3], [[2, 1], [1, 1], [2, 0]])
+        np.testing.assert_array_equal(paths[3].vertices[:3], [[1, 0], [2, 0], [1, 1]])
+        colors = plot_matrix_comp.colormap(np.linspace(0, 1, 12))
+        np.testing.assert_allclose(triangles.get_facecolor()[[0, 1]], colors[[0, 6]])
@@ -2,14 +2,36 @@
 
 from __future__ import annotations
 
+import os
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
+from pathlib import Path
 from unittest.mock import ANY, MagicMock, patch
 
+import matplotlib as mpl
+from matplotlib import rc_context
 from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
 from matplotlib.lines import Line2D
-
-from puma.plot_base import PlotBase, PlotLineObject, PlotObject
+from matplotlib.testing.compare import compare_images
+
+from puma.plot_base import (
+    PlotBase,
+    PlotLineObject,
+    PlotObject,
+    SaveQueue,
+    clear_figure_templates,
+    flush_save_queue,
+    get_render_mode,
+    get_save_queue,
+    set_render_mode,
+    set_save_queue,
+    use_render_mode,
+)
 from puma.utils import logger, set_log_level
 
 set_log_level(logger, "DEBUG")
@@ -65,6 +87,13 @@ class PlotObjectTestCase(unittest.TestCase):
         with self.assertRaises(ValueError):
             plot_object.set_ratio_label(ratio_panel=3, label="Label")
 
+    def test_invalid_decimation(self):
+        """Test that the decimation tolerance and rasterisation threshold are positive."""
+        with self.assertRaises(ValueError):
+            PlotObject(decimate_tolerance=0)
+        with self.assertRaises(ValueError):
+            PlotObject(rasterise_threshold=-1)
+
 
 class PlotLineObjectTestCase(unittest.TestCase):
     """Test class for the puma.PlotLineObject dataclass."""
@@ -145,6 +174,58 @@ class TestPlotBase(unittest.TestCase):
         # No ratio axes created in vertical split
         self.assertEqual(len(self.plot_base.ratio_axes), 0)
 
+    @patch("puma.plot_base.Figure", wraps=Figure)
+    def test_figure_templates(self, mock_figure):
+        """Test that plots with the same layout get copies of one template."""
+        clear_figure_templates()
+        plots = [PlotBase(n_ratio_panels=2, grid=True) for _ in range(3)]
+        for plot in plots:
+            plot.initialise_figure()
+
+        mock_figure.assert_called_once()
+        first, second = plots[0], plots[1]
+        self.assertIsNot(first.fig, second.fig)
+        self.assertEqual(second.fig.axes, [second.axis_top, *second.ratio_axes])
+        self.assertTrue(
+            second.axis_top.get_shared_x_axes().joined(second.axis_top, second.ratio_axes[1])
+        )
+        self.assertFalse(
+            second.axis_top.get_shared_x_axes().joined(first.axis_top, second.axis_top)
+        )
+        self.assertEqual(
+            [label.get_visible() for label in second.ratio_axes[0].get_xticklabels()],
+            [label.get_visible() for label in first.ratio_axes[0].get_xticklabels()],
+        )
+
+        # Artists drawn on one plot do not show up on the next one
+        first.axis_top.plot([0, 1], [0, 1])
+        third = PlotBase(n_ratio_panels=2, grid=True)
+        third.initialise_figure()
+        self.assertEqual(len(third.axis_top.lines), 0)
+
+    def test_figure_templates_layout(self):
+        """Test that the template is chosen by the layout of the plot."""
+        clear_figure_templates()
+        for vertical_split in (False, True, False):
+            plot = PlotBase(n_ratio_panels=1, vertical_split=vertical_split, figsize=(5, 4))
+            plot.initialise_figure()
+            self.assertEqual(len(plot.fig.axes), 2)
+            self.assertEqual(tuple(plot.fig.get_size_inches()), (5, 4))
+            self.assertEqual(plot.axis_leg is not None, vertical_split)
+            self.assertEqual(len(plot.ratio_axes), 0 if vertical_split else 1)
+
+    def test_figure_templates_rc_params(self):
+        """Test that the templates are rebuilt if the rcParams changed."""
+        clear_figure_templates()
+        PlotBase().initialise_figure()
+        with rc_context({"axes.facecolor": "red"}):
+            plot = PlotBase()
+            plot.initialise_figure()
+        self.assertEqual(plot.axis_top.get_facecolor(), (1.0, 0.0, 0.0, 1.0))
+        plot = PlotBase()
+        plot.initialise_figure()
+        self.assertEqual(plot.axis_top.get_facecolor(), (1.0, 1.0, 1.0, 1.0))
+
     def test_set_xlim(self):
         """Test set_xlim sets correct x-limits."""
         self.plot_base.initialise_figure()
@@ -204,7 +285,7 @@ class TestPlotBase(unittest.TestCase):
         self.assertEqual(len(lines_in_ratio), 2)
 
     @patch("puma.plot_base.PlotBase.is_running_in_jupyter", return_value=True)
-    @patch("puma.plot_base.display")  # Patch IPython.display.display
+    @patch("IPython.display.display")
     def test_show_in_jupyter(self, mock_display, mock_jupyter):  # noqa:ARG002
         """
         Test show() in Jupyter environment.
@@ -214,8 +295,8 @@ class TestPlotBase(unittest.TestCase):
         self.plot_base.show()
         mock_display.assert_called_once_with(self.plot_base.fig)
 
-    @patch("puma.plot_base.FigureCanvasTkAgg")
-    @patch("puma.plot_base.tk.Tk")
+    @patch("matplotlib.backends.backend_tkagg.FigureCanvasTkAgg")
+    @patch("tkinter.Tk")
     @patch("puma.plot_base.PlotBase.is_running_in_jupyter", return_value=False)
     def test_show_in_tkinter(self, mock_jupyter, mock_tk, mock_canvas):  # noqa:ARG002
         """
@@ -253,6 +334,49 @@ class TestPlotBase(unittest.TestCase):
                 "test_plot.png", transparent=True, dpi=100, bbox_inches="tight", pad_inches=0.04
             )
 
+    def test_savefig_multiple_files(self):
+        """Test that several files are written with a single layout pass."""
+        self.plot_base.initialise_figure()
+        layout_engine = self.plot_base.fig.get_layout_engine()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            plot_names = [f"{tmp_dir}/plot.png", f"{tmp_dir}/plot.pdf", f"{tmp_dir}/plot_hd.png"]
+            with patch.object(
+                self.plot_base.fig,
+                "draw_without_rendering",
+                wraps=self.plot_base.fig.draw_without_rendering,
+            ) as mock_layout:
+                self.plot_base.savefig(plot_names, dpi=[50, None, 100])
+            mock_layout.assert_called_once()
+            for plot_name in plot_names:
+                self.assertTrue(Path(plot_name).is_file())
+        self.assertIs(self.plot_base.fig.get_layout_engine(), layout_engine)
+
+    def test_savefig_multiple_files_same_output(self):
+        """Test that a file is the same if written alone or together with others."""
+        self.plot_base.initialise_figure()
+        self.plot_base.axis_top.plot([1, 2, 3], [4, 5, 6], label="line")
+        self.plot_base.axis_top.legend()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.plot_base.savefig(f"{tmp_dir}/single.png", dpi=50)
+            self.plot_base.savefig([f"{tmp_dir}/multi.png", f"{tmp_dir}/multi.pdf"], dpi=50)
+            self.assertIsNone(
+                compare_images(f"{tmp_dir}/single.png", f"{tmp_dir}/multi.png", tol=0)
+            )
+
+    def test_savefig_wrong_number_of_dpis(self):
+        """Test that the number of DPIs must match the number of file names."""
+        self.plot_base.initialise_figure()
+        with self.assertRaises(ValueError):
+            self.plot_base.savefig(["plot.png", "plot.pdf"], dpi=[100])
+
+    def test_savefig_background(self):
+        """Test that the plot is written in a background thread."""
+        self.plot_base.initialise_figure()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            future = self.plot_base.savefig(f"{tmp_dir}/plot.png", dpi=50, background=True)
+            future.result()
+            self.assertTrue(Path(f"{tmp_dir}/plot.png").is_file())
+
     def test_set_title(self):
         """Test set_title sets the title on the top axis."""
         self.plot_base.initialise_figure()
@@ -327,7 +451,7 @@ class TestPlotBase(unittest.TestCase):
         it should return True (Jupyter Notebook or qtconsole).
         """
         plot_base = PlotBase()
-        with patch("puma.plot_base.get_ipython") as mock_get_ipython:
+        with patch("IPython.get_ipython") as mock_get_ipython:
             # Mock object with the right __class__.__name__
             mock_shell = MagicMock()
             mock_shell.__class__.__name__ = "ZMQInteractiveShell"
@@ -341,7 +465,7 @@ class TestPlotBase(unittest.TestCase):
         it should return False (IPython in a terminal, not a Jupyter Notebook).
         """
         plot_base = PlotBase()
-        with patch("puma.plot_base.get_ipython") as mock_get_ipython:
+        with patch("IPython.get_ipython") as mock_get_ipython:
             mock_shell = MagicMock()
             mock_shell.__class__.__name__ = "TerminalInteractiveShell"
             mock_get_ipython.return_value = mock_shell
@@ -354,7 +478,7 @@ class TestPlotBase(unittest.TestCase):
         so is_running_in_jupyter() should return False.
         """
         plot_base = PlotBase()
-        with patch("puma.plot_base.get_ipython") as mock_get_ipython:
+        with patch("IPython.get_ipython") as mock_get_ipython:
             mock_get_ipython.return_value = None
 
             self.assertFalse(plot_base.is_running_in_jupyter())
@@ -362,7 +486,7 @@ class TestPlotBase(unittest.TestCase):
     def test_unknown_shell(self):
         """If get_ipython() returns some unknown shell object, we default to False."""
         plot_base = PlotBase()
-        with patch("puma.plot_base.get_ipython") as mock_get_ipython:
+        with patch("IPython.get_ipython") as mock_get_ipython:
             mock_shell = MagicMock()
             mock_shell.__class__.__name__ = "SomeRandomShell"
             mock_get_ipython.return_value = mock_shell
@@ -375,7 +499,7 @@ class TestPlotBase(unittest.TestCase):
         is_running_in_jupyter() should return False.
         """
         plot_base = PlotBase()
-        with patch("puma.plot_base.get_ipython", side_effect=ImportError("No IPython")):
+        with patch("IPython.get_ipython", side_effect=ImportError("No IPython")):
             self.assertFalse(plot_base.is_running_in_jupyter())
 
     @patch("puma.plot_base.logger.debug")
@@ -410,3 +534,148 @@ class TestPlotBase(unittest.TestCase):
         self.plot_base.n_ratio_panels = 0
         with self.assertRaises(ValueError):
             self.plot_base.show()
+
+
+class RenderModeTestCase(unittest.TestCase):
+    """Test class for the batch render mode."""
+
+    def test_invalid_render_mode(self):
+        """Test unsupported render modes."""
+        with self.assertRaises(ValueError):
+            PlotObject(render_mode="gui")
+        with self.assertRaises(ValueError):
+            set_render_mode("gui")
+
+    def test_use_render_mode(self):
+        """Test the global render mode is restored after the context."""
+        self.assertEqual(get_render_mode(), "interactive")
+        with use_render_mode("batch"):
+            self.assertEqual(get_render_mode(), "batch")
+            self.assertTrue(PlotBase().batch_mode)
+            self.assertFalse(PlotBase(render_mode="interactive").batch_mode)
+        self.assertEqual(get_render_mode(), "interactive")
+        self.assertFalse(PlotBase().batch_mode)
+
+    def test_use_render_mode_keeps_backend(self):
+        """Test that the batch mode does not switch the matplotlib backend."""
+        backend = mpl.get_backend()
+        mpl.use("svg")
+        try:
+            with use_render_mode("batch"):
+                self.assertEqual(mpl.get_backend(), "svg")
+            self.assertEqual(mpl.get_backend(), "svg")
+        finally:
+            mpl.use(backend)
+
+    def test_invalid_render_mode_environment(self):
+        """Test that an invalid PUMA_RENDER_MODE falls back to the interactive mode."""
+        result = subprocess.run(
+            [sys.executable, "-c", "import puma.plot_base as p; print(p.get_render_mode())"],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PUMA_RENDER_MODE": "gui"},
+        )
+        self.assertEqual(result.stdout.strip(), "interactive")
+        self.assertIn("PUMA_RENDER_MODE=gui", result.stderr)
+
+    def test_batch_canvas(self):
+        """Test the figure is drawn with the Agg canvas in batch mode."""
+        plot_base = PlotBase(render_mode="batch")
+        plot_base.initialise_figure()
+        self.assertIsInstance(plot_base.fig.canvas, FigureCanvasAgg)
+
+    @patch("tkinter.Tk")
+    @patch("IPython.get_ipython")
+    def test_batch_show(self, mock_get_ipython, mock_tk):
+        """Test that show() neither uses IPython nor tkinter in batch mode."""
+        plot_base = PlotBase(render_mode="batch")
+        plot_base.initialise_figure()
+        self.assertFalse(plot_base.is_running_in_jupyter())
+        plot_base.show()
+        mock_get_ipython.assert_not_called()
+        mock_tk.assert_not_called()
+
+    def test_batch_output(self):
+        """Test that the saved plots do not depend on the render mode."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for render_mode in ("interactive", "batch"):
+                plot_base = PlotBase(render_mode=render_mode, xlabel="x", ylabel="y")
+                plot_base.initialise_figure()
+                plot_base.axis_top.plot([0, 1, 2], [1, 3, 2])
+                plot_base.savefig(f"{tmp_dir}/{render_mode}.png", dpi=100)
+            self.assertIsNone(
+                compare_images(f"{tmp_dir}/batch.png", f"{tmp_dir}/interactive.png", tol=0)
+            )
+
+
+class SaveQueueTestCase(unittest.TestCase):
+    """Test class for the background saving of plots."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.tmp = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        set_save_queue()
+        self.tmp_dir.cleanup()
+
+    def test_invalid_queue(self):
+        """Test that the queue needs at least one thread and pending plot."""
+        with self.assertRaises(ValueError):
+            SaveQueue(max_workers=0)
+        with self.assertRaises(ValueError):
+            SaveQueue(max_pending=0)
+
+    def test_flush(self):
+        """Test that all plots are written after flushing the queue."""
+        for i in range(5):
+            plot_base = PlotBase()
+            plot_base.initialise_figure()
+            plot_base.savefig(self.tmp / f"plot_{i}.png", dpi=50, background=True)
+        flush_save_queue()
+        self.assertEqual(len(list(self.tmp.glob("plot_*.png"))), 5)
+
+    def test_flush_raises(self):
+        """Test that errors raised while writing are raised by the flush."""
+        plot_base = PlotBase()
+        plot_base.initialise_figure()
+        plot_base.savefig(self.tmp / "missing" / "plot.png", background=True)
+        with self.assertRaises(FileNotFoundError):
+            flush_save_queue()
+        # The error is only raised once
+        flush_save_queue()
+
+    def test_bounded(self):
+        """Test that submitting waits while the maximal number of plots is pending."""
+        queue = SaveQueue(max_workers=1, max_pending=1)
+        release = threading.Event()
+        queue.submit(release.wait)
+        submitted = threading.Event()
+        thread = threading.Thread(target=lambda: (queue.submit(int), submitted.set()))
+        thread.start()
+        self.assertFalse(submitted.wait(0.2))
+        release.set()
+        self.assertTrue(submitted.wait(5))
+        thread.join()
+        queue.shutdown()
+
+    def test_close(self):
+        """Test that the figure is cleared after writing it with close=True."""
+        plot_base = PlotBase()
+        plot_base.initialise_figure()
+        plot_base.savefig(self.tmp / "plot.png", dpi=50, background=True, close=True)
+        flush_save_queue()
+        self.assertTrue((self.tmp / "plot.png").is_file())
+        self.assertListEqual(plot_base.fig.axes, [])
+
+    def test_set_save_queue(self):
+        """Test that replacing the queue writes the pending plots first."""
+        plot_base = PlotBase()
+        plot_base.initialise_figure()
+        plot_base.savefig(self.tmp / "plot.png", dpi=50, background=True)
+        queue = get_save_queue()
+        set_save_queue(max_workers=1)
+        self.assertTrue((self.tmp / "plot.png").is_file())
+        self.assertIsNot(get_save_queue(), queue)
+        self.assertEqual(get_save_queue().max_workers, 1)
@@ -6,11 +6,14 @@ import os
 import shutil  # noqa: F401
 import tempfile
 import unittest
+from unittest.mock import patch
 
 import numpy as np
+from matplotlib.figure import Figure
 from matplotlib.testing.compare import compare_images
 
 from puma import Roc, RocPlot
+from puma.roc import adjust_ylabels, can_hide
 from puma.utils.logger import logger, set_log_level
 
 set_log_level(logger, "DEBUG")
@@ -161,6 +164,67 @@ class RocMaskTestCase(unittest.TestCase):
         np.testing.assert_array_almost_equal(roc_curve.non_zero, (result_bkg_rej, result_sig_eff))
 
 
+class RocLayoutTestCase(unittest.TestCase):
+    """Test class for the layout of the ROC ratio panels."""
+
+    def setUp(self):
+        self.sig_eff = np.linspace(0.5, 1, 50)
+
+    def make_plot(self, render_mode: str) -> RocPlot:
+        """Make a ROC plot with two ratio panels.
+
+        Parameters
+        ----------
+        render_mode : str
+            Render mode of the plot
+
+        Returns
+        -------
+        RocPlot
+            The filled, not yet drawn plot
+        """
+        plot = RocPlot(n_ratio_panels=2, render_mode=render_mode)
+        for panel, rej_class in enumerate(("ujets", "cjets"), start=1):
+            for scale in (1, 2):
+                plot.add_roc(
+                    Roc(self.sig_eff, scale / (1.01 - self.sig_eff), rej_class=rej_class),
+                    reference=scale == 1,
+                )
+            plot.set_ratio_class(panel, rej_class)
+        return plot
+
+    def test_single_layout_pass(self):
+        """Test that the figure is laid out once while drawing."""
+        for render_mode in ("interactive", "batch"):
+            plot = self.make_plot(render_mode)
+            with patch.object(Figure, "draw", autospec=True, side_effect=Figure.draw) as mock:
+                plot.draw()
+            mock.assert_called_once()
+
+    def test_same_labels_in_render_modes(self):
+        """Test that the same tick labels are hidden in both render modes."""
+        visible = []
+        for render_mode in ("interactive", "batch"):
+            plot = self.make_plot(render_mode)
+            plot.draw()
+            visible.append([
+                [label.get_text() for label in ax.get_yticklabels() if label.get_visible()]
+                for ax in plot.rej_axes.values()
+            ])
+        self.assertEqual(visible[0], visible[1])
+
+    def test_adjust_ylabels(self):
+        """Test that labels at the axis edges are hidden, keeping the others."""
+        fig = Figure(figsize=(4, 3))
+        ax = fig.add_subplot()
+        ax.set_ylim(0, 1)
+        ax.set_yticks([0, 0.25, 0.5, 1])
+        adjust_ylabels(fig, [ax], min_distance=5)
+        # Only the visible labels are returned
+        self.assertEqual([label.get_text() for label in ax.get_yticklabels()], ["0.25", "0.50"])
+        self.assertTrue(can_hide(ax))
+
+
 class RocOutputTestCase(unittest.TestCase):
     """Test class for the puma.roc_plot function."""
 
@@ -572,3 +636,35 @@ class RocOutputTestCase(unittest.TestCase):
                 tol=2.5,
             )
         )
+
+    def test_decimated_roc(self):
+        """Test that dense ROCs are drawn with fewer points and dense bands rasterised."""
+        sig_eff = np.linspace(0.5, 1, 100_000)
+        plots = []
+        for decimate_tolerance in (None, 1e-4):
+            plot = RocPlot(
+                n_ratio_panels=1,
+                decimate_tolerance=decimate_tolerance,
+                rasterise_threshold=1_000,
+            )
+            for factor in (1, 2):
+                plot.add_roc(
+                    Roc(
+                        sig_eff,
+                        factor / (1.001 - sig_eff),
+                        rej_class="ujets",
+                        n_test=100_000,
+                        label=f"tagger {factor}",
+                    ),
+                    reference=factor == 1,
+                )
+            plot.set_ratio_class(1, "ujets")
+            plot.draw()
+            plots.append(plot)
+
+        for axis in (plots[0].axis_top, plots[0].ratio_axes[0]):
+            self.assertEqual(len(axis.get_lines()[0].get_xdata()), len(sig_eff))
+            self.assertTrue(all(band.get_rasterized() for band in axis.collections))
+        for axis in (plots[1].axis_top, plots[1].ratio_axes[0]):
+            self.assertLess(len(axis.get_lines()[0].get_xdata()), 1_000)
+            self.assertFalse(any(band.get_rasterized() for band in axis.collections))
@@ -79,6 +79,49 @@ class TruthHadronTestCase(unittest.TestCase):
         assert (result == known_result).all(), "Test failed: result does not match known_result"
         print("Test passed!")
 
+    def test_hadron_order_showers(self):
+        hadron_barcode = np.array([
+            [10, 11, 20, 21, 22, 30],
+            [10, 11, 12, -1, -1, -1],
+        ])
+        parent_barcode = np.array([
+            [-1, 10, -1, 20, 20, -1],
+            [-1, -1, -1, -1, -1, -1],
+        ])
+        result = GetOrderedHadrons(hadron_barcode, parent_barcode, n_max_showers=3)
+        known_result = np.array([
+            [[2, 3, 4, -1, -1, -1], [0, 1, -1, -1, -1, -1], [5, -1, -1, -1, -1, -1]],
+            [[0, -1, -1, -1, -1, -1], [1, -1, -1, -1, -1, -1], [2, -1, -1, -1, -1, -1]],
+        ])
+
+        np.testing.assert_array_equal(result, known_result)
+
+    def test_hadron_order_many_jets(self):
+        hadron_barcode = np.tile(self.hadron_barcode, (1000, 1))
+        parent_barcode = np.tile(self.parent_barcode, (1000, 1))
+        result = GetOrderedHadrons(hadron_barcode, parent_barcode, n_max_showers=2)
+        known_result = np.tile([[[0, 1, 2, -1, -1], [-1, -1, -1, -1, -1]]], (1000, 1, 1))
+
+        np.testing.assert_array_equal(result, known_result)
+
+    def test_track_to_hadron_chunked(self):
+        track_parent = np.tile(self.track_parent, (7, 1))
+        hadron_barcode = np.tile(self.hadron_barcode, (7, 1))
+        hadron_mask = np.tile(self.hadron_mask, (1, 7))
+        result = AssociateTracksToHadron(track_parent, hadron_barcode, hadron_mask)
+        result_chunked = AssociateTracksToHadron(
+            track_parent, hadron_barcode, hadron_mask, chunk_size=3
+        )
+
+        assert result[0].dtype == bool
+        assert result[1].dtype == result[2].dtype == np.int32
+        for array, array_chunked in zip(result, result_chunked):
+            np.testing.assert_array_equal(array, array_chunked)
+        single_jet = AssociateTracksToHadron(
+            self.track_parent, self.hadron_barcode, self.hadron_mask
+        )
+        np.testing.assert_array_equal(result[0][:, 6], single_jet[0][:, 0])
+
     def test_track_to_hadron(self):
         result_a, result_b, result_c = AssociateTracksToHadron(
             self.track_parent, self.hadron_barcode, self.hadron_mask
@@ -437,3 +437,15 @@ class VarVsVarPlotTestCase(unittest.TestCase):
 
         with self.assertRaises(ValueError):
             test_plot.draw()
+
+    def test_rasterise_threshold(self):
+        """Test that the artists of dense curves are rasterised."""
+        for rasterise_threshold, rasterised in ((10, True), (100, False)):
+            test_plot = VarVsVarPlot(n_ratio_panels=1, rasterise_threshold=rasterise_threshold)
+            test_plot.add(self.test, reference=True)
+            test_plot.add(self.test_2)
+            test_plot.draw()
+            for axis in (test_plot.axis_top, test_plot.ratio_axes[0]):
+                artists = [*axis.collections, *axis.patches]
+                self.assertTrue(artists)
+                self.assertTrue(all(a.get_rasterized() is rasterised for a in artists))
@@ -116,6 +116,44 @@ class VarVsVtxTestCase(unittest.TestCase):
         np.testing.assert_equal(pm, np.nan)
         np.testing.assert_equal(pm_error, np.nan)
 
+    def test_var_vs_vtx_binned_sums(self):
+        """Test the per-bin sums, entries outside of the bin edges are dropped."""
+        var_plot = VarVsVtx(
+            x_var=[-1, 0.5, 0.7, 1.5, 3],
+            n_match=[9, 1, 0, 2, 9],
+            n_true=[9, 2, 1, 2, 9],
+            n_reco=[9, 1, 0, 4, 9],
+            bins=[0, 1, 2],
+        )
+        np.testing.assert_array_equal(var_plot.n_entries_binned, [2, 1])
+        np.testing.assert_array_equal(var_plot.n_match_binned, [1, 2])
+        np.testing.assert_array_equal(var_plot.n_true_binned, [3, 2])
+        np.testing.assert_array_equal(var_plot.n_reco_binned, [1, 4])
+        np.testing.assert_array_equal(var_plot.n_with_reco_binned, [1, 1])
+
+    def test_var_vs_vtx_binned_ratios(self):
+        """Test the per-bin ratios against the per-bin calculation."""
+        var_plot = VarVsVtx(
+            x_var=self.x_var,
+            n_match=self.n_match,
+            n_true=self.n_true,
+            n_reco=self.n_reco,
+            bins=[50, 100, 150, 200, 260],
+        )
+        bin_indices = np.digitize(self.x_var, var_plot.bin_edges)
+        for mode, num, denom in (
+            ("efficiency", self.n_match, self.n_true),
+            ("purity", self.n_match, self.n_reco),
+            ("fakes", self.n_reco > 0, np.ones_like(self.n_reco)),
+        ):
+            expected = np.array([
+                var_plot.get_performance_ratio(num[bin_indices == i], denom[bin_indices == i])
+                for i in range(1, 5)
+            ])
+            ratio, ratio_error = var_plot.get(mode)
+            np.testing.assert_allclose(ratio, expected[:, 0])
+            np.testing.assert_allclose(ratio_error, expected[:, 1])
+
     def test_var_vs_vtx_eq_different_classes(self):
         """Test var_vs_vtx eq."""
         var_plot = VarVsVtx(
@@ -5,7 +5,7 @@ import unittest
 import numpy as np
 
 from puma.utils import logger, set_log_level
-from puma.utils.confusion_matrix import confusion_matrix
+from puma.utils.confusion_matrix import ConfusionMatrixAccumulator, confusion_matrix
 
 set_log_level(logger, "DEBUG")
 
@@ -58,3 +58,61 @@ class ConfusionMatrixTestCase(unittest.TestCase):
             [0.23809524, 0.0, 0.35714286],
         ])
         np.testing.assert_array_almost_equal(expected_cm, cm)
+
+    def test_confusion_matrix_n_classes(self):
+        targets = np.array([2, 0, 2, 2, 0, 1], dtype=np.int8)
+        predictions = np.array([0, 0, 2, 2, 0, 1], dtype=np.int8)
+        cm = confusion_matrix(targets, predictions, normalize=None, n_classes=4)
+        expected_cm = np.zeros((4, 4))
+        expected_cm[:3, :3] = [[2.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 0.0, 2.0]]
+        np.testing.assert_array_equal(expected_cm, cm)
+
+    def test_confusion_matrix_invalid_label(self):
+        targets = np.array([2, 0, 3])
+        predictions = np.array([0, 0, 2])
+        with self.assertRaises(ValueError):
+            confusion_matrix(targets, predictions, n_classes=3)
+
+
+class ConfusionMatrixAccumulatorTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.targets = rng.integers(0, 4, size=1000)
+        self.predictions = rng.integers(0, 4, size=1000)
+        self.weights = rng.random(1000)
+
+    def test_fill_batches(self):
+        accumulator = ConfusionMatrixAccumulator(n_classes=4)
+        for start in range(0, 1000, 300):
+            accumulator.fill(
+                self.targets[start : start + 300],
+                self.predictions[start : start + 300],
+                sample_weights=self.weights[start : start + 300],
+            )
+        for normalize in [None, "rownorm", "colnorm", "all"]:
+            np.testing.assert_array_almost_equal(
+                accumulator.confusion_matrix(normalize=normalize),
+                confusion_matrix(
+                    self.targets,
+                    self.predictions,
+                    sample_weights=self.weights,
+                    normalize=normalize,
+                ),
+            )
+
+    def test_merge(self):
+        accumulator = ConfusionMatrixAccumulator(n_classes=4).fill(
+            self.targets[:500], self.predictions[:500]
+        )
+        other = ConfusionMatrixAccumulator(n_classes=4).fill(
+            self.targets[500:], self.predictions[500:]
+        )
+        accumulator.merge(other)
+        np.testing.assert_array_equal(
+            accumulator.confusion_matrix(normalize=None),
+            confusion_matrix(self.targets, self.predictions, normalize=None),
+        )
+
+    def test_merge_different_n_classes(self):
+        with self.assertRaises(ValueError):
+            ConfusionMatrixAccumulator(n_classes=4).merge(ConfusionMatrixAccumulator(n_classes=3))
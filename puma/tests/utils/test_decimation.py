@@ -0,0 +1,82 @@
+"""Unit test script for the functions in utils/decimation.py."""
+
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+
+from puma.utils import logger, set_log_level
+from puma.utils.decimation import decimate_curve
+
+set_log_level(logger, "DEBUG")
+
+
+class DecimateCurveTestCase(unittest.TestCase):
+    """Test case for the decimate_curve function."""
+
+    def setUp(self):
+        self.sig_eff = np.linspace(0.3, 1, 100_000)
+        self.bkg_rej = 1 / (1.001 - self.sig_eff) ** 2
+
+    def test_straight_line(self):
+        """Test that only the end points of a straight line are kept."""
+        keep = decimate_curve(np.arange(10.0), 2 * np.arange(10.0), tolerance=1e-6)
+        np.testing.assert_array_equal(np.flatnonzero(keep), [0, 9])
+
+    @staticmethod
+    def max_distance(x: np.ndarray, y: np.ndarray, keep: np.ndarray) -> float:
+        """Get the maximal distance of the dropped points from the drawn curve.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Scaled x coordinates
+        y : np.ndarray
+            Scaled y coordinates
+        keep : np.ndarray
+            Mask of the drawn points
+
+        Returns
+        -------
+        float
+            Maximal distance of a dropped point from its segment
+        """
+        kept = np.flatnonzero(keep)
+        dropped = np.flatnonzero(~keep)
+        segment = np.searchsorted(kept, dropped) - 1
+        start, end = kept[segment], kept[segment + 1]
+        delta_x, delta_y = x[end] - x[start], y[end] - y[start]
+        cross = delta_x * (y[dropped] - y[start]) - delta_y * (x[dropped] - x[start])
+        return np.max(np.abs(cross) / np.hypot(delta_x, delta_y))
+
+    def test_tolerance(self):
+        """Test that the dropped points are within the tolerance of the drawn curve."""
+        keep = decimate_curve(self.sig_eff, self.bkg_rej, tolerance=1e-3, logy=True)
+        self.assertLess(np.count_nonzero(keep), 1000)
+        self.assertTrue(keep[0] and keep[-1])
+        x = self.sig_eff / np.ptp(self.sig_eff)
+        y = np.log10(self.bkg_rej) / np.ptp(np.log10(self.bkg_rej))
+        self.assertLessEqual(self.max_distance(x, y, keep), 1e-3)
+
+    def test_band(self):
+        """Test that the band edges are within the tolerance as well."""
+        band_up = self.bkg_rej * (1 + 0.2 * np.sin(50 * self.sig_eff) ** 2)
+        keep = decimate_curve(self.sig_eff, self.bkg_rej, band_up, tolerance=1e-3)
+        x = self.sig_eff / np.ptp(self.sig_eff)
+        extent = np.ptp(np.concatenate([self.bkg_rej, band_up]))
+        for y in (self.bkg_rej, band_up):
+            self.assertLessEqual(self.max_distance(x, y / extent, keep), 1e-3)
+
+    def test_not_drawable(self):
+        """Test that points which cannot be drawn are kept and split the curve."""
+        y = np.array([1.0, 2.0, 3.0, 0.0, 5.0, 6.0, 7.0, np.nan, 9.0])
+        keep = decimate_curve(np.arange(9.0), y, tolerance=0.5, logy=True)
+        self.assertTrue(keep[[0, 2, 3, 4, 6, 7, 8]].all())
+
+    def test_invalid_input(self):
+        """Test that invalid tolerances and lengths raise a ValueError."""
+        with self.assertRaises(ValueError):
+            decimate_curve(self.sig_eff, self.bkg_rej, tolerance=0)
+        with self.assertRaises(ValueError):
+            decimate_curve(self.sig_eff, self.bkg_rej[:-1], tolerance=1e-3)
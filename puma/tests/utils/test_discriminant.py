@@ -0,0 +1,81 @@
+"""Unit test script for the functions in utils/discriminant.py."""
+
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+from ftag import Flavours
+from ftag.utils import get_discriminant
+from numpy.lib.recfunctions import unstructured_to_structured as u2s
+
+from puma.utils import logger, set_log_level
+from puma.utils.discriminant import calculate_discriminant
+
+set_log_level(logger, "DEBUG")
+
+
+class CalculateDiscriminantTestCase(unittest.TestCase):
+    """Test case for calculate_discriminant function."""
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.probs = rng.dirichlet(np.ones(3), size=1000)
+        self.flavours = [Flavours["ujets"], Flavours["cjets"], Flavours["bjets"]]
+
+    def get_reference(self, probs, fraction_values):
+        jets = u2s(probs, dtype=[(f"dummy_{f.px}", probs.dtype) for f in self.flavours])
+        return get_discriminant(
+            jets=jets,
+            tagger="dummy",
+            signal=Flavours["bjets"],
+            flavours=self.flavours,
+            fraction_values=fraction_values,
+        )
+
+    def test_same_as_ftag(self):
+        """Check that the result is identical to the ftag implementation."""
+        for dtype in ("f4", "f8"):
+            probs = np.ascontiguousarray(self.probs.astype(dtype).T)
+            with self.subTest(dtype=dtype):
+                discs = calculate_discriminant(probs[2], [probs[0], probs[1]], [0.8, 0.2])
+                self.assertEqual(discs.dtype, np.dtype(dtype))
+                np.testing.assert_array_equal(
+                    discs, self.get_reference(probs.T, {"fu": 0.8, "fc": 0.2})
+                )
+
+    def test_zero_fractions(self):
+        """Check that backgrounds with zero fraction are skipped."""
+        probs = self.probs.T
+        np.testing.assert_array_equal(
+            calculate_discriminant(probs[2], [probs[0], probs[1]], [0, 0]),
+            self.get_reference(probs.T, {"fu": 0, "fc": 0}),
+        )
+
+    def test_reuse_buffers(self):
+        """Check that the given output and work arrays are used."""
+        probs = self.probs.T
+        out = np.empty(len(self.probs))
+        buffer = np.empty(len(self.probs))
+        for fc in (0.1, 0.5, 0.9):
+            discs = calculate_discriminant(
+                probs[2], [probs[0], probs[1]], [1 - fc, fc], out=out, buffer=buffer
+            )
+            self.assertIs(discs, out)
+            np.testing.assert_array_equal(
+                discs, self.get_reference(probs.T, {"fu": 1 - fc, "fc": fc})
+            )
+
+    def test_wrong_buffer(self):
+        """Check that buffers with the wrong dtype raise an error."""
+        probs = self.probs.T
+        with self.assertRaises(ValueError):
+            calculate_discriminant(
+                probs[2], [probs[0]], [1.0], out=np.empty(len(self.probs), dtype="f4")
+            )
+
+    def test_wrong_number_of_fractions(self):
+        """Check that a mismatch between probabilities and fraction values raises."""
+        probs = self.probs.T
+        with self.assertRaises(ValueError):
+            calculate_discriminant(probs[2], [probs[0], probs[1]], [1.0])
@@ -9,6 +9,7 @@ import numpy as np
 from puma.utils import logger, set_log_level
 from puma.utils.mass import (
     calculate_vertex_mass,
+    unique_vertex_masses,
 )
 
 set_log_level(logger, "DEBUG")
@@ -67,3 +68,39 @@ class VertexMassTestCase(unittest.TestCase):
         )
         expected_result = np.array([[vtx_mass_1, vtx_mass_1, vtx_mass_2, vtx_mass_2, vtx_mass_2]])
         np.testing.assert_array_equal(vtx_masses, expected_result)
+
+    def test_chunked(self):
+        """Check that the result does not depend on the chunk size."""
+        rng = np.random.default_rng(42)
+        track_pt = rng.random((20, 8)) * 100
+        track_eta = rng.normal(size=(20, 8))
+        track_phi = rng.uniform(-np.pi, np.pi, size=(20, 8))
+        vtx_idx = rng.integers(-1, 4, size=(20, 8))
+        vtx_masses = calculate_vertex_mass(track_pt, track_eta, track_phi, vtx_idx)
+        vtx_masses_chunked = calculate_vertex_mass(
+            track_pt, track_eta, track_phi, vtx_idx, chunk_size=3
+        )
+        np.testing.assert_allclose(vtx_masses_chunked, vtx_masses)
+        vtx_masses_parallel = calculate_vertex_mass(
+            track_pt, track_eta, track_phi, vtx_idx, chunk_size=3, n_workers=2
+        )
+        np.testing.assert_allclose(vtx_masses_parallel, vtx_masses)
+
+    def test_no_vertex_and_nan(self):
+        """Check tracks outside of vertices and tracks with NaN values."""
+        track_pt = np.array([[1.0, 2.0, np.nan, 4.0]])
+        track_eta = np.zeros((1, 4))
+        track_phi = np.zeros((1, 4))
+        vtx_idx = np.array([[-1, 0, 0, -1]])
+        vtx_masses = calculate_vertex_mass(track_pt, track_eta, track_phi, vtx_idx, particle_mass=2)
+        np.testing.assert_allclose(vtx_masses, np.array([[0, 2, 2, 0]]))
+
+
+class UniqueVertexMassesTestCase(unittest.TestCase):
+    """Test case for unique_vertex_masses function."""
+
+    def test_unique_vertex_masses(self):
+        """Check that the unique masses of each jet are returned in jet order."""
+        masses = np.array([[3.0, 0.0, 3.0, 1.0], [0.0, 0.0, 0.0, 0.0], [2.0, 5.0, 2.0, 0.0]])
+        expected_result = np.concatenate([np.unique(mass) for mass in masses])
+        np.testing.assert_array_equal(unique_vertex_masses(masses), expected_result)
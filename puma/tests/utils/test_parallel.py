@@ -0,0 +1,77 @@
+"""Unit test script for the functions in utils/parallel.py."""
+
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+
+from puma.utils import logger, set_log_level
+from puma.utils.parallel import map_jet_chunks
+
+set_log_level(logger, "DEBUG")
+
+
+def _jet_sums(values, weights=None, scale=1):
+    result = {"sum": values.sum(axis=1) * scale, "first": values[:, 0]}
+    if weights is not None:
+        result["weighted"] = (values * weights).sum(axis=1)
+    return result
+
+
+def _transposed(values, mask):
+    return values.T * mask, values
+
+
+class MapJetChunksTestCase(unittest.TestCase):
+    """Test case for map_jet_chunks function."""
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.values = rng.random((103, 7))
+        self.weights = rng.random((103, 7))
+
+    def test_dict_output(self):
+        """Check that the chunked results are reassembled in order."""
+        result = map_jet_chunks(_jet_sums, (self.values, None), chunk_size=10, scale=2)
+        self.assertEqual(list(result), ["sum", "first"])
+        np.testing.assert_allclose(result["sum"], self.values.sum(axis=1) * 2)
+        np.testing.assert_array_equal(result["first"], self.values[:, 0])
+
+    def test_axes(self):
+        """Check inputs and outputs with the jets along another axis."""
+        mask = self.values.T > 0.5
+        result = map_jet_chunks(
+            _transposed,
+            (self.values, mask),
+            chunk_size=9,
+            in_axes=(0, 1),
+            out_axes=(1, 0),
+        )
+        self.assertIsInstance(result, tuple)
+        np.testing.assert_array_equal(result[0], self.values.T * mask)
+        np.testing.assert_array_equal(result[1], self.values)
+
+    def test_workers(self):
+        """Check that running on several processes gives the same result."""
+        serial = map_jet_chunks(_jet_sums, (self.values, self.weights), chunk_size=10)
+        parallel = map_jet_chunks(
+            _jet_sums, (self.values, self.weights), chunk_size=10, n_workers=3
+        )
+        for key, value in serial.items():
+            np.testing.assert_array_equal(parallel[key], value)
+
+    def test_no_jets(self):
+        """Check the output shape without jets."""
+        result = map_jet_chunks(_jet_sums, (self.values[:0], None), chunk_size=10)
+        self.assertEqual(result["sum"].shape, (0,))
+
+    def test_different_n_jets(self):
+        """Check that inconsistent numbers of jets raise an error."""
+        with self.assertRaises(ValueError):
+            map_jet_chunks(_jet_sums, (self.values, self.weights[:-1]))
+
+    def test_invalid_chunk_size(self):
+        """Check that a chunk size of zero raises an error."""
+        with self.assertRaises(ValueError):
+            map_jet_chunks(_jet_sums, (self.values, None), chunk_size=0)
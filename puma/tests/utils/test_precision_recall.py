@@ -5,6 +5,7 @@ import unittest
 import numpy as np
 
 from puma.utils import logger, set_log_level
+from puma.utils.confusion_matrix import ConfusionMatrixAccumulator
 from puma.utils.precision_recall_scores import precision_recall_scores_per_class
 
 set_log_level(logger, "DEBUG")
@@ -29,3 +30,14 @@ class ConfusionMatrixTestCase(unittest.TestCase):
         expected_recall = np.array([1.0, 0.0, 0.6])
         np.testing.assert_array_almost_equal(expected_precision, precision)
         np.testing.assert_array_almost_equal(expected_recall, recall)
+
+    def test_precision_accumulator(self):
+        targets = np.array([2, 0, 2, 2, 0, 1])
+        predictions = np.array([0, 0, 2, 2, 0, 2])
+        accumulator = ConfusionMatrixAccumulator(n_classes=3)
+        accumulator.fill(targets[:3], predictions[:3]).fill(targets[3:], predictions[3:])
+        precision, recall = accumulator.precision_recall()
+        expected_precision = np.array([0.66666667, 0.0, 0.66666667])
+        expected_recall = np.array([1.0, 0.0, 0.66666667])
+        np.testing.assert_array_almost_equal(expected_precision, precision)
+        np.testing.assert_array_almost_equal(expected_recall, recall)
@@ -0,0 +1,73 @@
+"""Unit test script for the functions in utils/score_curves.py."""
+
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+
+from puma.utils import logger, set_log_level
+from puma.utils.score_curves import ScoreCurveAccumulator
+
+set_log_level(logger, "DEBUG")
+
+
+class ScoreCurveAccumulatorTestCase(unittest.TestCase):
+    """Test case for the ScoreCurveAccumulator class."""
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.targets = rng.integers(0, 3, size=1000)
+        self.scores = rng.dirichlet(np.ones(3), size=1000)
+        self.weights = rng.random(1000)
+
+    def test_curves(self):
+        """Check the curves against a direct count at each threshold."""
+        accumulator = ScoreCurveAccumulator(n_classes=3, n_bins=10)
+        accumulator.fill(self.targets, self.scores, sample_weights=self.weights)
+        precision, recall = accumulator.precision_recall()
+        fpr, tpr = accumulator.roc()
+        for class_idx in range(3):
+            is_pos = self.targets == class_idx
+            for i, threshold in enumerate(accumulator.thresholds):
+                passed = self.scores[:, class_idx] >= threshold
+                tp = np.sum(self.weights[passed & is_pos])
+                fp = np.sum(self.weights[passed & ~is_pos])
+                self.assertAlmostEqual(precision[class_idx, i], tp / (tp + fp))
+                self.assertAlmostEqual(recall[class_idx, i], tp / np.sum(self.weights[is_pos]))
+                self.assertAlmostEqual(tpr[class_idx, i], recall[class_idx, i])
+                self.assertAlmostEqual(fpr[class_idx, i], fp / np.sum(self.weights[~is_pos]))
+
+    def test_chunks_and_merge(self):
+        """Check that chunked and merged filling give the same histograms."""
+        accumulator = ScoreCurveAccumulator(n_classes=3)
+        accumulator.fill(self.targets, self.scores)
+        chunked = ScoreCurveAccumulator(n_classes=3)
+        chunked.fill(self.targets[:600], self.scores[:600], chunk_size=100)
+        other = ScoreCurveAccumulator(n_classes=3).fill(self.targets[600:], self.scores[600:])
+        chunked.merge(other)
+        np.testing.assert_array_equal(chunked.counts, accumulator.counts)
+
+    def test_non_finite_scores(self):
+        """Check that samples with non-finite scores are skipped."""
+        scores = self.scores.copy()
+        scores[::7, 0] = np.nan
+        scores[3, 1] = np.inf
+        valid = np.isfinite(scores).all(axis=1)
+        filled = ScoreCurveAccumulator(n_classes=3).fill(
+            self.targets, scores, sample_weights=self.weights, chunk_size=100
+        )
+        expected = ScoreCurveAccumulator(n_classes=3).fill(
+            self.targets[valid], scores[valid], sample_weights=self.weights[valid]
+        )
+        np.testing.assert_allclose(filled.counts, expected.counts)
+
+    def test_wrong_scores_shape(self):
+        """Check that scores with the wrong number of classes raise an error."""
+        with self.assertRaises(ValueError):
+            ScoreCurveAccumulator(n_classes=4).fill(self.targets, self.scores)
+
+    def test_merge_different_binning(self):
+        """Check that accumulators with different binning cannot be merged."""
+        with self.assertRaises(ValueError):
+            ScoreCurveAccumulator(n_classes=3).merge(ScoreCurveAccumulator(3, n_bins=10))
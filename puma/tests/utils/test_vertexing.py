@@ -9,11 +9,15 @@ import numpy as np
 from puma.utils import logger, set_log_level
 from puma.utils.vertexing import (
     associate_vertices,
+    build_vertex_labels,
     build_vertices,
     calculate_vertex_metrics,
     clean_indices,
     clean_reco_vertices,
+    clean_reco_vertices_batched,
     clean_truth_vertices,
+    clean_truth_vertices_batched,
+    merge_indices_batched,
 )
 
 set_log_level(logger, "DEBUG")
@@ -91,6 +95,20 @@ class BuildVerticesTestCase(unittest.TestCase):
         np.testing.assert_array_equal(vertices, expected_result)
 
 
+class BuildVertexLabelsTestCase(unittest.TestCase):
+    """Test case for build_vertex_labels function."""
+
+    def test_same_as_build_vertices(self):
+        """Check that labels follow the vertex order of build_vertices."""
+        indices = np.array([[7, 3, 3, 7, -1, -1, 5], [0, 1, 2, 3, 4, 5, 6]])
+        labels, n_vertices = build_vertex_labels(indices)
+        np.testing.assert_array_equal(labels, [[1, 0, 0, 1, -1, -1, -1], [-1] * 7])
+        np.testing.assert_array_equal(n_vertices, [2, 0])
+        for i in range(indices.shape[0]):
+            vertices = build_vertices(indices[i])
+            np.testing.assert_array_equal(vertices, labels[i] == np.arange(n_vertices[i])[:, None])
+
+
 class AssociateVerticesTestCase(unittest.TestCase):
     """Test case for associate_vertices function."""
 
@@ -345,6 +363,35 @@ class CalculateVertexMetricsTestCase(unittest.TestCase):
         np.testing.assert_array_equal(metrics["test_vertex_size"], [[2, -1]])
         np.testing.assert_array_equal(metrics["ref_vertex_size"], [[2, -1]])
 
+    def test_same_as_single_jet_matching(self):
+        """Check that the chunked matching agrees with the single jet matching."""
+        rng = np.random.default_rng(42)
+        ref_indices = rng.integers(-2, 5, size=(500, 10))
+        test_indices = np.where(
+            rng.random((500, 10)) < 0.7, ref_indices, rng.integers(-2, 5, size=(500, 10))
+        )
+        metrics = calculate_vertex_metrics(test_indices, ref_indices, max_vertices=2, chunk_size=77)
+        for i in range(ref_indices.shape[0]):
+            test_vertices = build_vertices(test_indices[i])
+            ref_vertices = build_vertices(ref_indices[i])
+            self.assertEqual(metrics["n_test"][i], test_vertices.shape[0])
+            self.assertEqual(metrics["n_ref"][i], ref_vertices.shape[0])
+            if not test_vertices.any() or not ref_vertices.any():
+                self.assertEqual(metrics["n_match"][i], 0)
+                continue
+            associations, common_tracks = associate_vertices(
+                test_vertices, ref_vertices, eff_req=0.65, purity_req=0.5
+            )
+            self.assertEqual(metrics["n_match"][i], associations.sum())
+            n_write = min(associations.sum(), 2)
+            np.testing.assert_array_equal(
+                metrics["track_overlap"][i, :n_write], common_tracks[associations][:n_write]
+            )
+            np.testing.assert_array_equal(
+                metrics["ref_vertex_size"][i, :n_write],
+                ref_vertices[associations.any(axis=0)].sum(axis=1)[:n_write],
+            )
+
 
 class CleanTruthVerticesTestCase(unittest.TestCase):
     """Test case for clean_truth_vertices function."""
@@ -399,3 +446,58 @@ class CleanRecoVerticesTestCase(unittest.TestCase):
         cleaned_indices = clean_reco_vertices(vtx_indices, incl_vertexing=True)
         expected_result = np.array([-2, -2, 2, 2, -2, 2, 2, 2])
         np.testing.assert_array_equal(cleaned_indices, expected_result)
+
+
+class CleanVerticesBatchedTestCase(unittest.TestCase):
+    """Test case for the batched vertex cleaning functions."""
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.vtx_indices = rng.integers(-2, 5, size=(300, 10))
+        self.trk_origin = rng.integers(-1, 8, size=(300, 10))
+
+    def test_merge_indices_batched(self):
+        """Check that the merging is done per jet."""
+        vtx_indices = np.array([[0, 1, 1, 2, 1], [0, 1, 1, 5, 1]])
+        condition = np.array([[True, False, False, True, False], [False, True, True, False, True]])
+        updated_ids = merge_indices_batched(vtx_indices, condition)
+        expected_result = np.array([[3, 1, 1, 3, 1], [0, 1, 1, 5, 1]])
+        np.testing.assert_array_equal(updated_ids, expected_result)
+
+    def test_truth_same_as_single_jet(self):
+        """Check that batched truth cleaning agrees with the single jet cleaning."""
+        for incl_vertexing in (False, True):
+            cleaned = clean_truth_vertices_batched(
+                self.vtx_indices, self.trk_origin, incl_vertexing=incl_vertexing
+            )
+            for i in range(self.vtx_indices.shape[0]):
+                np.testing.assert_array_equal(
+                    cleaned[i],
+                    clean_truth_vertices(
+                        np.copy(self.vtx_indices[i]),
+                        self.trk_origin[i],
+                        incl_vertexing=incl_vertexing,
+                    ),
+                )
+
+    def test_reco_same_as_single_jet(self):
+        """Check that batched reco cleaning agrees with the single jet cleaning."""
+        for incl_vertexing in (False, True):
+            for require_hf_track in (False, True):
+                for trk_origin in (self.trk_origin, None):
+                    cleaned = clean_reco_vertices_batched(
+                        self.vtx_indices,
+                        trk_origin,
+                        incl_vertexing=incl_vertexing,
+                        require_hf_track=require_hf_track,
+                    )
+                    for i in range(self.vtx_indices.shape[0]):
+                        np.testing.assert_array_equal(
+                            cleaned[i],
+                            clean_reco_vertices(
+                                np.copy(self.vtx_indices[i]),
+                                None if trk_origin is None else trk_origin[i],
+                                incl_vertexing=incl_vertexing,
+                                require_hf_track=require_hf_track,
+                            ),
+                        )
@@ -2,16 +2,26 @@
 
 from __future__ import annotations
 
-from palettable.colorbrewer.qualitative import Dark2_8
+from typing import TYPE_CHECKING
 
 from puma.utils.aux import get_aux_labels
-from puma.utils.generate import (
-    get_dummy_2_taggers,
-    get_dummy_multiclass_scores,
-    get_dummy_tagger_aux,
-)
+from puma.utils.lazy import lazy_module
 from puma.utils.logger import logger, set_log_level
 
+if TYPE_CHECKING:  # pragma: no cover
+    from puma.utils.generate import (
+        get_dummy_2_taggers,
+        get_dummy_multiclass_scores,
+        get_dummy_tagger_aux,
+    )
+
+# The dummy data generators are imported on first access, as they need pandas and h5py
+_LAZY_IMPORTS = {
+    "get_dummy_2_taggers": "puma.utils.generate",
+    "get_dummy_multiclass_scores": "puma.utils.generate",
+    "get_dummy_tagger_aux": "puma.utils.generate",
+}
+
 __all__ = [
     "get_aux_labels",
     "get_dummy_2_taggers",
@@ -22,6 +32,9 @@ __all__ = [
 ]
 
 
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
+
+
 def set_xaxis_ticklabels_invisible(ax):
     """Helper function to set the ticklabels of the xaxis invisible.
 
@@ -133,6 +146,9 @@ def get_good_colours(colour_scheme: str | None = None) -> list:
     ValueError
         If the given colour scheme is not supported
     """
+    # palettable imports matplotlib.pyplot, so it is only imported when needed
+    from palettable.colorbrewer.qualitative import Dark2_8
+
     # If no colour scheme is selected, return colour-blind friendly colours
     # See https://arxiv.org/pdf/2107.02270 Page 15 (10 colours)
     if colour_scheme is None:
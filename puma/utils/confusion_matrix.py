@@ -3,7 +3,114 @@
 from __future__ import annotations
 
 import numpy as np
-import scipy as scp
+
+
+def _check_normalize(normalize: str | None) -> None:
+    """Check that the normalization keyword is valid.
+
+    Parameters
+    ----------
+    normalize : str | None
+        Normalization of the confusion matrix
+    """
+    if normalize is not None:
+        assert normalize in {
+            "rownorm",
+            "colnorm",
+            "all",
+        }, "confusion_matrix: invalid normalization keyword"
+
+
+def _count_matrix(
+    targets: np.ndarray,
+    predictions: np.ndarray,
+    n_classes: int,
+    sample_weights: np.ndarray | None = None,
+) -> np.ndarray:
+    """Calculate the raw count confusion matrix with a single `np.bincount`.
+
+    Parameters
+    ----------
+    targets : 1d np.ndarray
+        target labels
+    predictions : 1d np.ndarray
+        predicted labels (output of the classifier)
+    n_classes : int
+        Number of classes, all labels must be smaller
+    sample_weights : np.ndarray, optional
+        Weight of each sample; if None, each sample weights the same. Defaults to None.
+
+    Returns
+    -------
+    np.ndarray
+        The (n_classes, n_classes) confusion matrix with raw counts
+
+    Raises
+    ------
+    ValueError
+        If any of the labels is negative or not smaller than n_classes
+    """
+    targets = np.asarray(targets)
+    predictions = np.asarray(predictions)
+    for labels in (targets, predictions):
+        if labels.size and (labels.min() < 0 or labels.max() >= n_classes):
+            raise ValueError(
+                f"Labels must be in [0, {n_classes}), got values in "
+                f"[{labels.min()}, {labels.max()}]."
+            )
+
+    # cast before the multiplication to avoid overflows for compact label dtypes
+    index = targets.astype(np.intp) * n_classes
+    index += predictions
+    cm = np.bincount(index, weights=sample_weights, minlength=n_classes**2)
+    return cm.reshape(n_classes, n_classes).astype(float)
+
+
+def _normalize_matrix(cm: np.ndarray, normalize: str | None) -> np.ndarray:
+    """Normalize a raw count confusion matrix.
+
+    Parameters
+    ----------
+    cm : np.ndarray
+        Raw count confusion matrix, which is normalized in place
+    normalize : str | None
+        Normalization of the confusion matrix, see `confusion_matrix`
+
+    Returns
+    -------
+    np.ndarray
+        The normalized confusion matrix, with nan converted to zero
+    """
+    with np.errstate(all="warn"):
+        if normalize == "all":
+            cm /= cm.sum()
+        elif normalize == "rownorm":
+            cm /= cm.sum(axis=1, keepdims=True)
+        elif normalize == "colnorm":
+            cm /= cm.sum(axis=0, keepdims=True)
+
+    return np.nan_to_num(cm)
+
+
+def _precision_recall(cm: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate the per-class precision and recall from a raw count confusion matrix.
+
+    Parameters
+    ----------
+    cm : np.ndarray
+        Raw count confusion matrix with the targets in the rows
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The per-class precision and recall scores, with nan converted to zero
+    """
+    tp = np.diag(cm)
+    with np.errstate(all="warn"):
+        precision = tp / np.sum(cm, axis=0)
+        recall = tp / np.sum(cm, axis=1)
+
+    return np.nan_to_num(precision), np.nan_to_num(recall)
 
 
 def confusion_matrix(
@@ -11,6 +118,7 @@ def confusion_matrix(
     predictions: np.ndarray,
     sample_weights: np.ndarray | None = None,
     normalize: str | None = "rownorm",
+    n_classes: int | None = None,
 ) -> np.ndarray:
     """
     Parameters
@@ -28,6 +136,9 @@ def confusion_matrix(
         "colnorm": Normalize across the target class, i.e. such that the columns add to one;
         "all" : Normalize across all examples, i.e. such that all matrix entries add to one.
         Defaults to "rownorm".
+    n_classes : int | None, optional
+        Number of classes. If None, the largest label in targets and predictions
+        plus one is used. Defaults to None.
 
     Returns
     -------
@@ -52,37 +163,131 @@ def confusion_matrix(
         assert (
             sample_weights.shape[0] == targets.shape[0]
         ), "confusion_matrix: Mismatch between targets' and sample weights' size"
+    _check_normalize(normalize)
 
-    if normalize is not None:
-        assert normalize in {
-            "rownorm",
-            "colnorm",
-            "all",
-        }, "confusion_matrix: invalid normalization keyword"
-
-    # Finding number of target classes
-    # (i.e. unique elements across targets and predictions)
-    n_classes = np.unique(np.concatenate((targets, predictions))).size
-
-    # If no samples' weights are given, give to each sample weight = 1
-    if sample_weights is None:
-        sample_weights = np.ones_like(targets)
+    # Finding number of target classes from the largest label
+    if n_classes is None:
+        n_classes = int(max(targets.max(), predictions.max())) + 1 if targets.size else 0
 
     # Calculate the raw count Confusion Matrix
-    cm = scp.sparse.coo_matrix(
-        (sample_weights, (targets, predictions)),
-        shape=(n_classes, n_classes),
-        dtype="float",
-    ).toarray()
+    cm = _count_matrix(targets, predictions, n_classes, sample_weights=sample_weights)
 
     # Eventually normalize the Confusion Matrix
-    with np.errstate(all="warn"):
-        if normalize == "all":
-            cm /= cm.sum()
-        elif normalize == "rownorm":
-            cm /= cm.sum(axis=1, keepdims=True)
-        elif normalize == "colnorm":
-            cm /= cm.sum(axis=0, keepdims=True)
+    return _normalize_matrix(cm, normalize)
 
-    # Returning the CM with nan converted to zero
-    return np.nan_to_num(cm)
+
+class ConfusionMatrixAccumulator:
+    """Confusion matrix which is filled batch by batch.
+
+    The raw (weighted) counts are accumulated, so that the confusion matrix of a
+    large sample can be built from batches of labels, and accumulators filled
+    in different workers can be merged.
+
+    Example
+    --------
+    >>> accumulator = ConfusionMatrixAccumulator(n_classes=3)
+    >>> accumulator.fill(np.array([2, 0, 2]), np.array([0, 0, 2]))
+    >>> accumulator.fill(np.array([2, 0, 1]), np.array([2, 0, 2]))
+    >>> accumulator.confusion_matrix(normalize=None)
+    np.array([[2.  0.  0. ]
+        [0.  0.  1. ]
+        [1.  0.  2. ]])
+    """
+
+    def __init__(self, n_classes: int):
+        """Initialise an empty confusion matrix.
+
+        Parameters
+        ----------
+        n_classes : int
+            Number of classes
+        """
+        self.n_classes = n_classes
+        self.counts = np.zeros((n_classes, n_classes))
+
+    def fill(
+        self,
+        targets: np.ndarray,
+        predictions: np.ndarray,
+        sample_weights: np.ndarray | None = None,
+    ) -> ConfusionMatrixAccumulator:
+        """Add a batch of labels to the confusion matrix.
+
+        Parameters
+        ----------
+        targets : 1d np.ndarray
+            target labels
+        predictions : 1d np.ndarray
+            predicted labels (output of the classifier)
+        sample_weights : np.ndarray, optional
+            Weight of each sample; if None, each sample weights the same.
+            Defaults to None.
+
+        Returns
+        -------
+        ConfusionMatrixAccumulator
+            The accumulator itself
+        """
+        assert (
+            targets.shape[0] == predictions.shape[0]
+        ), "confusion_matrix: Predictions and targets must have the same sample size"
+        self.counts += _count_matrix(
+            targets, predictions, self.n_classes, sample_weights=sample_weights
+        )
+        return self
+
+    def merge(self, *others: ConfusionMatrixAccumulator) -> ConfusionMatrixAccumulator:
+        """Add the counts of other accumulators, e.g. filled in other workers.
+
+        Parameters
+        ----------
+        *others : ConfusionMatrixAccumulator
+            Accumulators with the same number of classes
+
+        Returns
+        -------
+        ConfusionMatrixAccumulator
+            The accumulator itself
+
+        Raises
+        ------
+        ValueError
+            If the number of classes differs
+        """
+        for other in others:
+            if other.n_classes != self.n_classes:
+                raise ValueError(
+                    f"Cannot merge confusion matrices with {other.n_classes} and "
+                    f"{self.n_classes} classes."
+                )
+            self.counts += other.counts
+        return self
+
+    def confusion_matrix(self, normalize: str | None = "rownorm") -> np.ndarray:
+        """Get the accumulated confusion matrix.
+
+        Parameters
+        ----------
+        normalize : str | None, optional
+            Normalization of the confusion matrix, see `confusion_matrix`.
+            Defaults to "rownorm".
+
+        Returns
+        -------
+        np.ndarray
+            The confusion matrix
+        """
+        _check_normalize(normalize)
+        return _normalize_matrix(self.counts.copy(), normalize)
+
+    def precision_recall(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the per-class precision and recall scores of the accumulated matrix.
+
+        The scores are defined as in `precision_recall_scores_per_class`.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The per-class precision and recall scores
+        """
+        return _precision_recall(self.counts)
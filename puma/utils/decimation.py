@@ -0,0 +1,159 @@
+"""Error-bounded decimation of dense curves."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def _axis_coordinates(values: np.ndarray, log: bool) -> np.ndarray:
+    """Transform values to the coordinates in which they are displayed.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Values along one axis
+    log : bool
+        Whether the axis is logarithmic
+
+    Returns
+    -------
+    np.ndarray
+        The values, in log10 for logarithmic axes. Values which cannot be displayed
+        are nan.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not log:
+        return values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coordinates = np.log10(values)
+    coordinates[values <= 0] = np.nan
+    return coordinates
+
+
+def _normalise(coordinates: np.ndarray) -> np.ndarray:
+    """Scale coordinates to the unit range of their finite values.
+
+    Parameters
+    ----------
+    coordinates : np.ndarray
+        Coordinates along one axis
+
+    Returns
+    -------
+    np.ndarray
+        Coordinates divided by the range of the finite ones
+    """
+    finite = coordinates[np.isfinite(coordinates)]
+    extent = np.ptp(finite) if len(finite) else 0.0
+    return coordinates / extent if extent > 0 else coordinates
+
+
+def _simplify(x: np.ndarray, ys: np.ndarray, tolerance: float) -> np.ndarray:
+    """Ramer-Douglas-Peucker simplification of curves sharing their x values.
+
+    A point is dropped if all curves are within `tolerance` of the segments
+    between the kept points.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Finite x coordinates of shape (n_points,)
+    ys : np.ndarray
+        Finite y coordinates of shape (n_curves, n_points)
+    tolerance : float
+        Maximal distance of the dropped points from the simplified curves
+
+    Returns
+    -------
+    np.ndarray
+        Boolean mask of the kept points
+    """
+    keep = np.zeros(len(x), dtype=bool)
+    keep[[0, -1]] = True
+    segments = [(0, len(x) - 1)]
+    while segments:
+        start, end = segments.pop()
+        if end - start < 2:
+            continue
+        delta_x = x[end] - x[start]
+        delta_y = ys[:, end] - ys[:, start]
+        offset_x = x[start + 1 : end] - x[start]
+        offset_y = ys[:, start + 1 : end] - ys[:, start, None]
+        length = np.hypot(delta_x, delta_y)[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            distance = np.where(
+                length > 0,
+                np.abs(delta_x * offset_y - delta_y[:, None] * offset_x) / length,
+                np.hypot(offset_x, offset_y),
+            )
+        distance = distance.max(axis=0)
+        farthest = int(np.argmax(distance))
+        if distance[farthest] > tolerance:
+            split = start + 1 + farthest
+            keep[split] = True
+            segments += [(start, split), (split, end)]
+    return keep
+
+
+def decimate_curve(
+    x: np.ndarray,
+    *ys: np.ndarray,
+    tolerance: float,
+    logx: bool = False,
+    logy: bool = False,
+) -> np.ndarray:
+    """Select the points needed to draw dense curves within a given tolerance.
+
+    The curves are simplified with the Ramer-Douglas-Peucker algorithm in the
+    coordinates in which they are displayed, i.e. in log10 for logarithmic axes,
+    scaled to the range of the curves. All dropped points are within `tolerance`
+    of the lines between the kept points, for each of the curves. Several curves
+    with the same x values, e.g. a curve and the edges of its uncertainty band,
+    are simplified together, so they keep the same points. Points which cannot be
+    displayed, e.g. nan or non-positive values on logarithmic axes, are kept and
+    the curves are simplified separately on both sides of them.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        x values of the curves
+    *ys : np.ndarray
+        y values of the curves
+    tolerance : float
+        Maximal distance of the dropped points from the drawn curves, as fraction
+        of the x and y ranges of the curves, e.g. 1e-3
+    logx : bool, optional
+        Whether the x-axis is logarithmic, by default False
+    logy : bool, optional
+        Whether the y-axis is logarithmic, by default False
+
+    Returns
+    -------
+    np.ndarray
+        Boolean mask of the points to draw
+
+    Raises
+    ------
+    ValueError
+        If the tolerance is not positive or the curves have different lengths
+
+    Examples
+    --------
+    >>> keep = decimate_curve(sig_eff, bkg_rej, tolerance=1e-3, logy=True)
+    >>> ax.plot(sig_eff[keep], bkg_rej[keep])
+    """
+    if tolerance <= 0:
+        raise ValueError(f"The decimation tolerance must be positive, got {tolerance}.")
+    if any(len(y) != len(x) for y in ys):
+        raise ValueError("All curves must have the same length as `x`.")
+
+    x_coord = _normalise(_axis_coordinates(x, logx))
+    y_coord = _normalise(np.stack([_axis_coordinates(y, logy) for y in ys]))
+    drawable = np.isfinite(x_coord) & np.isfinite(y_coord).all(axis=0)
+
+    keep = ~drawable
+    # Simplify each run of consecutive drawable points separately
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], drawable.astype(np.int8), [0]))))
+    for start, end in zip(edges[::2], edges[1::2]):
+        keep[start:end] = _simplify(x_coord[start:end], y_coord[:, start:end], tolerance)
+    return keep
@@ -0,0 +1,89 @@
+"""Allocation-free calculation of tagging discriminants."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+
+def calculate_discriminant(
+    signal_probs: np.ndarray,
+    background_probs: Sequence[np.ndarray],
+    fraction_values: Sequence[float],
+    out: np.ndarray | None = None,
+    buffer: np.ndarray | None = None,
+    epsilon: float = 1e-10,
+) -> np.ndarray:
+    """Calculate the tagging discriminant into preallocated arrays.
+
+    The discriminant is defined as log((p_sig + eps) / (sum_i f_i * p_i + eps)).
+    The operations are carried out in the same order and precision as in
+    `ftag.utils.get_discriminant`, so the results are identical, but all
+    intermediate results are written into `out` and `buffer`. Passing the same
+    `out` and `buffer` for several fraction values therefore avoids any new
+    full-length allocation.
+
+    Parameters
+    ----------
+    signal_probs : np.ndarray
+        1D array with the signal probabilities
+    background_probs : Sequence[np.ndarray]
+        1D arrays with the background probabilities, same length as `signal_probs`
+    fraction_values : Sequence[float]
+        Fraction value for each of the background probabilities
+    out : np.ndarray | None, optional
+        Array the discriminant is written to, by default a new array is allocated
+    buffer : np.ndarray | None, optional
+        Work array for the denominator, by default a new array is allocated
+    epsilon : float, optional
+        Small number to avoid division by zero, by default 1e-10
+
+    Returns
+    -------
+    np.ndarray
+        Array of discriminant values (`out` if it was given)
+
+    Raises
+    ------
+    ValueError
+        If the number of background probabilities and fraction values differ
+        If `out` or `buffer` do not match the shape and dtype of the inputs
+    """
+    if len(background_probs) != len(fraction_values):
+        raise ValueError(
+            f"Got {len(background_probs)} background probabilities but "
+            f"{len(fraction_values)} fraction values."
+        )
+
+    dtype = np.result_type(signal_probs, *background_probs)
+    shape = np.shape(signal_probs)
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    if buffer is None:
+        buffer = np.empty(shape, dtype=dtype)
+    for name, array in (("out", out), ("buffer", buffer)):
+        if array.shape != shape or array.dtype != dtype:
+            raise ValueError(
+                f"`{name}` has shape {array.shape} and dtype {array.dtype}, "
+                f"expected {shape} and {dtype}."
+            )
+
+    # Weighted sum of the background probabilities, using out as scratch space
+    has_background = False
+    for probs, fraction_value in zip(background_probs, fraction_values):
+        if fraction_value == 0:
+            continue
+        if not has_background:
+            np.multiply(probs, float(fraction_value), out=buffer)
+            has_background = True
+        else:
+            np.multiply(probs, float(fraction_value), out=out)
+            np.add(buffer, out, out=buffer)
+    if not has_background:
+        buffer.fill(0)
+
+    np.add(buffer, epsilon, out=buffer)
+    np.add(signal_probs, epsilon, out=out)
+    np.divide(out, buffer, out=out)
+    return np.log(out, out=out)
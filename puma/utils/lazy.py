@@ -0,0 +1,69 @@
+"""Lazy imports of the public objects of a package."""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import Any, Callable
+
+
+def lazy_module(
+    name: str,
+    mapping: dict[str, str],
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Create the module `__getattr__` and `__dir__` importing objects on first access.
+
+    The imported objects are stored in the module, so each one is imported once.
+
+    Parameters
+    ----------
+    name : str
+        Name of the module, i.e. its `__name__`
+    mapping : dict[str, str]
+        Names of the lazily imported objects and the modules they are imported from
+
+    Returns
+    -------
+    tuple[Callable[[str], Any], Callable[[], list[str]]]
+        The `__getattr__` and `__dir__` functions of the module
+
+    Examples
+    --------
+    >>> __getattr__, __dir__ = lazy_module(__name__, {"RocPlot": "puma.roc"})
+    """
+
+    def module_getattr(attr: str) -> Any:
+        """Import the object on first access.
+
+        Parameters
+        ----------
+        attr : str
+            Name of the attribute
+
+        Returns
+        -------
+        Any
+            The requested object
+
+        Raises
+        ------
+        AttributeError
+            If the attribute does not exist
+        """
+        if attr not in mapping:
+            raise AttributeError(f"module {name!r} has no attribute {attr!r}")
+        value = getattr(importlib.import_module(mapping[attr]), attr)
+        setattr(sys.modules[name], attr, value)
+        return value
+
+    def module_dir() -> list[str]:
+        """List the module attributes including the lazily imported ones.
+
+        Returns
+        -------
+        list[str]
+            Attribute names
+        """
+        return sorted({*vars(sys.modules[name]), *mapping})
+
+    return module_getattr, module_dir
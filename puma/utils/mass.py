@@ -4,12 +4,20 @@ from __future__ import annotations
 
 import numpy as np
 
+from puma.utils.parallel import map_jet_chunks
 
-def calculate_vertex_mass(pt, eta, phi, vtx_idx, particle_mass=0.13957):
+
+def calculate_vertex_mass(
+    pt, eta, phi, vtx_idx, particle_mass=0.13957, chunk_size=100_000, n_workers=1
+):
     """
     Calculate the invariant mass of secondary vertices from the track 4-momenta,
     assuming a pion mass hypothesis.
 
+    The track 4-momenta are computed once for all tracks and summed per
+    (jet, vertex) with a single `np.bincount` on a flattened key, processing
+    the jets in chunks to bound the memory usage.
+
     Parameters
     ----------
     pt: np.ndarray
@@ -22,43 +30,94 @@ def calculate_vertex_mass(pt, eta, phi, vtx_idx, particle_mass=0.13957):
         Array of shape (n_jets, n_tracks) containing the vertex indices for each track.
     particle_mass: float, optional
         Mass hypothesis for each particle in GeV. Default is the pion mass.
+    chunk_size: int, optional
+        Number of jets processed at once, by default 100_000.
+    n_workers: int, optional
+        Number of worker processes for the chunks, by default 1.
 
     Returns
     -------
     mass: np.ndarray
-        Array of shape (n_jets, n_tracks) containing the invariant vertex mass for each track.
+        Array of shape (n_jets, n_tracks) containing the invariant vertex mass for each
+        track. Tracks which are not associated to a vertex get a mass of 0.
     """
-    n_jets = pt.shape[0]
-    sv_masses = np.full(pt.shape, -1.0, dtype=float)
-
-    for i in range(n_jets):
-        vtx_idx_i = vtx_idx[i]
-        pt_i = pt[i]
-        eta_i = eta[i]
-        phi_i = phi[i]
-
-        unique_idx = np.unique(vtx_idx_i)
-        unique_idx = unique_idx[unique_idx >= 0]  # remove tracks with negative indices
-        vertices = np.tile(vtx_idx_i, (unique_idx.size, 1))
-        comparison_ids = np.tile(unique_idx, (vtx_idx_i.size, 1)).T
-        vertices = (vertices == comparison_ids).astype(int)
-
-        pt_i = pt_i * vertices  # noqa: PLR6104
-        eta_i = eta_i * vertices  # noqa: PLR6104
-        phi_i = phi_i * vertices  # noqa: PLR6104
-        m_i = particle_mass * vertices
-
-        px_i = pt_i * np.cos(phi_i)
-        py_i = pt_i * np.sin(phi_i)
-        pz_i = pt_i * np.sinh(eta_i)
-        e_i = np.sqrt(px_i**2 + py_i**2 + pz_i**2 + m_i**2)
-
-        px = np.nansum(px_i, axis=1)
-        py = np.nansum(py_i, axis=1)
-        pz = np.nansum(pz_i, axis=1)
-        e = np.nansum(e_i, axis=1)
-
-        m = np.sqrt(e**2 - px**2 - py**2 - pz**2)
-        sv_masses[i] = np.sum(np.tile(m, (vtx_idx_i.size, 1)).T * vertices, axis=0)
+    return map_jet_chunks(
+        _vertex_mass,
+        (pt, eta, phi, vtx_idx),
+        chunk_size=chunk_size,
+        n_workers=n_workers,
+        particle_mass=particle_mass,
+    )
+
 
+def _vertex_mass(pt, eta, phi, vtx_idx, particle_mass):
+    """Calculate the vertex masses for one chunk of jets.
+
+    Parameters
+    ----------
+    pt: np.ndarray
+        Array of shape (n_jets, n_tracks) containing the track transverse momenta (in GeV).
+    eta: np.ndarray
+        Array of shape (n_jets, n_tracks) containing the track pseudorapidities.
+    phi: np.ndarray
+        Array of shape (n_jets, n_tracks) containing the track azimuthal angles.
+    vtx_idx: np.ndarray
+        Array of shape (n_jets, n_tracks) containing the vertex indices for each track.
+    particle_mass: float
+        Mass hypothesis for each particle in GeV.
+
+    Returns
+    -------
+    mass: np.ndarray
+        Array of shape (n_jets, n_tracks) containing the invariant vertex mass for each
+        track.
+    """
+    sv_masses = np.zeros(pt.shape, dtype=float)
+    in_vertex = vtx_idx >= 0  # remove tracks with negative indices
+
+    # unique key for each (jet, vertex) pair, compacted to consecutive numbers
+    jet_idx, trk_idx = np.nonzero(in_vertex)
+    vtx_ids = vtx_idx[jet_idx, trk_idx].astype(np.int64)
+    key = jet_idx * (int(vtx_ids.max(initial=0)) + 1) + vtx_ids
+    _, vertex = np.unique(key, return_inverse=True)
+    n_vertices = int(vertex.max(initial=-1)) + 1
+
+    # track 4-momenta, tracks with NaN entries are ignored in the sums
+    pt = pt[jet_idx, trk_idx].astype(float)
+    eta = eta[jet_idx, trk_idx].astype(float)
+    phi = phi[jet_idx, trk_idx].astype(float)
+    px = pt * np.cos(phi)
+    py = pt * np.sin(phi)
+    pz = pt * np.sinh(eta)
+    e = np.sqrt(px**2 + py**2 + pz**2 + particle_mass**2)
+
+    px, py, pz, e = (
+        np.bincount(vertex, weights=np.nan_to_num(x, nan=0.0), minlength=n_vertices)
+        for x in (px, py, pz, e)
+    )
+    m = np.sqrt(e**2 - px**2 - py**2 - pz**2)
+
+    sv_masses[jet_idx, trk_idx] = m[vertex]
     return sv_masses
+
+
+def unique_vertex_masses(masses):
+    """
+    Get the unique vertex masses of each jet, equivalent to concatenating
+    `np.unique` of each row of `masses` but without looping over the jets.
+
+    Parameters
+    ----------
+    masses: np.ndarray
+        Array of shape (n_jets, n_tracks) with the vertex mass for each track, as
+        returned by `calculate_vertex_mass`.
+
+    Returns
+    -------
+    np.ndarray
+        1D array with the sorted unique masses of each jet, concatenated in jet order.
+    """
+    sorted_masses = np.sort(masses, axis=1)
+    is_unique = np.ones(sorted_masses.shape, dtype=bool)
+    is_unique[:, 1:] = sorted_masses[:, 1:] != sorted_masses[:, :-1]
+    return sorted_masses[is_unique]
@@ -0,0 +1,304 @@
+"""Chunked and parallel execution of functions over jets."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+
+def _as_axes(axes: int | Sequence[int], n_items: int) -> tuple[int, ...]:
+    """Get the jet axis for each of the items.
+
+    Parameters
+    ----------
+    axes : int | Sequence[int]
+        Jet axis of all items or of each item
+    n_items : int
+        Number of items
+
+    Returns
+    -------
+    tuple[int, ...]
+        Jet axis of each item
+
+    Raises
+    ------
+    ValueError
+        If the number of axes does not match the number of items
+    """
+    if isinstance(axes, int):
+        return (axes,) * n_items
+    if len(axes) != n_items:
+        raise ValueError(f"Got {len(axes)} axes for {n_items} items.")
+    return tuple(axes)
+
+
+def _take_chunk(array: np.ndarray | None, axis: int, chunk: slice) -> np.ndarray | None:
+    """Select the jets of a chunk along the jet axis of an array.
+
+    Parameters
+    ----------
+    array : np.ndarray | None
+        Input array, `None` is passed on unchanged
+    axis : int
+        Jet axis of the array
+    chunk : slice
+        Jets of the chunk
+
+    Returns
+    -------
+    np.ndarray | None
+        View of the array for the jets in the chunk
+    """
+    if array is None:
+        return None
+    return array[(slice(None),) * axis + (chunk,)]
+
+
+def _split(result) -> tuple[type | None, list | None, list]:
+    """Split the result of a function into its structure and its arrays.
+
+    Parameters
+    ----------
+    result : np.ndarray | tuple | dict
+        Result of a function
+
+    Returns
+    -------
+    tuple[type | None, list | None, list]
+        Type of the result container (`None` for a single array), the keys for a
+        dict and the list of arrays
+    """
+    if isinstance(result, dict):
+        return dict, list(result), list(result.values())
+    if isinstance(result, tuple):
+        return tuple, None, list(result)
+    return None, None, [result]
+
+
+def _join(structure: type | None, keys: list | None, values: list):
+    """Inverse of `_split`.
+
+    Parameters
+    ----------
+    structure : type | None
+        Type of the result container, `None` for a single array
+    keys : list | None
+        Keys for a dict
+    values : list
+        List of arrays
+
+    Returns
+    -------
+    np.ndarray | tuple | dict
+        Arrays in the original structure
+    """
+    if structure is dict:
+        return dict(zip(keys, values))
+    if structure is tuple:
+        return tuple(values)
+    return values[0]
+
+
+@contextmanager
+def _shared_arrays(arrays: Sequence[np.ndarray | None]):
+    """Copy arrays into shared memory blocks which are released on exit.
+
+    Parameters
+    ----------
+    arrays : Sequence[np.ndarray | None]
+        Arrays to share, `None` entries are skipped
+
+    Yields
+    ------
+    list[tuple | None]
+        The (name, shape, dtype) of each shared memory block, which is cheap to
+        send to other processes
+    """
+    blocks = []
+    try:
+        specs = []
+        for array in arrays:
+            if array is None:
+                specs.append(None)
+                continue
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.copyto(np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf), array)
+            specs.append((block.name, array.shape, array.dtype))
+        yield specs
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _run_chunk(
+    func: Callable,
+    specs: Sequence[tuple | None],
+    in_axes: tuple[int, ...],
+    chunk: slice,
+    kwargs: dict,
+):
+    """Run a function on one chunk of the shared arrays in a worker process.
+
+    Parameters
+    ----------
+    func : Callable
+        Function to run
+    specs : Sequence[tuple | None]
+        Specifications of the shared memory blocks from `_shared_arrays`
+    in_axes : tuple[int, ...]
+        Jet axis of each array
+    chunk : slice
+        Jets of the chunk
+    kwargs : dict
+        Keyword arguments passed on to `func`
+
+    Returns
+    -------
+    np.ndarray | tuple | dict
+        Result of `func` for the chunk, not pointing into the shared memory
+    """
+    blocks = [None if spec is None else SharedMemory(name=spec[0]) for spec in specs]
+    try:
+        arrays = [
+            None if spec is None else np.ndarray(spec[1], dtype=spec[2], buffer=block.buf)
+            for spec, block in zip(specs, blocks)
+        ]
+        inputs = [_take_chunk(array, axis, chunk) for array, axis in zip(arrays, in_axes)]
+        structure, keys, values = _split(func(*inputs, **kwargs))
+
+        # results must not point into the shared memory once it is closed
+        values = [
+            np.array(value)
+            if any(a is not None and np.may_share_memory(value, a) for a in arrays)
+            else value
+            for value in values
+        ]
+        del arrays, inputs
+        return _join(structure, keys, values)
+    finally:
+        for block in blocks:
+            if block is not None:
+                block.close()
+
+
+def _assemble(results: Iterable, chunks: list[slice], n_jets: int, out_axes: int | Sequence[int]):
+    """Write the results of all chunks in order into full-size output arrays.
+
+    Parameters
+    ----------
+    results : Iterable
+        Results of each chunk, in the order of the chunks
+    chunks : list[slice]
+        Jets of each chunk
+    n_jets : int
+        Total number of jets
+    out_axes : int | Sequence[int]
+        Jet axis of all or of each output array
+
+    Returns
+    -------
+    np.ndarray | tuple | dict
+        Outputs for all jets, with the same structure as for one chunk
+    """
+    outputs = None
+    for chunk, result in zip(chunks, results):
+        structure, keys, values = _split(result)
+        if outputs is None:
+            axes = _as_axes(out_axes, len(values))
+            outputs = []
+            for value, axis in zip(values, axes):
+                shape = list(np.shape(value))
+                shape[axis] = n_jets
+                outputs.append(np.empty(shape, dtype=np.asarray(value).dtype))
+        for output, value, axis in zip(outputs, values, axes):
+            output[(slice(None),) * axis + (chunk,)] = value
+
+    return _join(structure, keys, outputs)
+
+
+def map_jet_chunks(
+    func: Callable,
+    arrays: Sequence[np.ndarray | None],
+    chunk_size: int = 100_000,
+    n_workers: int = 1,
+    in_axes: int | Sequence[int] = 0,
+    out_axes: int | Sequence[int] = 0,
+    **kwargs,
+):
+    """Apply a function to chunks of jets and reassemble the results in order.
+
+    The jet arrays are split along their jet axis into chunks of `chunk_size` jets
+    and `func` is called for each chunk. With `n_workers` > 1, the chunks are
+    processed by a pool of worker processes. The input arrays are then copied once
+    into shared memory, so only the chunk boundaries are sent to the workers
+    instead of pickled copies of the arrays.
+
+    Parameters
+    ----------
+    func : Callable
+        Function taking the chunked arrays as positional arguments and returning an
+        array, a tuple of arrays or a dict of arrays. Must be defined at module
+        level to be usable with `n_workers` > 1.
+    arrays : Sequence[np.ndarray | None]
+        Input arrays with the same number of jets along their jet axis, `None`
+        entries are passed on unchanged
+    chunk_size : int, optional
+        Number of jets per chunk, by default 100_000
+    n_workers : int, optional
+        Number of worker processes, by default 1 (run in the current process)
+    in_axes : int | Sequence[int], optional
+        Jet axis of all or of each input array, by default 0
+    out_axes : int | Sequence[int], optional
+        Jet axis of all or of each output array, by default 0
+    **kwargs
+        Keyword arguments passed on to `func`
+
+    Returns
+    -------
+    np.ndarray | tuple | dict
+        Outputs of `func` for all jets, with the same structure as for one chunk
+
+    Raises
+    ------
+    ValueError
+        If the chunk size or the number of workers is smaller than 1
+        If the arrays have different numbers of jets
+    """
+    if chunk_size < 1 or n_workers < 1:
+        raise ValueError(
+            "Chunk size and number of workers must be positive, got "
+            f"{chunk_size} and {n_workers}."
+        )
+    arrays = [None if array is None else np.asarray(array) for array in arrays]
+    in_axes = _as_axes(in_axes, len(arrays))
+    n_jets = {array.shape[axis] for array, axis in zip(arrays, in_axes) if array is not None}
+    if len(n_jets) != 1:
+        raise ValueError(f"Arrays have different numbers of jets: {sorted(n_jets)}.")
+    n_jets = n_jets.pop()
+    chunks = [
+        slice(start, min(start + chunk_size, n_jets)) for start in range(0, n_jets, chunk_size)
+    ] or [slice(0, 0)]
+
+    if n_workers == 1 or len(chunks) == 1:
+        results = (
+            func(*[_take_chunk(a, axis, chunk) for a, axis in zip(arrays, in_axes)], **kwargs)
+            for chunk in chunks
+        )
+        return _assemble(results, chunks, n_jets, out_axes)
+
+    with (
+        _shared_arrays(arrays) as specs,
+        ProcessPoolExecutor(min(n_workers, len(chunks))) as pool,
+    ):
+        results = pool.map(
+            _run_chunk, repeat(func), repeat(specs), repeat(in_axes), chunks, repeat(kwargs)
+        )
+        return _assemble(results, chunks, n_jets, out_axes)
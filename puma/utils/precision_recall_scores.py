@@ -4,13 +4,14 @@ from __future__ import annotations
 
 import numpy as np
 
-from puma.utils.confusion_matrix import confusion_matrix
+from puma.utils.confusion_matrix import _precision_recall, confusion_matrix
 
 
 def precision_recall_scores_per_class(
     targets: np.ndarray,
     predictions: np.ndarray,
     sample_weights: np.ndarray | None = None,
+    n_classes: int | None = None,
 ) -> np.ndarray:
     """
     Compute the per-class precision and recall scores of a classification,
@@ -20,6 +21,8 @@ def precision_recall_scores_per_class(
     where ``tp`` is the number of true positives and ``fp`` is the number of false positives.
     The recall score is defined, for each class, as ``tp / (tp + fn)`` where ``tp`` is the number of
     true positives and ``fn`` is the number of false negatives.
+    The scores of an already filled ``ConfusionMatrixAccumulator`` are given by its
+    ``precision_recall`` method.
 
     Parameters
     ----------
@@ -29,6 +32,8 @@ def precision_recall_scores_per_class(
         predicted labels (output of the classifier)
     sample_weights : np.ndarray, optional
         Weight of each sample; if None, each sample weights the same. Defaults to None.
+    n_classes : int | None, optional
+        Number of classes. If None, the largest label plus one is used. Defaults to None.
 
     Returns
     -------
@@ -46,12 +51,11 @@ def precision_recall_scores_per_class(
     >>> r
     [1.0, 0.0, 0.6]
     """
-    cm = confusion_matrix(targets, predictions, sample_weights=sample_weights, normalize=None)
-    tp = np.diag(cm)
-    with np.errstate(all="warn"):
-        tpfp = np.sum(cm, axis=0)
-        tpfn = np.sum(cm, axis=1)
-        precision = tp / tpfp
-        recall = tp / tpfn
-
-    return np.nan_to_num(precision), np.nan_to_num(recall)
+    cm = confusion_matrix(
+        targets,
+        predictions,
+        sample_weights=sample_weights,
+        normalize=None,
+        n_classes=n_classes,
+    )
+    return _precision_recall(cm)
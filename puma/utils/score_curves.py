@@ -0,0 +1,202 @@
+"""Per-class threshold scans of multi-class classifier scores."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from puma.utils.logger import logger
+
+
+class ScoreCurveAccumulator:
+    """Per-class precision-recall and one-vs-rest ROC curves from score histograms.
+
+    For each class, the scores of that class are histogrammed in fine bins,
+    separately for samples of the class (positives) and all other samples
+    (negatives). All histograms are filled with a single `np.bincount` per batch,
+    so the accumulator can be filled chunk by chunk and accumulators filled in
+    different workers can be merged. The curves are obtained from the reverse
+    cumulative sums of the histograms, using the lower bin edges as thresholds.
+
+    Example
+    --------
+    >>> accumulator = ScoreCurveAccumulator(n_classes=3)
+    >>> for batch_targets, batch_scores in batches:
+    ...     accumulator.fill(batch_targets, batch_scores)
+    >>> precision, recall = accumulator.precision_recall()
+    >>> fpr, tpr = accumulator.roc()
+    """
+
+    def __init__(
+        self,
+        n_classes: int,
+        n_bins: int = 1000,
+        score_range: tuple[float, float] = (0.0, 1.0),
+    ):
+        """Initialise empty score histograms.
+
+        Parameters
+        ----------
+        n_classes : int
+            Number of classes
+        n_bins : int, optional
+            Number of score bins, i.e. thresholds, per class, by default 1000
+        score_range : tuple[float, float], optional
+            Range of the scores, scores outside are put in the first or last bin,
+            by default (0.0, 1.0)
+        """
+        self.n_classes = n_classes
+        self.n_bins = n_bins
+        self.score_range = score_range
+        # (n_classes, 2, n_bins) histograms of negatives [:, 0] and positives [:, 1]
+        self.counts = np.zeros((n_classes, 2, n_bins))
+
+    @property
+    def thresholds(self) -> np.ndarray:
+        """Score thresholds of the curves, the lower edges of the score bins.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (n_bins,) with the thresholds
+        """
+        return np.linspace(*self.score_range, self.n_bins + 1)[:-1]
+
+    def fill(
+        self,
+        targets: np.ndarray,
+        scores: np.ndarray,
+        sample_weights: np.ndarray | None = None,
+        chunk_size: int = 1_000_000,
+    ) -> ScoreCurveAccumulator:
+        """Add a batch of samples to the histograms.
+
+        Samples with non-finite scores, e.g. nan for tracks without a prediction,
+        cannot be binned and are skipped.
+
+        Parameters
+        ----------
+        targets : np.ndarray
+            Target labels of shape (n_samples,)
+        scores : np.ndarray
+            Scores of shape (n_samples, n_classes)
+        sample_weights : np.ndarray, optional
+            Weight of each sample; if None, each sample weights the same.
+            Defaults to None.
+        chunk_size : int, optional
+            Number of samples binned at once, by default 1_000_000
+
+        Returns
+        -------
+        ScoreCurveAccumulator
+            The accumulator itself
+
+        Raises
+        ------
+        ValueError
+            If the shapes of targets, scores and weights do not match
+        """
+        if scores.ndim != 2 or scores.shape != (len(targets), self.n_classes):
+            raise ValueError(
+                f"Expected scores of shape ({len(targets)}, {self.n_classes}), got "
+                f"{scores.shape}."
+            )
+        if sample_weights is not None and len(sample_weights) != len(targets):
+            raise ValueError("Mismatch between targets' and sample weights' size.")
+
+        low, high = self.score_range
+        scale = self.n_bins / (high - low)
+        offset = np.arange(self.n_classes) * 2 * self.n_bins
+        n_skipped = 0
+        for start in range(0, len(targets), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            bins = (np.asarray(scores[chunk], dtype=np.float64) - low) * scale
+            finite = np.isfinite(bins).all(axis=1)
+            chunk_targets = np.asarray(targets[chunk], dtype=np.intp)
+            chunk_weights = None if sample_weights is None else sample_weights[chunk]
+            if not finite.all():
+                n_skipped += np.count_nonzero(~finite)
+                bins, chunk_targets = bins[finite], chunk_targets[finite]
+                if chunk_weights is not None:
+                    chunk_weights = chunk_weights[finite]
+            np.clip(bins, 0, self.n_bins - 1, out=bins)
+            index = bins.astype(np.intp)
+            index += offset
+            index[np.arange(len(index)), chunk_targets] += self.n_bins
+            weights = None
+            if chunk_weights is not None:
+                weights = np.repeat(chunk_weights, self.n_classes)
+            self.counts += np.bincount(
+                index.ravel(), weights=weights, minlength=self.counts.size
+            ).reshape(self.counts.shape)
+        if n_skipped:
+            logger.warning("Skipped %i samples with non-finite scores.", n_skipped)
+        return self
+
+    def merge(self, *others: ScoreCurveAccumulator) -> ScoreCurveAccumulator:
+        """Add the histograms of other accumulators, e.g. filled in other workers.
+
+        Parameters
+        ----------
+        *others : ScoreCurveAccumulator
+            Accumulators with the same classes and binning
+
+        Returns
+        -------
+        ScoreCurveAccumulator
+            The accumulator itself
+
+        Raises
+        ------
+        ValueError
+            If the classes or the binning differ
+        """
+        for other in others:
+            if (other.n_classes, other.n_bins, tuple(other.score_range)) != (
+                self.n_classes,
+                self.n_bins,
+                tuple(self.score_range),
+            ):
+                raise ValueError("Cannot merge accumulators with different classes or binning.")
+            self.counts += other.counts
+        return self
+
+    def pass_counts(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the (weighted) number of samples passing each threshold.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            True positives and false positives, arrays of shape (n_classes, n_bins)
+            with the number of positives and negatives with a score above the
+            threshold
+        """
+        passing = np.cumsum(self.counts[..., ::-1], axis=-1)[..., ::-1]
+        return passing[:, 1], passing[:, 0]
+
+    def precision_recall(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the per-class precision-recall curves.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Precision and recall, arrays of shape (n_classes, n_bins). The precision
+            is nan for thresholds without passing samples.
+        """
+        tp, fp = self.pass_counts()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            precision = tp / (tp + fp)
+            recall = tp / tp[:, :1]
+        return precision, recall
+
+    def roc(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the per-class one-vs-rest ROC curves.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            False positive rate and true positive rate, arrays of shape
+            (n_classes, n_bins)
+        """
+        tp, fp = self.pass_counts()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return fp / fp[:, :1], tp / tp[:, :1]
@@ -4,14 +4,25 @@ from __future__ import annotations
 
 import numpy as np
 
+from puma.utils.parallel import map_jet_chunks
+
 
 def GetOrderedHadrons(
     hadron_barcode: np.ndarray,
     hadron_parent: np.ndarray,
     n_max_showers: int = 2,
+    chunk_size: int = 100_000,
+    n_workers: int = 1,
 ) -> np.ndarray:
     """Orderes the hadron indices inside each jet in different showers.
 
+    A shower (family) is formed by a parent hadron and all hadrons pointing to it
+    as their parent. Showers are ordered by decreasing size, followed by the
+    hadrons without parent which are not parents themselves, each forming its own
+    shower. All jets are processed at once on the padded arrays; only for jets
+    with several showers of equal size, the tie is resolved in the order of the
+    parent barcode set of the jet.
+
     Parameters
     ----------
     hadron_barcode : np.ndarray
@@ -20,99 +31,126 @@ def GetOrderedHadrons(
         Array with the truth parent barcodes
     n_max_showers : int, optional
         Maximum number of showers, by default 2
+    chunk_size : int, optional
+        Number of jets processed at once, by default 100_000
+    n_workers : int, optional
+        Number of worker processes for the chunks, by default 1
 
     Returns
     -------
     np.ndarray
         Padded array of indices with shape (n_jets, n_showers, n_hadrons)
     """
-    n_jets, n_hadrons = hadron_barcode.shape
+    return map_jet_chunks(
+        _ordered_hadrons,
+        (hadron_barcode, hadron_parent),
+        chunk_size=chunk_size,
+        n_workers=n_workers,
+        n_max_showers=n_max_showers,
+    )
 
-    set_parent_barcodes = [set(row[row > 0]) for row in hadron_parent]
 
-    # Get indices for the parton shower within a family
-    child_indices = [
-        [
-            [index for index, hadron in enumerate(hadron_list) if hadron == parent]
-            for parent in parent_set
-        ]
-        for hadron_list, parent_set in zip(hadron_parent, set_parent_barcodes)
-    ]
-    parent_index = [
-        [
-            [index for index, hadron in enumerate(hadron_list) if hadron == parent]
-            for parent in parent_set
-        ]
-        for hadron_list, parent_set in zip(hadron_barcode, set_parent_barcodes)
-    ]
-    family_indices = [
-        [j + c[k] for k, j in enumerate(p)] for p, c in zip(parent_index, child_indices)
-    ]
-
-    # Now reshuffle them to keep always first the longest shower!
-    #######################################################################################################
-    # Calculate lengths for all family_indices
-    lengths = np.array([len(family) for family in family_indices], dtype=object)
-
-    # Create a mask for jets with more than one family member
-    mask = lengths > 1
-
-    # Create reshuffle indices only for those jets that have more than one family
-    reshuffle = np.empty((n_jets, n_max_showers), dtype=object)  # n_max_shower
-
-    reshuffle_indices = [
-        np.argsort([len(elem) for elem in family_indices[i]])[::-1]
-        for i in range(n_jets)
-        if mask[i]
-    ]
-    reshuffle_indices = [idx[:n_max_showers] for idx in reshuffle_indices]
-    if np.array(reshuffle_indices).size > 0:
-        reshuffle[mask] = reshuffle_indices
-
-    # Initialize sorted_family_indices
-    sorted_family_indices = np.empty(n_jets, dtype=object)
-
-    # Use the reshuffle to sort family_indices
-    for i in range(n_jets):
-        if mask[i]:  # Check if the jet has more than one family member
-            sorted_indices = reshuffle[i]
-            sorted_family_indices[i] = [family_indices[i][idx] for idx in sorted_indices]
-        else:
-            sorted_family_indices[i] = family_indices[i]  # Keep it unchanged if not applicable
-
-    # Convert to numpy array if desired
-    sorted_family_indices = np.array(sorted_family_indices, dtype=object)
-
-    #######################################################################################################
-
-    # Deal with the unrelated hadrons
-
-    orphan_barcodes = np.where(
-        (hadron_parent < 0) & (hadron_barcode > 0), hadron_barcode, 0
-    )  # hadrons without parents
-    unrelated_indices = [
+def _ordered_hadrons(
+    hadron_barcode: np.ndarray,
+    hadron_parent: np.ndarray,
+    n_max_showers: int,
+) -> np.ndarray:
+    """Order the hadron indices in showers for one chunk of jets.
+
+    Parameters
+    ----------
+    hadron_barcode : np.ndarray
+        Array with the hadron barcode
+    hadron_parent : np.ndarray
+        Array with the truth parent barcodes
+    n_max_showers : int
+        Maximum number of showers
+
+    Returns
+    -------
+    np.ndarray
+        Padded array of indices with shape (n_jets, n_showers, n_hadrons)
+    """
+    n_jets, n_hadrons = hadron_barcode.shape
+    positions = np.arange(n_hadrons)
+
+    # Each family is represented by the first hadron pointing to its parent
+    has_parent = hadron_parent > 0
+    same_parent = hadron_parent[:, :, np.newaxis] == hadron_parent[:, np.newaxis, :]
+    earlier = positions[np.newaxis, :] < positions[:, np.newaxis]
+    is_family = has_parent & ~np.any(same_parent & earlier, axis=2)
+
+    # Family size: parent hadrons plus children
+    is_parent_of = hadron_barcode[:, np.newaxis, :] == hadron_parent[:, :, np.newaxis]
+    family_size = np.where(
+        is_family,
+        np.sum(is_parent_of, axis=2) + np.sum(same_parent & has_parent[:, :, np.newaxis], axis=2),
+        0,
+    )
+
+    # Hadrons without parent which are not a parent themselves
+    is_orphan = (hadron_parent < 0) & (hadron_barcode > 0) & ~np.any(is_parent_of, axis=1)
+
+    # Families of equal size are ordered as in the set of parent barcodes, this
+    # is only needed if the tie affects the selected showers
+    tie_break = np.zeros((n_jets, n_hadrons), dtype=np.int64)
+    n_larger = np.sum(
+        is_family[:, np.newaxis, :]
+        & (family_size[:, np.newaxis, :] > family_size[:, :, np.newaxis]),
+        axis=2,
+    )
+    is_tied = np.any(
+        (family_size[:, :, np.newaxis] == family_size[:, np.newaxis, :])
+        & (is_family & (n_larger < n_max_showers))[:, :, np.newaxis]
+        & is_family[:, np.newaxis, :]
+        & ~np.eye(n_hadrons, dtype=bool),
+        axis=(1, 2),
+    )
+    tied_families = {}
+    for i, parents in zip(np.flatnonzero(is_tied), hadron_parent[is_tied].tolist()):
+        family = {}
+        for k, parent in enumerate(parents):
+            if parent > 0:
+                family.setdefault(parent, k)
+        families = [family[parent] for parent in {p for p in parents if p > 0}]
+        tied_families.setdefault(len(families), []).append([i, *families])
+    for n_families, tied_rows in tied_families.items():
+        rows = np.array(tied_rows)
+        order = np.argsort(family_size[rows[:, :1], rows[:, 1:]], axis=1)[:, ::-1]
+        ordered = np.take_along_axis(rows[:, 1:], order, axis=1)
+        tie_break[rows[:, :1], ordered] = np.arange(n_families)
+
+    # Rank the candidate showers: families first, then the unrelated hadrons
+    shower_key = np.concatenate(
         [
-            [index]
-            for index, hadron in enumerate(hadron_list)
-            if (hadron not in parent_set) and (hadron > 0)
-        ]
-        for hadron_list, parent_set in zip(orphan_barcodes, set_parent_barcodes)
-    ]  # remove parents
-    extended_family_indices = [
-        f + u for f, u in zip(sorted_family_indices.copy(), unrelated_indices)
-    ]
-
-    # Now select the more important (first) shower and pad the indices!
-
-    # Initializethe padded array with -1
+            np.where(is_family, tie_break - family_size * (n_hadrons + 1), n_hadrons),
+            np.where(is_orphan, positions, n_hadrons),
+        ],
+        axis=1,
+    )
+    n_showers = min(n_max_showers, 2 * n_hadrons)
+    showers = np.argsort(shower_key, axis=1, kind="stable")[:, :n_showers]
+    valid = np.take_along_axis(shower_key, showers, axis=1) < n_hadrons
+    is_family_shower = (showers < n_hadrons)[:, :, np.newaxis]
+    index = showers % n_hadrons
+
+    # Members of the selected showers: parents first, then the children
+    parent = np.take_along_axis(hadron_parent, index, axis=1)[:, :, np.newaxis]
+    is_parent = is_family_shower & (hadron_barcode[:, np.newaxis, :] == parent)
+    is_child = is_family_shower & (hadron_parent[:, np.newaxis, :] == parent)
+    is_child |= ~is_family_shower & (positions == index[:, :, np.newaxis])
+    member_key = np.where(
+        np.concatenate([is_parent, is_child], axis=2) & valid[:, :, np.newaxis],
+        np.arange(2 * n_hadrons),
+        2 * n_hadrons,
+    )
+    member_key = np.sort(member_key, axis=2)[:, :, :n_hadrons]
+
+    # Initialize the padded array with -1
     padded_hadron_indices = np.full((n_jets, n_max_showers, n_hadrons), -1)
-
-    # Fill the padded array
-    for i, jet in enumerate(extended_family_indices):
-        for j, shower in enumerate(jet):
-            if j < n_max_showers:  # Limit the amount of showers
-                hadrons_to_fill = shower[:n_hadrons]  # Limit to max number of hadrons
-                padded_hadron_indices[i, j, : len(hadrons_to_fill)] = hadrons_to_fill
+    padded_hadron_indices[:, :n_showers] = np.where(
+        member_key < 2 * n_hadrons, member_key % n_hadrons, -1
+    )
 
     return padded_hadron_indices
 
@@ -121,9 +159,15 @@ def AssociateTracksToHadron(
     track_parent: np.ndarray,
     hadron_barcode: np.ndarray,
     hadron_mask: np.ndarray,
+    chunk_size: int = 100_000,
+    n_workers: int = 1,
 ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Associcate the tracks to the hadrons.
 
+    The jets are processed in chunks and the association is written into a
+    boolean output array, so that the peak memory stays a small multiple of the
+    output size.
+
     Parameters
     ----------
     track_parent : np.ndarray
@@ -132,6 +176,48 @@ def AssociateTracksToHadron(
         Array with the hadron barcodes
     hadron_mask : np.ndarray
         Array with the hadron mask
+    chunk_size : int, optional
+        Number of jets processed at once, by default 100_000
+    n_workers : int, optional
+        Number of worker processes for the chunks, by default 1
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        Tuple of arrays with the track_to_hadron, inclusive_track_first_hadron,
+        and the inclusive_track_hadron array. The track_to_hadron array is a
+        boolean array of shape (n_hadrons, n_jets, n_tracks), the inclusive arrays
+        count the associated hadrons per track as int32.
+    """
+    n_jets = track_parent.shape[0]
+    n_hadrons = hadron_barcode.shape[1]
+    hadron_mask = np.asarray(hadron_mask, dtype=bool).reshape(n_hadrons, n_jets)
+
+    return map_jet_chunks(
+        _associate_tracks_to_hadron,
+        (track_parent, hadron_barcode, hadron_mask),
+        chunk_size=chunk_size,
+        n_workers=n_workers,
+        in_axes=(0, 0, 1),
+        out_axes=(1, 0, 0),
+    )
+
+
+def _associate_tracks_to_hadron(
+    track_parent: np.ndarray,
+    hadron_barcode: np.ndarray,
+    hadron_mask: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Associate the tracks to the hadrons for one chunk of jets.
+
+    Parameters
+    ----------
+    track_parent : np.ndarray
+        Array with the track parents of shape (n_jets, n_tracks)
+    hadron_barcode : np.ndarray
+        Array with the hadron barcodes of shape (n_jets, n_hadrons)
+    hadron_mask : np.ndarray
+        Boolean hadron mask of shape (n_hadrons, n_jets)
 
     Returns
     -------
@@ -142,33 +228,24 @@ def AssociateTracksToHadron(
     n_jets, n_tracks = track_parent.shape
     n_hadrons = hadron_barcode.shape[1]
 
-    track_parent = np.where(
-        track_parent < 0, np.nan, track_parent
-    )  # use NAN so that they never match
-    track_to_hadron_array = np.array([
-        np.where(track_parent == hadron_barcode[:, k][:, np.newaxis], 1, 0)
-        for k in range(n_hadrons)
-    ])  # n_hadrons change to variable
-
-    # build the inclusive vertex if needed
-    inclusive_track_hadron = np.sum(track_to_hadron_array, axis=0)
-
-    # Sum tracks from hadrons in the parton shower (applying the mask)
-    track_hadron_mask = np.repeat(hadron_mask, n_tracks).reshape(n_hadrons, n_jets, n_tracks)
-    inclusive_track_first_hadron = np.sum(
-        np.where(track_hadron_mask, track_to_hadron_array, 0), axis=0
-    )  # apply mask and sum across the first dimension
-
-    # mask out hadrons with only one associated track
-    mask_array = [
-        np.repeat(
-            np.where(np.sum(track_to_hadron_array[k], axis=1) >= 2, 1, 0)[:, np.newaxis], n_tracks
-        ).reshape(n_jets, n_tracks)
-        for k in range(n_hadrons)
-    ]
-    track_to_hadron_array = np.where(mask_array, track_to_hadron_array, mask_array)
-
-    return np.array(track_to_hadron_array), inclusive_track_first_hadron, inclusive_track_hadron
+    track_to_hadron_array = np.zeros((n_hadrons, n_jets, n_tracks), dtype=bool)
+    inclusive_track_hadron = np.zeros((n_jets, n_tracks), dtype=np.int32)
+    inclusive_track_first_hadron = np.zeros_like(inclusive_track_hadron)
+
+    is_valid = track_parent >= 0  # tracks with negative parents never match
+    for k in range(n_hadrons):
+        track_to_hadron = track_to_hadron_array[k]
+        np.equal(track_parent, hadron_barcode[:, k, np.newaxis], out=track_to_hadron)
+        track_to_hadron &= is_valid
+
+        # build the inclusive vertex and the sum of tracks in the parton shower
+        inclusive_track_hadron += track_to_hadron
+        inclusive_track_first_hadron += track_to_hadron & hadron_mask[k, :, np.newaxis]
+
+        # mask out hadrons with only one associated track
+        track_to_hadron &= (np.count_nonzero(track_to_hadron, axis=1) >= 2)[:, np.newaxis]
+
+    return track_to_hadron_array, inclusive_track_first_hadron, inclusive_track_hadron
 
 
 def SelectHadron(truth_hadrons: np.ndarray, hadron_index: np.ndarray) -> np.ndarray:
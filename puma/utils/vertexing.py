@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import numpy as np
 
+from puma.utils.parallel import map_jet_chunks
+
 
 def clean_indices(vertex_ids, condition, mode="remove"):
     """
@@ -137,16 +139,141 @@ def associate_vertices(test_vertices, ref_vertices, eff_req, purity_req):
     return associations, common_tracks
 
 
+def build_vertex_labels(vertex_ids):
+    """
+    Batched vertex builder that assigns consecutive vertex labels to the tracks
+    of each jet. The labels follow the order of the vertices returned by
+    `build_vertices`, i.e. ascending vertex index. Negative indices and one-track
+    vertices are ignored and get the label -1.
+
+    Parameters
+    ----------
+    vertex_ids: np.ndarray
+        Array of shape (n_jets, n_tracks) containing vertex IDs for each track.
+
+    Returns
+    -------
+    labels: np.ndarray
+        Array of shape (n_jets, n_tracks) containing the vertex label of each track.
+    n_vertices: np.ndarray
+        Array of shape (n_jets) containing the number of vertices per jet.
+    """
+    n_jets, n_tracks = vertex_ids.shape
+    order = np.argsort(vertex_ids, axis=1, kind="stable")
+    sorted_ids = np.take_along_axis(vertex_ids, order, axis=1)
+
+    # find runs of equal indices in the sorted indices and their sizes
+    run_start = np.ones(sorted_ids.shape, dtype=bool)
+    run_start[:, 1:] = sorted_ids[:, 1:] != sorted_ids[:, :-1]
+    run_index = np.cumsum(run_start, axis=1) - 1
+    run_index += np.arange(n_jets)[:, None] * n_tracks
+    run_size = np.bincount(run_index.ravel(), minlength=n_jets * n_tracks)[run_index]
+
+    # label the runs with more than one track and non-negative index
+    valid = (run_size > 1) & (sorted_ids >= 0)
+    valid_start = run_start & valid
+    sorted_labels = np.where(valid, np.cumsum(valid_start, axis=1) - 1, -1)
+
+    labels = np.empty_like(sorted_labels)
+    np.put_along_axis(labels, order, sorted_labels, axis=1)
+    return labels, valid_start.sum(axis=1)
+
+
+def _associate_vertices_batched(test_labels, ref_labels, n_test, n_ref, eff_req, purity_req):
+    """
+    Batched version of `associate_vertices` for padded vertex labels of several
+    jets, with the vertex dimension bounded by the maximum number of vertices.
+
+    Parameters
+    ----------
+    test_labels: np.ndarray
+        Array of shape (n_jets, n_tracks) with the reco vertex label of each track.
+    ref_labels: np.ndarray
+        Array of shape (n_jets, n_tracks) with the truth vertex label of each track.
+    n_test: np.ndarray
+        Array of shape (n_jets) with the number of reco vertices per jet.
+    n_ref: np.ndarray
+        Array of shape (n_jets) with the number of truth vertices per jet.
+    eff_req: float
+        Minimum required efficiency for vertex matching.
+    purity_req: float
+        Minimum required purity for vertex matching.
+
+    Returns
+    -------
+    associations: np.ndarray
+        Boolean array of shape (n_jets, n_vtx, n_vtx) with the vertex associations.
+    common_tracks: np.ndarray
+        Array of shape (n_jets, n_vtx, n_vtx) with the number of common tracks.
+    test_sizes: np.ndarray
+        Array of shape (n_jets, n_vtx) with the number of tracks per reco vertex.
+    ref_sizes: np.ndarray
+        Array of shape (n_jets, n_vtx) with the number of tracks per truth vertex.
+    """
+    n_jets = test_labels.shape[0]
+    n_vtx = max(int(n_test.max(initial=0)), int(n_ref.max(initial=0)), 1)
+    jet_offset = np.arange(n_jets)[:, None]
+
+    # vertex sizes and number of shared tracks for each vertex pairing
+    def count(keys, mask, size):
+        return np.bincount(keys[mask], minlength=n_jets * size)
+
+    test_sizes = count(jet_offset * n_vtx + test_labels, test_labels >= 0, n_vtx)
+    ref_sizes = count(jet_offset * n_vtx + ref_labels, ref_labels >= 0, n_vtx)
+    common_tracks = count(
+        (jet_offset * n_vtx + test_labels) * n_vtx + ref_labels,
+        (test_labels >= 0) & (ref_labels >= 0),
+        n_vtx * n_vtx,
+    ).reshape(n_jets, n_vtx, n_vtx)
+    test_sizes = test_sizes.reshape(n_jets, n_vtx)
+    ref_sizes = ref_sizes.reshape(n_jets, n_vtx)
+
+    # only pairings of existing vertices are considered
+    vtx_range = np.arange(n_vtx)
+    valid = (vtx_range[None, :, None] < n_test[:, None, None]) & (
+        vtx_range[None, None, :] < n_ref[:, None, None]
+    )
+    with np.errstate(divide="ignore"):
+        inv_ref_size = np.broadcast_to(1.0 / ref_sizes[:, None, :], valid.shape)
+        inv_test_size = np.broadcast_to(1.0 / test_sizes[:, :, None], valid.shape)
+    pair_index = (n_test * n_ref)[:, None, None] - (
+        vtx_range[None, :, None] * n_ref[:, None, None] + vtx_range[None, None, :]
+    )
+
+    # same greedy matching as in `associate_vertices`, padded pairings are set to a
+    # value below the one of excluded pairings so that they never take part
+    associations = valid.copy()
+    for metric in [common_tracks, inv_ref_size, inv_test_size, pair_index]:
+        metric = np.where(associations, metric, -1.0)  # noqa: PLW2901
+        metric[~valid] = -2.0
+        col_max = np.amax(metric, axis=1, keepdims=True)
+        row_max = np.amax(metric, axis=2, keepdims=True)
+        associations = (metric == col_max) & (metric == row_max) & (metric != -1) & valid
+    associations &= common_tracks != 0
+
+    # enforce purity and efficiency requirements
+    with np.errstate(invalid="ignore"):
+        eff_cut = common_tracks * inv_ref_size >= eff_req
+        purity_cut = common_tracks * inv_test_size >= purity_req
+    associations &= eff_cut & purity_cut
+
+    return associations, common_tracks, test_sizes, ref_sizes
+
+
 def calculate_vertex_metrics(
     test_indices,
     ref_indices,
     max_vertices=20,
     eff_req=0.65,
     purity_req=0.5,
+    chunk_size=10_000,
+    n_workers=1,
 ):
     """
     Vertex metric calculator that outputs a set of metrics useful for evaluating
-    vertexing performance for each jet.
+    vertexing performance for each jet. The jets are processed in chunks, with the
+    vertex matching of `associate_vertices` carried out for all jets of a chunk
+    at once.
 
     Parameters
     ----------
@@ -162,6 +289,10 @@ def calculate_vertex_metrics(
         Minimum required efficiency for vertex matching, by default 0.65.
     purity_req: float, optional
         Minimum required purity for vertex matching, by default 0.5.
+    chunk_size: int, optional
+        Number of jets processed at once, by default 10_000.
+    n_workers: int, optional
+        Number of worker processes for the chunks, by default 1.
 
     Returns
     -------
@@ -187,53 +318,75 @@ def calculate_vertex_metrics(
     assert (
         ref_indices.shape == test_indices.shape
     ), "Truth and reco vertex arrays must have the same shape."
+
+    return map_jet_chunks(
+        _vertex_metrics,
+        (test_indices, ref_indices),
+        chunk_size=chunk_size,
+        n_workers=n_workers,
+        max_vertices=max_vertices,
+        eff_req=eff_req,
+        purity_req=purity_req,
+    )
+
+
+def _vertex_metrics(test_indices, ref_indices, max_vertices, eff_req, purity_req):
+    """
+    Calculate the vertexing metrics of `calculate_vertex_metrics` for one chunk of jets.
+
+    Parameters
+    ----------
+    test_indices: np.ndarray
+        Array of shape (n_jets, n_tracks) containing vertex indices to be tested (reco).
+    ref_indices: np.ndarray
+        Array of shape (n_jets, n_tracks) containing vertex indices to use as
+        reference (truth).
+    max_vertices: int
+        Maximum number of matched vertices to write out.
+    eff_req: float
+        Minimum required efficiency for vertex matching.
+    purity_req: float
+        Minimum required purity for vertex matching.
+
+    Returns
+    -------
+    metrics: dict
+        Dictionary containing the metrics described in `calculate_vertex_metrics`.
+    """
     n_jets = ref_indices.shape[0]
 
+    test_labels, n_test = build_vertex_labels(test_indices)
+    ref_labels, n_ref = build_vertex_labels(ref_indices)
+    associations, common_tracks, test_sizes, ref_sizes = _associate_vertices_batched(
+        test_labels,
+        ref_labels,
+        n_test,
+        n_ref,
+        eff_req=eff_req,
+        purity_req=purity_req,
+    )
+
+    # write out vertexing efficiency metrics
     metrics = {}
-    metrics["n_match"] = np.zeros(n_jets, dtype=int)
-    metrics["n_test"] = np.zeros(n_jets, dtype=int)
-    metrics["n_ref"] = np.zeros(n_jets, dtype=int)
+    metrics["n_match"] = associations.sum(axis=(1, 2))
+    metrics["n_test"] = n_test
+    metrics["n_ref"] = n_ref
     metrics["track_overlap"] = np.full((n_jets, max_vertices), -1)
     metrics["test_vertex_size"] = np.full((n_jets, max_vertices), -1)
     metrics["ref_vertex_size"] = np.full((n_jets, max_vertices), -1)
 
-    for i in range(n_jets):
-        ref_vertices = build_vertices(ref_indices[i])
-        test_vertices = build_vertices(test_indices[i])
-
-        # handle edge cases
-        if not ref_vertices.any() and not test_vertices.any():
-            continue
-        if not ref_vertices.any():
-            metrics["n_test"][i] = test_vertices.shape[0]
-            continue
-        if not test_vertices.any():
-            metrics["n_ref"][i] = ref_vertices.shape[0]
-            continue
-
-        associations, common_tracks = associate_vertices(
-            test_vertices,
-            ref_vertices,
-            eff_req=eff_req,
-            purity_req=purity_req,
-        )
-
-        # write out vertexing efficiency metrics
-        metrics["n_match"][i] = np.sum(associations)
-        metrics["n_ref"][i] = ref_vertices.shape[0]
-        metrics["n_test"][i] = test_vertices.shape[0]
-
-        # only save purity metrics for requested number of vertices
-        max_index = min(metrics["n_match"][i], max_vertices)
-
-        # write out vertexing purity metrics
-        metrics["track_overlap"][i, :max_index] = common_tracks[associations][:max_index]
-        metrics["test_vertex_size"][i, :max_index] = test_vertices[
-            associations.sum(axis=1).astype(bool)
-        ].sum(axis=1)[:max_index]
-        metrics["ref_vertex_size"][i, :max_index] = ref_vertices[
-            associations.sum(axis=0).astype(bool)
-        ].sum(axis=1)[:max_index]
+    # write out vertexing purity metrics for the requested number of vertices,
+    # ordered by reco vertex (overlap and reco size) and truth vertex (truth size)
+    for name, matched, values in [
+        ("track_overlap", associations.reshape(n_jets, -1), common_tracks),
+        ("test_vertex_size", associations.any(axis=2), test_sizes),
+        ("ref_vertex_size", associations.any(axis=1), ref_sizes),
+    ]:
+        rank = np.cumsum(matched, axis=1) - 1
+        jet_idx, vtx_idx = np.nonzero(matched & (rank < max_vertices))
+        metrics[name][jet_idx, rank[jet_idx, vtx_idx]] = values.reshape(n_jets, -1)[
+            jet_idx, vtx_idx
+        ]
 
     return metrics
 
@@ -343,3 +496,177 @@ def clean_reco_vertices(
         )
 
     return reco_vertices
+
+
+def _vertex_groups(vertex_ids):
+    """
+    Group the tracks of each jet by their vertex index.
+
+    Parameters
+    ----------
+    vertex_ids: np.ndarray
+        Array of shape (n_jets, n_tracks) containing vertex IDs for each track.
+
+    Returns
+    -------
+    groups: np.ndarray
+        Array of shape (n_jets, n_tracks) containing for each track a group number,
+        which is unique across all jets and increases with the vertex index
+        within a jet.
+    n_groups: int
+        Total number of groups.
+    """
+    n_jets, n_tracks = vertex_ids.shape
+    order = np.argsort(vertex_ids, axis=1, kind="stable")
+    sorted_ids = np.take_along_axis(vertex_ids, order, axis=1)
+    group_start = np.ones(sorted_ids.shape, dtype=bool)
+    group_start[:, 1:] = sorted_ids[:, 1:] != sorted_ids[:, :-1]
+    sorted_groups = np.cumsum(group_start.ravel()).reshape(n_jets, n_tracks) - 1
+
+    groups = np.empty_like(sorted_groups)
+    np.put_along_axis(groups, order, sorted_groups, axis=1)
+    return groups, int(group_start.sum())
+
+
+def _any_in_vertex(vertex_ids, flag):
+    """
+    Check for each track whether any track of the same vertex in the jet is flagged.
+
+    Parameters
+    ----------
+    vertex_ids: np.ndarray
+        Array of shape (n_jets, n_tracks) containing vertex IDs for each track.
+    flag: np.ndarray
+        Boolean array of shape (n_jets, n_tracks).
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array of shape (n_jets, n_tracks).
+    """
+    groups, n_groups = _vertex_groups(vertex_ids)
+    return (np.bincount(groups[flag], minlength=n_groups) > 0)[groups]
+
+
+def merge_indices_batched(vertex_ids, condition):
+    """
+    Batched version of the "merge" mode of `clean_indices`. For each jet in
+    which the tracks fulfilling the condition have more than one distinct
+    vertex index, these tracks are merged into a new vertex with the index
+    of the largest index in the jet plus one.
+
+    Parameters
+    ----------
+    vertex_ids: np.ndarray
+        Array of shape (n_jets, n_tracks) containing vertex IDs for each track.
+        The array is modified in place.
+    condition: np.ndarray
+        Boolean array of shape (n_jets, n_tracks) containing the condition
+        to be applied. Must be a function of the vertex index.
+
+    Returns
+    -------
+    vertex_ids: np.ndarray
+        Array containing vertex IDs for each track.
+    """
+    if vertex_ids.size == 0:
+        return vertex_ids
+    groups, n_groups = _vertex_groups(vertex_ids)
+    in_condition = np.zeros(n_groups, dtype=bool)
+    in_condition[groups[condition]] = True
+    jet_of_group = np.empty(n_groups, dtype=int)
+    jet_of_group[groups] = np.arange(vertex_ids.shape[0])[:, None]
+    n_distinct = np.bincount(jet_of_group[in_condition], minlength=vertex_ids.shape[0])
+
+    merge = condition & (n_distinct > 1)[:, None]
+    new_ids = np.broadcast_to(np.max(vertex_ids, axis=1, keepdims=True) + 1, vertex_ids.shape)
+    vertex_ids[merge] = new_ids[merge]
+    return vertex_ids
+
+
+def clean_truth_vertices_batched(truth_vertices, truth_track_origin, incl_vertexing=False):
+    """
+    Batched version of `clean_truth_vertices` for all jets at once.
+
+    Parameters
+    ----------
+    truth_vertices: np.ndarray
+        Array of shape (n_jets, n_tracks) containing truth vertex indices.
+    truth_track_origin: np.ndarray
+        Array of shape (n_jets, n_tracks) containing truth track origin labels.
+    incl_vertexing: bool, optional
+        Whether to merge all vertex indices, by default False.
+
+    Returns
+    -------
+    truth_vertices: np.ndarray
+        Array of shape (n_jets, n_tracks) containing cleaned truth vertex indices.
+    """
+    truth_vertices = np.array(truth_vertices)
+
+    # remove vertices that aren't purely HF
+    not_hf = np.isin(truth_track_origin, [3, 4, 5], invert=True)
+    truth_vertices[_any_in_vertex(truth_vertices, not_hf)] = -99
+
+    # merge truth vertices from HF for inclusive performance
+    if incl_vertexing:
+        truth_vertices = merge_indices_batched(truth_vertices, truth_vertices > 0)
+
+    return truth_vertices
+
+
+def clean_reco_vertices_batched(
+    reco_vertices, reco_track_origin=None, incl_vertexing=False, require_hf_track=True
+):
+    """
+    Batched version of `clean_reco_vertices` for all jets at once.
+
+    Parameters
+    ----------
+    reco_vertices: np.ndarray
+        Array of shape (n_jets, n_tracks) containing reco vertex indices.
+    reco_track_origin: np.ndarray, optional
+        Array of shape (n_jets, n_tracks) containing reco track origin labels.
+    incl_vertexing: bool, optional
+        Whether to merge all vertex indices, by default False.
+    require_hf_track: bool, optional
+        Whether to require at least one track from HF to keep a vertex, by default True.
+
+    Returns
+    -------
+    reco_vertices: np.ndarray
+        Array of shape (n_jets, n_tracks) containing cleaned reco vertex indices.
+    """
+    reco_vertices = np.array(reco_vertices)
+
+    # elaborate cleaning if track origin predictions are available
+    if reco_track_origin is not None and reco_vertices.size > 0:
+        n_jets = reco_vertices.shape[0]
+
+        # remove vertex with most reco PV tracks, ties are broken by the lowest index
+        groups, n_groups = _vertex_groups(reco_vertices)
+        pv_counts = np.bincount(groups[reco_track_origin == 2], minlength=n_groups)
+        jet_of_group = np.empty(n_groups, dtype=int)
+        jet_of_group[groups] = np.arange(n_jets)[:, None]
+        group_order = np.lexsort((np.arange(n_groups), -pv_counts, jet_of_group))
+        first = np.ones(n_groups, dtype=bool)
+        first[1:] = jet_of_group[group_order[1:]] != jet_of_group[group_order[:-1]]
+        is_pv = np.zeros(n_groups, dtype=bool)
+        pv_groups = group_order[first]
+        is_pv[pv_groups[pv_counts[pv_groups] > 0]] = True
+        reco_vertices[is_pv[groups]] = -99
+
+        # remove vertices with no tracks from HF
+        if require_hf_track:
+            is_hf = np.isin(reco_track_origin, [3, 4, 5])
+            reco_vertices[~_any_in_vertex(reco_vertices, is_hf)] = -99
+
+        # merge remaining vertices for inclusive performance
+        if incl_vertexing:
+            reco_vertices = merge_indices_batched(reco_vertices, reco_vertices >= 0)
+
+    # merge all reco vertices if track origin predictions are not available
+    elif incl_vertexing:
+        reco_vertices = merge_indices_batched(reco_vertices, reco_vertices >= 0)
+
+    return reco_vertices
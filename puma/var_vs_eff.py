@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING, Any, ClassVar
 import numpy as np
 from ftag.utils import calculate_efficiency_error, calculate_rejection_error
 
+from puma.plot_base import record_call
 from puma.utils import logger
 from puma.utils.histogram import save_divide
 from puma.var_vs_var import VarVsVar, VarVsVarPlot
@@ -603,6 +604,7 @@ class VarVsEffPlot(VarVsVarPlot):  # pylint: disable=too-many-instance-attribute
             elem.y_var_mean = results_dict[type_key][self.mode]["y_value"]
             elem.y_var_std = results_dict[type_key][self.mode]["y_error"]
 
+    @record_call
     def apply_modified_atlas_second_tag(
         self,
         signal: Label | None = None,
@@ -8,7 +8,7 @@ import matplotlib as mpl
 import numpy as np
 from matplotlib.patches import Rectangle
 
-from puma.plot_base import PlotBase, PlotLineObject
+from puma.plot_base import PlotBase, PlotLineObject, record_call
 from puma.utils import get_good_colours, get_good_markers, logger
 from puma.utils.histogram import hist_ratio
 
@@ -220,6 +220,7 @@ class VarVsVarPlot(PlotBase):
         self.ratio_method = ratio_method
         self.initialise_figure()
 
+    @record_call
     def add(self, curve: VarVsVar, key: str | None = None, reference: bool = False) -> None:
         """Adding VarVsVar object to figure.
 
@@ -280,6 +281,7 @@ class VarVsVarPlot(PlotBase):
             logger.debug("Setting roc %s as reference.", key)
             self.set_reference(key)
 
+    @record_call
     def set_reference(self, key: str):
         """Setting the reference VarVsVar curves used in the ratios.
 
@@ -311,6 +313,9 @@ class VarVsVarPlot(PlotBase):
         plt_handles = []
         for key in self.add_order:
             elem = self.plot_objects[key]
+            # Each point is drawn with its own error bar and box, dense curves are
+            # therefore rasterised instead of decimated
+            rasterised = self.rasterise(len(elem.x_var))
             error_bar = self.axis_top.errorbar(
                 elem.x_var,
                 elem.y_var_mean,
@@ -322,6 +327,7 @@ class VarVsVarPlot(PlotBase):
                 alpha=elem.alpha,
                 linewidth=elem.linewidth,
                 ms=elem.markersize,
+                rasterized=rasterised,
                 **kwargs,
             )
             # # set linestyle for errorbar
@@ -334,6 +340,7 @@ class VarVsVarPlot(PlotBase):
                     marker=elem.marker,
                     s=elem.markersize**2,
                     color=elem.colour,
+                    rasterized=rasterised,
                 )
             if elem.x_var_widths is not None and elem.fill:
                 for x_pos, y_pos, width, height in zip(
@@ -354,6 +361,7 @@ class VarVsVarPlot(PlotBase):
                             color=elem.colour,
                             alpha=0.3,
                             zorder=1,
+                            rasterized=rasterised,
                         )
                     )
             plt_handles.append(
@@ -425,6 +433,7 @@ class VarVsVarPlot(PlotBase):
                 other=self.get_reference_name(elem),
                 method=self.ratio_method,
             )
+            rasterised = self.rasterise(len(elem.x_var))
             error_bar = self.ratio_axes[0].errorbar(
                 elem.x_var,
                 ratio,
@@ -435,6 +444,7 @@ class VarVsVarPlot(PlotBase):
                 alpha=elem.alpha,
                 linewidth=elem.linewidth,
                 ms=elem.markersize,
+                rasterized=rasterised,
             )
             # set linestyle for errorbar
             error_bar[-1][0].set_linestyle(elem.linestyle)
@@ -446,6 +456,7 @@ class VarVsVarPlot(PlotBase):
                     marker=elem.marker,
                     color=elem.colour,
                     s=elem.markersize**2,
+                    rasterized=rasterised,
                 )
             if elem.x_var_widths is not None and elem.fill:
                 for x_pos, y_pos, width, height in zip(
@@ -463,9 +474,11 @@ class VarVsVarPlot(PlotBase):
                             color=elem.colour,
                             alpha=0.3,
                             zorder=1,
+                            rasterized=rasterised,
                         )
                     )
 
+    @record_call
     def draw_hline(self, y_val: float):
         """Draw hline in top plot panel.
 
@@ -483,6 +496,7 @@ class VarVsVarPlot(PlotBase):
             alpha=0.5,
         )
 
+    @record_call
     def draw(
         self,
         labelpad: int | None = None,
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import ClassVar
+from typing import Any, ClassVar
 
 import numpy as np
 from ftag.utils import calculate_efficiency_error
@@ -80,7 +80,11 @@ class VarVsVtx(VarVsVar):  # pylint: disable=too-many-instance-attributes
         self.bin_widths = None
         # Binned distributions
         self.bin_indices = None
-        self.metric_binned = None
+        self.n_entries_binned = None
+        self.n_match_binned = None
+        self.n_true_binned = None
+        self.n_reco_binned = None
+        self.n_with_reco_binned = None
 
         self._set_bin_edges(bins)
         self._apply_binning()
@@ -97,6 +101,28 @@ class VarVsVtx(VarVsVar):  # pylint: disable=too-many-instance-attributes
             **kwargs,
         )
 
+    @property
+    def args_to_store(self) -> dict[str, Any]:
+        """Returns the arguments that need to be stored/loaded.
+
+        Returns
+        -------
+        dict[str, Any]
+            Dict with the arguments
+        """
+        return {
+            **super().args_to_store,
+            "bin_edges": self.bin_edges,
+            "n_bins": self.n_bins,
+            "x_bin_centres": self.x_bin_centres,
+            "bin_widths": self.bin_widths,
+            "n_entries_binned": self.n_entries_binned,
+            "n_match_binned": self.n_match_binned,
+            "n_true_binned": self.n_true_binned,
+            "n_reco_binned": self.n_reco_binned,
+            "n_with_reco_binned": self.n_with_reco_binned,
+        }
+
     def _set_bin_edges(self, bins):
         """Calculate bin edges, centres and width and save them as class variables.
 
@@ -127,18 +153,59 @@ class VarVsVtx(VarVsVar):  # pylint: disable=too-many-instance-attributes
         logger.debug("N bins: %i", self.n_bins)
 
     def _apply_binning(self):
-        """Get binned distributions for number of matches, truth and reco objects."""
+        """Get the per-bin sums of the number of matches, truth and reco objects."""
         logger.debug("Applying binning.")
         self.bin_indices = np.digitize(self.x_var, self.bin_edges)
-        self.match_binned = [
-            self.n_match[np.where(self.bin_indices == x)[0]] for x in range(1, len(self.bin_edges))
-        ]
-        self.true_binned = [
-            self.n_true[np.where(self.bin_indices == x)[0]] for x in range(1, len(self.bin_edges))
-        ]
-        self.reco_binned = [
-            self.n_reco[np.where(self.bin_indices == x)[0]] for x in range(1, len(self.bin_edges))
-        ]
+
+        # Entries outside of the bin edges are dropped, each sum is a single bincount
+        in_range = (self.bin_indices >= 1) & (self.bin_indices <= self.n_bins)
+        indices = self.bin_indices[in_range] - 1
+
+        (
+            self.n_entries_binned,
+            self.n_match_binned,
+            self.n_true_binned,
+            self.n_reco_binned,
+            self.n_with_reco_binned,
+        ) = (
+            np.bincount(
+                indices,
+                weights=None if values is None else values[in_range],
+                minlength=self.n_bins,
+            ).astype(float)
+            for values in (None, self.n_match, self.n_true, self.n_reco, self.n_reco > 0)
+        )
+
+    def _binned_performance_ratio(self, num: np.ndarray, denom: np.ndarray):
+        """Calculate the performance ratio and its error in each bin from the
+        per-bin sums, see `get_performance_ratio`.
+
+        Parameters
+        ----------
+        num : np.ndarray
+            Per-bin sums of the numerator
+        denom : np.ndarray
+            Per-bin sums of the denominator
+
+        Returns
+        -------
+        np.ndarray
+            Performance ratio
+        np.ndarray
+            Performance ratio error
+        """
+        pm = save_divide(num, denom, default=np.inf)
+        pm_error = np.zeros_like(pm)
+        undefined = pm == np.inf
+        if np.any(undefined):
+            logger.warning("Your vertexing performance ratio is infinity -> setting it to np.nan.")
+            pm[undefined] = np.nan
+            pm_error[undefined] = np.nan
+        if np.any(pm == 0):
+            logger.warning("Your vertexing performance ratio is zero -> setting error to zero.")
+        valid = ~undefined & (pm != 0)
+        pm_error[valid] = calculate_efficiency_error(pm[valid], self.n_entries_binned[valid])
+        return pm, pm_error
 
     def get_performance_ratio(self, num: np.ndarray, denom: np.ndarray):
         """Calculate performance ratio for vertexing task. Either n_matched/n_true
@@ -181,15 +248,9 @@ class VarVsVtx(VarVsVar):  # pylint: disable=too-many-instance-attributes
             Efficiency error
         """
         logger.debug("Calculating vertexing efficiency.")
-        eff = list(
-            map(
-                self.get_performance_ratio,
-                self.match_binned,
-                self.true_binned,
-            )
-        )
+        eff, eff_error = self._binned_performance_ratio(self.n_match_binned, self.n_true_binned)
         logger.debug("Retrieved vertexing efficiencies: %s", eff)
-        return np.array(eff)[:, 0], np.array(eff)[:, 1]
+        return eff, eff_error
 
     @property
     def purity(self):
@@ -204,15 +265,11 @@ class VarVsVtx(VarVsVar):  # pylint: disable=too-many-instance-attributes
             Purity error
         """
         logger.debug("Calculating vertexing purity.")
-        purity = list(
-            map(
-                self.get_performance_ratio,
-                self.match_binned,
-                self.reco_binned,
-            )
+        purity, purity_error = self._binned_performance_ratio(
+            self.n_match_binned, self.n_reco_binned
         )
         logger.debug("Retrieved vertexing purity: %s", purity)
-        return np.array(purity)[:, 0], np.array(purity)[:, 1]
+        return purity, purity_error
 
     @property
     def fakes(self):
@@ -227,15 +284,11 @@ class VarVsVtx(VarVsVar):  # pylint: disable=too-many-instance-attributes
             Fake rate error
         """
         logger.debug("Calculating vertexing fake rate.")
-        total_reco = list(
-            map(
-                self.get_performance_ratio,
-                [np.where(reco_bin > 0, 1, 0) for reco_bin in self.reco_binned],
-                list(map(np.ones_like, self.reco_binned)),
-            )
+        fakes, fakes_error = self._binned_performance_ratio(
+            self.n_with_reco_binned, self.n_entries_binned
         )
-        logger.debug("Retrieved vertexing fake rate: %s", total_reco)
-        return np.array(total_reco)[:, 0], np.array(total_reco)[:, 1]
+        logger.debug("Retrieved vertexing fake rate: %s", fakes)
+        return fakes, fakes_error
 
     def __eq__(self, other):
         """Handles a == check with the class.